@@ -1,22 +1,20 @@
 #!/usr/bin/env python3
 import argparse
-from typing import List, Tuple
+from typing import Tuple
 
-import plotly.express as px
 import plotly.graph_objs as go
-from numpy import linspace
+from numpy import ndarray
 
-from taperable_helix import Helix, HelixLocation
+from taperable_helix import Helix, helix_xyz
+from taperable_helix.viewer import wire_trace
 
 
 def helical_line(
     radius: float = 5, pitch: float = 2, height: float = 6, num_points: int = 100
-) -> List[Tuple[float, float, float]]:
+) -> Tuple[ndarray, ndarray, ndarray]:
     h: Helix = Helix(radius=radius, pitch=pitch, height=height)
-    f = h.helix()
-    points = list(map(f, linspace(start=0, stop=1, num=num_points, dtype=float)))
-    # print(f"helical_line: points={points}")
-    return points
+    # Columnar x, y and z arrays of num_points from first_t to last_t
+    return helix_xyz(h, num_points)
 
 
 if __name__ == "__main__":
@@ -41,16 +39,22 @@ if __name__ == "__main__":
         help="Write image and html files",
         action="store_true",
     )
+    parser.add_argument(
+        "-n",
+        "--num-points",
+        help="number of points (default 100)",
+        default=100,
+        type=int,
+    )
     args = parser.parse_args()
 
-    points = helical_line()
-    fig = px.line_3d(
-        # title="Helical Line",
-        x=[x for x, _, _ in points],
-        y=[y for _, y, _ in points],
-        z=[z for _, _, z in points],
+    # Columnar x, y, z arrays, decimated to what's visible, see taperable_helix.viewer
+    x, y, z = helical_line(num_points=args.num_points)
+    fig = go.Figure(
+        # layout_title_text="Helical Line",
+        layout_scene_camera_projection_type="orthographic",
     )
-    fig.layout.scene.camera.projection.type = "orthographic"
+    fig.add_trace(wire_trace(x, y, z))
 
     if args.no_show:
         args.show = False
@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 import argparse
-from typing import List, Tuple
+from typing import Tuple
 
-import plotly.express as px
 import plotly.graph_objs as go
-from numpy import linspace
+from numpy import concatenate, ndarray, ptp
 
-from taperable_helix import Helix, HelixLocation
+from taperable_helix import Helix, HelixLocation, helix_xyz
+from taperable_helix.viewer import wire_trace
+
+Columns = Tuple[ndarray, ndarray, ndarray]
 
 
 def helical_triangle(
@@ -16,11 +18,7 @@ def helical_triangle(
     num_points: int = 100,
     tri_height: float = 0.2,
     tri_width: float = 0.2,
-) -> Tuple[
-    List[Tuple[float, float, float]],
-    List[Tuple[float, float, float]],
-    List[Tuple[float, float, float]],
-]:
+) -> Tuple[Columns, Columns, Columns]:
 
     # Create three helixes that taper to a point
 
@@ -29,19 +27,16 @@ def helical_triangle(
         radius=radius, pitch=pitch, height=height, taper_out_rpos=0.1, taper_in_rpos=0.9
     )
 
-    # The Upper points, horz_offset defaults to 0
-    fU = h.helix(HelixLocation(vert_offset=tri_height / 2))
-    points_fU = list(map(fU, linspace(h.first_t, h.last_t, num=100, dtype=float)))
+    # The Upper wire's columnar x, y and z arrays, horz_offset defaults to 0
+    upper = helix_xyz(h, num_points, HelixLocation(vert_offset=tri_height / 2))
 
-    # The Lower points, again horz_offset defaults to 0
-    fL = h.helix(HelixLocation(vert_offset=-tri_height / 2))
-    points_fL = list(map(fL, linspace(h.first_t, h.last_t, num=100, dtype=float)))
+    # The Lower wire, again horz_offset defaults to 0
+    lower = helix_xyz(h, num_points, HelixLocation(vert_offset=-tri_height / 2))
 
-    # The Middle point, change vert_offset to 0
-    fM = h.helix(HelixLocation(horz_offset=tri_width))
-    points_fM = list(map(fM, linspace(h.first_t, h.last_t, num=100, dtype=float)))
+    # The Middle wire, change vert_offset to 0
+    middle = helix_xyz(h, num_points, HelixLocation(horz_offset=tri_width))
 
-    return (points_fU, points_fM, points_fL)
+    return (upper, middle, lower)
 
 
 if __name__ == "__main__":
@@ -66,46 +61,30 @@ if __name__ == "__main__":
         help="Write image and html files",
         action="store_true",
     )
+    parser.add_argument(
+        "-n",
+        "--num-points",
+        help="number of points of each wire (default 100)",
+        default=100,
+        type=int,
+    )
     args = parser.parse_args()
 
-    # Create the points for the helixes
-    points_fU, points_fM, points_fL = helical_triangle()
+    # Create the wires of the helixes
+    upper, middle, lower = helical_triangle(num_points=args.num_points)
+
+    # Decimate the columnar x, y, z arrays of each wire to what's visible,
+    # with the same extent so they're decimated alike, see taperable_helix.viewer
+    extent = max(ptp(concatenate(c)) for c in zip(upper, middle, lower))
 
     # Create a plotly figure add three traces
     fig = go.Figure(
         # layout_title_text="Helical Triangle",
         layout_scene_camera_projection_type="orthographic",
     )
-    fig.add_trace(
-        go.Scatter3d(
-            # Extract x, y, z
-            x=[x for x, _, _ in points_fL],
-            y=[y for _, y, _ in points_fL],
-            z=[z for _, _, z in points_fL],
-            mode="lines",
-            name="Lower",
-        )
-    )
-    fig.add_trace(
-        go.Scatter3d(
-            # Extract x, y, z
-            x=[x for x, _, _ in points_fM],
-            y=[y for _, y, _ in points_fM],
-            z=[z for _, _, z in points_fM],
-            mode="lines",
-            name="Middle",
-        )
-    )
-    fig.add_trace(
-        go.Scatter3d(
-            # Extract x, y, z
-            x=[x for x, _, _ in points_fU],
-            y=[y for _, y, _ in points_fU],
-            z=[z for _, _, z in points_fU],
-            mode="lines",
-            name="Upper",
-        )
-    )
+    fig.add_trace(wire_trace(*lower, extent=extent, name="Lower"))
+    fig.add_trace(wire_trace(*middle, extent=extent, name="Middle"))
+    fig.add_trace(wire_trace(*upper, extent=extent, name="Upper"))
 
     if args.no_show:
         args.show = False
@@ -2,15 +2,24 @@
 
 """The setup script."""
 
-from typing import List
+from typing import Dict, List
 
 from setuptools import find_packages, setup
 
 with open("README.rst") as readme_file:
     readme = readme_file.read()
 
+# The pure Python core has no dependencies, the vectorized modules need
+# NumPy, the numba backend Numba and the viewer plotly.
 requirements: List[str] = []
 
+extras_requirements: Dict[str, List[str]] = {
+    "numpy": ["numpy"],
+    "jit": ["numpy", "numba"],
+    "plot": ["numpy", "plotly"],
+}
+extras_requirements["all"] = sorted(set(sum(extras_requirements.values(), [])))
+
 setup_requirements: List[str] = [
     "pytest-runner",
 ]
@@ -22,18 +31,27 @@ test_requirements: List[str] = [
 setup(
     author="Wink Saville",
     author_email="wink@saville.com",
-    python_requires=">=3.7",
+    python_requires=">=3.9",
     platforms=["any"],
     classifiers=[
         "Development Status :: 2 - Pre-Alpha",
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
         "Natural Language :: English",
-        "Programming Language :: Python :: 3.7",
-        "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
+        "Programming Language :: Python :: 3.12",
+        "Programming Language :: Python :: 3.13",
     ],
+    entry_points={
+        "console_scripts": [
+            "taperable-helix=taperable_helix.cli:main",
+        ],
+    },
     description="Generate helixes that can optionally taper to a point at each end.",
     install_requires=requirements,
+    extras_require=extras_requirements,
     license="MIT license",
     long_description=readme + "\n\n",
     long_description_content_type="text/x-rst",
@@ -4,4 +4,77 @@ __author__ = "Wink Saville"
 __email__ = "wink@saville.com"
 __version__ = "0.8.17"
 
+from importlib import import_module
+from typing import Any, Dict, List
+
+from . import instrumentation
 from .helix import Helix, HelixLocation
+from .pointarray import PointArray
+
+# Importing taperable_helix only loads the pure Python core above. The
+# names below come from modules which import NumPy, or aren't needed to
+# generate points, so they are loaded on first use by __getattr__ (PEP 562).
+# Add new modules here rather than importing them above. The clearance()
+# function is not listed as its name is taken by the clearance module.
+_lazy_attributes: Dict[str, str] = {
+    "helix_points": "vectorized",
+    "helix_derivatives": "vectorized",
+    "helix_chunks": "vectorized",
+    "parallel_points": "vectorized",
+    "helix_xyz": "vectorized",
+    "ClosestPoints": "closest",
+    "closest_points": "closest",
+    "ThreadProfile": "clearance",
+    "Clearance": "clearance",
+    "HelixBVH": "bvh",
+    "RayHits": "bvh",
+    "Crossings": "slicing",
+    "crossings": "slicing",
+    "slice_wires": "slicing",
+    "Mesh": "mesh",
+    "helix_mesh": "mesh",
+    "mesh_chunks": "mesh",
+    "GeometryService": "service",
+    "HelixColumns": "batch",
+    "batch_points": "batch",
+    "HelixFit": "fit",
+    "fit_helix": "fit",
+    "HelixSamples": "samples",
+}
+
+_lazy_modules: List[str] = [
+    "backends",
+    "batch",
+    "bvh",
+    "clearance",
+    "cli",
+    "closest",
+    "fit",
+    "mesh",
+    "planner",
+    "properties",
+    "recurrence",
+    "samples",
+    "service",
+    "shared",
+    "slicing",
+    "storage",
+    "vectorized",
+    "viewer",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _lazy_attributes:
+        value: Any = getattr(
+            import_module(f".{_lazy_attributes[name]}", __name__), name
+        )
+        globals()[name] = value
+        return value
+    if name in _lazy_modules:
+        return import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_lazy_attributes) | set(_lazy_modules))
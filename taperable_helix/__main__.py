@@ -0,0 +1,7 @@
+"""Run the taperable-helix command with python -m taperable_helix."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,85 @@
+"""The numba backend, see taperable_helix.backends.
+
+Importing this module requires Numba, it's only imported when the numba
+backend is used.
+"""
+
+from math import cos, pi, sin
+from typing import Sequence
+
+import numpy as np
+from numba import njit
+
+from .helix import _Geometry
+
+
+@njit(cache=True)
+def _kernel(
+    t: np.ndarray,
+    out: np.ndarray,
+    first_t: float,
+    last_t: float,
+    t_range: float,
+    radius: float,
+    horz_offset: float,
+    vert_offset: float,
+    inset_offset: float,
+    pitch: float,
+    helix_height: float,
+    turns: float,
+    taper_out_range: float,
+    taper_out_ends: float,
+    taper_in_range: float,
+    taper_in_starts: float,
+) -> None:
+    """The function returned by Helix.helix() as a loop over t."""
+    for i in range(t.shape[0]):
+        ti = t[i]
+        rel_height = (ti - first_t) / t_range if t_range != 0 else 0.0
+        if ti < taper_out_ends:
+            taper_angle = pi / 2 * (ti - first_t) / taper_out_range
+        elif ti <= taper_in_starts:
+            taper_angle = pi / 2
+        else:
+            taper_angle = pi / 2 * (last_t - ti) / taper_in_range
+        taper_scale = sin(taper_angle)
+
+        r = radius + (horz_offset * taper_scale)
+        a = (2 * pi / turns) * rel_height
+        out[i, 0] = r * sin(-a)
+        out[i, 1] = r * cos(a)
+        out[i, 2] = (
+            (helix_height * (rel_height if pitch != 0 else 1.0))
+            + (vert_offset * taper_scale)
+            + inset_offset
+        )
+
+
+def helix_points(g: _Geometry, t: Sequence[float]) -> np.ndarray:
+    """Return the points of the helix at t.
+
+    :param g: The geometry returned by Helix._geometry()
+    :param t: Array like of t values
+    :returns: A float64 array of shape (len(t), 3)
+    """
+    ta: np.ndarray = np.ascontiguousarray(t, dtype=np.float64).reshape(-1)
+    out: np.ndarray = np.empty((len(ta), 3))
+    _kernel(
+        ta,
+        out,
+        float(g.first_t),
+        float(g.last_t),
+        float(g.t_range),
+        float(g.radius),
+        float(g.horz_offset),
+        float(g.vert_offset),
+        float(g.inset_offset),
+        float(g.pitch),
+        float(g.helix_height),
+        float(g.turns),
+        float(g.taper_out_range),
+        float(g.taper_out_ends),
+        float(g.taper_in_range),
+        float(g.taper_in_starts),
+    )
+    return out
@@ -0,0 +1,53 @@
+"""Vectorized geometry of line segments used by the spatial queries."""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def _dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.einsum("ij,ij->i", a, b)
+
+
+def _safe_div(n: np.ndarray, d: np.ndarray) -> np.ndarray:
+    """n / d with 0 where d is 0."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(d != 0, n / np.where(d != 0, d, 1), 0)
+
+
+def segment_segment(
+    p1: np.ndarray, q1: np.ndarray, p2: np.ndarray, q2: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the closest points between the segments p1-q1 and p2-q2.
+
+    From Ericson, Real-Time Collision Detection, 5.1.9, vectorized
+    over the rows of the (K, 3) arrays.
+
+    :returns: (distance, s, t) where p1 + s * (q1 - p1) and p2 + t * (q2 - p2)
+              are the closest points.
+    """
+    d1: np.ndarray = q1 - p1
+    d2: np.ndarray = q2 - p2
+    r: np.ndarray = p1 - p2
+    a: np.ndarray = _dot(d1, d1)
+    e: np.ndarray = _dot(d2, d2)
+    f: np.ndarray = _dot(d2, r)
+    c: np.ndarray = _dot(d1, r)
+    b: np.ndarray = _dot(d1, d2)
+    denom: np.ndarray = a * e - b * b
+
+    # Closest points of the infinite lines, clamped to the first segment,
+    # 0 when they are parallel
+    s: np.ndarray = np.clip(_safe_div(b * f - c * e, denom), 0, 1)
+    t: np.ndarray = _safe_div(b * s + f, e)
+
+    # Clamp t and recompute s for the clamped t
+    lo: np.ndarray = t < 0
+    hi: np.ndarray = t > 1
+    t = np.clip(t, 0, 1)
+    s = np.where(lo, np.clip(_safe_div(-c, a), 0, 1), s)
+    s = np.where(hi, np.clip(_safe_div(b - c, a), 0, 1), s)
+
+    c1: np.ndarray = p1 + d1 * s[:, None]
+    c2: np.ndarray = p2 + d2 * t[:, None]
+    return np.linalg.norm(c1 - c2, axis=1), s, t
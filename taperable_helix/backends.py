@@ -0,0 +1,126 @@
+"""Registry of the backends which evaluate a Helix at many values of t.
+
+Helix.points() dispatches to a backend chosen by name, or by default the
+available backend with the highest priority:
+
+* numba: a JIT compiled loop, available when Numba and NumPy are installed.
+  The first call in a process compiles it, which takes about a second
+* numpy: taperable_helix.vectorized, available when NumPy is installed
+* python: the function returned by Helix.helix(), always available, and
+  the reference the others are validated against
+
+Other backends can be added with register().
+"""
+
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .helix import Helix, HelixLocation
+
+PointsFunc = Callable[[Helix, Sequence[float], Optional[HelixLocation]], Any]
+"""Passed (helix, t, hl) returns the points, a sequence of (x, y, z)."""
+
+
+@dataclass(frozen=True)
+class Backend:
+    """A way of evaluating a Helix at many values of t."""
+
+    name: str
+    """The name used to select the backend"""
+
+    priority: int
+    """The available backend with the highest priority is the default"""
+
+    available: Callable[[], bool]
+    """Returns True if the backend can be used"""
+
+    points: PointsFunc
+    """Returns the points of a helix at an array like of t"""
+
+
+_backends: Dict[str, Backend] = {}
+_default: Optional[str] = None
+
+
+def register(backend: Backend) -> None:
+    """Add a backend, a ValueError is raised if its name is taken."""
+    if backend.name in _backends:
+        raise ValueError(f"backend:{backend.name} is already registered")
+    _backends[backend.name] = backend
+
+
+def unregister(name: str) -> None:
+    """Remove a backend, a KeyError is raised if it isn't registered."""
+    global _default
+    del _backends[name]
+    if _default == name:
+        _default = None
+
+
+def backends() -> List[str]:
+    """Return the names of the available backends, highest priority first."""
+    return [
+        b.name
+        for b in sorted(_backends.values(), key=lambda b: -b.priority)
+        if b.available()
+    ]
+
+
+def set_default(name: Optional[str]) -> None:
+    """Make name the default backend, None restores the highest priority."""
+    global _default
+    if name is not None:
+        get_backend(name)
+    _default = name
+
+
+def get_backend(name: Optional[str] = None) -> Backend:
+    """Return the backend called name, default the default backend.
+
+    A ValueError is raised if it isn't registered or isn't available.
+    """
+    if name is None:
+        name = _default if _default is not None else backends()[0]
+    backend: Optional[Backend] = _backends.get(name)
+    if backend is None:
+        raise ValueError(f"backend:{name} should be one of {sorted(_backends)}")
+    if not backend.available():
+        raise ValueError(f"backend:{name} is not available")
+    return backend
+
+
+def _python_points(
+    helix: Helix, t: Sequence[float], hl: Optional[HelixLocation]
+) -> List[Tuple[float, float, float]]:
+    return list(map(helix.helix(hl), t))
+
+
+def _numpy_points(helix: Helix, t: Sequence[float], hl: Optional[HelixLocation]) -> Any:
+    from .vectorized import helix_points
+
+    return helix_points(helix, t, hl)  # type: ignore
+
+
+def _numba_points(helix: Helix, t: Sequence[float], hl: Optional[HelixLocation]) -> Any:
+    from ._jit import helix_points
+
+    return helix_points(helix._geometry(hl), t)
+
+
+def _installed(*modules: str) -> Callable[[], bool]:
+    """Return a function returning True if all of modules are installed,
+    which only looks for them the first time it's called."""
+    found: List[bool] = []
+
+    def available() -> bool:
+        if not found:
+            found.append(all(find_spec(m) is not None for m in modules))
+        return found[0]
+
+    return available
+
+
+register(Backend("python", 0, lambda: True, _python_points))
+register(Backend("numpy", 10, _installed("numpy"), _numpy_points))
+register(Backend("numba", 20, _installed("numba", "numpy"), _numba_points))
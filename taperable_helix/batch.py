@@ -0,0 +1,230 @@
+"""Evaluate many different helixes in one vectorized pass.
+
+Rather than a Helix, its closure and a NumPy call per helix, the
+parameters of M helixes and their HelixLocations are columns, arrays of
+shape (M,), and every helix is evaluated at the same N normalized t
+values, 0 is first_t and 1 is last_t of each helix::
+
+    columns = HelixColumns(radius=radii, pitch=0.5, height=heights)
+    result = batch_points(np.linspace(0, 1, 100), columns)
+    result.points               # (M, 100, 3)
+    result.errors               # {index: [message, ...]} of invalid helixes
+
+Invalid helixes don't raise, they are reported in errors and their points
+are NaN. The points of the valid helixes are identical to those of
+taperable_helix.vectorized.helix_points().
+"""
+
+from dataclasses import dataclass, fields
+from math import pi
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from . import instrumentation as _instrumentation
+from .helix import Helix, HelixLocation
+
+
+@dataclass
+class HelixColumns:
+    """The parameters of M Helix and HelixLocation pairs as columns.
+
+    Each is an array like of shape (M,) or a scalar used for every helix,
+    they are converted to float64 arrays of shape (M,).
+    """
+
+    radius: Any
+    pitch: Any
+    height: Any
+    taper_out_rpos: Any = 0
+    taper_in_rpos: Any = 1
+    inset_offset: Any = 0
+    first_t: Any = 0
+    last_t: Any = 1
+
+    location_radius: Any = np.nan
+    """The HelixLocation radius, NaN for the helix radius as None does"""
+
+    horz_offset: Any = 0
+    vert_offset: Any = 0
+
+    def __post_init__(self) -> None:
+        names: List[str] = [f.name for f in fields(self)]
+        columns: Sequence[np.ndarray] = np.broadcast_arrays(
+            *(np.asarray(getattr(self, name), dtype=np.float64) for name in names)
+        )
+        for name, column in zip(names, columns):
+            if column.ndim != 1:
+                raise ValueError(f"{name} shape:{column.shape} should be (M,)")
+            setattr(self, name, column.copy())
+
+    def __len__(self) -> int:
+        return len(self.radius)
+
+    @classmethod
+    def from_helixes(
+        cls,
+        helixes: Sequence[Helix],
+        locations: Optional[Sequence[Optional[HelixLocation]]] = None,
+    ) -> "HelixColumns":
+        """Return the columns of helixes and their locations.
+
+        :param helixes: The helixes
+        :param locations: The HelixLocation of each helix, None for the
+                          default location
+        """
+        if locations is None:
+            locations = [None] * len(helixes)
+        if len(locations) != len(helixes):
+            raise ValueError(
+                f"len(locations):{len(locations)} should be len(helixes):{len(helixes)}"
+            )
+        hls: List[HelixLocation] = [
+            hl if hl is not None else HelixLocation() for hl in locations
+        ]
+        return cls(
+            radius=[h.radius for h in helixes],
+            pitch=[h.pitch for h in helixes],
+            height=[h.height for h in helixes],
+            taper_out_rpos=[h.taper_out_rpos for h in helixes],
+            taper_in_rpos=[h.taper_in_rpos for h in helixes],
+            inset_offset=[h.inset_offset for h in helixes],
+            first_t=[h.first_t for h in helixes],
+            last_t=[h.last_t for h in helixes],
+            location_radius=[np.nan if hl.radius is None else hl.radius for hl in hls],
+            horz_offset=[hl.horz_offset for hl in hls],
+            vert_offset=[hl.vert_offset for hl in hls],
+        )
+
+
+@dataclass
+class BatchPoints:
+    """The result of batch_points()."""
+
+    points: np.ndarray
+    """The points of each helix, shape (M, N, 3), NaN for invalid helixes"""
+
+    valid: np.ndarray
+    """True for the helixes which are valid, shape (M,)"""
+
+    errors: Dict[int, List[str]]
+    """The messages of the invalid helixes keyed by their index"""
+
+
+def validate(columns: HelixColumns) -> Dict[int, List[str]]:
+    """Check every helix as Helix.helix() does, without raising.
+
+    :param columns: The helixes
+    :returns: The messages of the invalid helixes keyed by their index
+    """
+    c: HelixColumns = columns
+    checks: List[Any] = [
+        (
+            c.taper_out_rpos > c.taper_in_rpos,
+            lambda i: f"taper_out_rpos:{c.taper_out_rpos[i]} > "
+            f"taper_in_rpos:{c.taper_in_rpos[i]}",
+        ),
+        (
+            (c.taper_out_rpos < 0) | (c.taper_out_rpos > 1),
+            lambda i: f"taper_out_rpos:{c.taper_out_rpos[i]} should be >= 0 and <= 1",
+        ),
+        (
+            (c.taper_in_rpos < 0) | (c.taper_in_rpos > 1),
+            lambda i: f"taper_in_rpos:{c.taper_in_rpos[i]} should be >= 0 and <= 1",
+        ),
+    ]
+    for f in fields(c):
+        column: np.ndarray = getattr(c, f.name)
+        finite: np.ndarray = np.isfinite(column)
+        if f.name == "location_radius":
+            finite |= np.isnan(column)
+        text: str = f"{f.name}:{{}} should be finite"
+        checks.append((~finite, lambda i, m=text, col=column: m.format(col[i])))
+
+    errors: Dict[int, List[str]] = {}
+    for bad, message in checks:
+        for i in np.flatnonzero(bad):
+            errors.setdefault(int(i), []).append(message(i))
+    return dict(sorted(errors.items()))
+
+
+def batch_points(u: Any, columns: HelixColumns) -> BatchPoints:
+    """Evaluate every helix at the normalized t values u.
+
+    :param u: Array like of shape (N,), t is first_t + u * (last_t - first_t)
+              of each helix, u of 1 is exactly last_t
+    :param columns: The helixes
+    :returns: The points, shape (M, N, 3), and the report of invalid helixes
+    """
+    instrumented: bool = _instrumentation.enabled
+    start: float = perf_counter() if instrumented else 0
+    ua: np.ndarray = np.asarray(u, dtype=np.float64)
+    if ua.ndim != 1:
+        raise ValueError(f"u shape:{ua.shape} should be (N,)")
+    c: HelixColumns = columns
+    errors: Dict[int, List[str]] = validate(c)
+    valid: np.ndarray = np.ones(len(c), dtype=bool)
+    valid[list(errors)] = False
+
+    def col(x: np.ndarray) -> np.ndarray:
+        return x[:, None]
+
+    # The derived constants as Helix._geometry()
+    radius: np.ndarray = np.where(
+        np.isnan(c.location_radius), c.radius, c.location_radius
+    )
+    helix_height: np.ndarray = c.height - (2 * c.inset_offset)
+    pitched: np.ndarray = (c.pitch != 0) & (helix_height != 0)
+    turns: np.ndarray = np.where(
+        pitched, c.pitch / np.where(pitched, helix_height, 1), 1
+    )
+    t_range: np.ndarray = c.last_t - c.first_t
+    taper_out_range: np.ndarray = t_range * c.taper_out_rpos
+    taper_out_ends: np.ndarray = np.where(
+        taper_out_range > 0,
+        c.first_t + taper_out_range,
+        np.minimum(c.first_t, c.last_t),
+    )
+    taper_in_range: np.ndarray = t_range * (1 - c.taper_in_rpos)
+    taper_in_starts: np.ndarray = np.where(
+        taper_in_range > 0,
+        c.last_t - taper_in_range,
+        np.maximum(c.first_t, c.last_t),
+    )
+
+    t: np.ndarray = col(c.first_t) + col(t_range) * ua
+    t[:, ua == 1] = col(c.last_t)
+
+    # The taper_angle, as Helix.helix() the out zone takes precedence
+    with np.errstate(divide="ignore", invalid="ignore"):
+        taper_angle: np.ndarray = np.where(
+            t < col(taper_out_ends),
+            pi / 2 * (t - col(c.first_t)) / col(taper_out_range),
+            np.where(
+                t > col(taper_in_starts),
+                pi / 2 * (col(c.last_t) - t) / col(taper_in_range),
+                pi / 2,
+            ),
+        )
+        rel_height: np.ndarray = np.where(
+            col(t_range) != 0, (t - col(c.first_t)) / col(t_range), 0
+        )
+    taper_scale: np.ndarray = np.sin(taper_angle)
+
+    r: np.ndarray = col(radius) + (col(c.horz_offset) * taper_scale)
+    a: np.ndarray = (2 * pi / col(turns)) * rel_height
+    points: np.ndarray = np.empty(t.shape + (3,))
+    points[..., 0] = r * np.sin(-a)
+    points[..., 1] = r * np.cos(a)
+    points[..., 2] = (
+        (col(helix_height) * np.where(col(c.pitch) != 0, rel_height, 1))
+        + (col(c.vert_offset) * taper_scale)
+        + col(c.inset_offset)
+    )
+    points[~valid] = np.nan
+
+    if instrumented:
+        _instrumentation.count("points.batch", t.size)
+        _instrumentation.add_time("batch", perf_counter() - start)
+    return BatchPoints(points=points, valid=valid, errors=errors)
@@ -0,0 +1,365 @@
+"""A bounding volume hierarchy over the segments of helical wires.
+
+The hierarchy is an implicit complete binary tree stored in arrays, node 1
+is the root and the children of node i are 2i and 2i + 1. Each leaf holds a
+run of consecutive segments of one wire, which are spatially coherent
+along a helix, so it is built bottom up in one vectorized pass per level
+without any sorting. Queries are batched, all rays or boxes descend the
+tree together one level at a time.
+"""
+
+from dataclasses import dataclass
+from math import pi
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ._segments import segment_segment
+from .helix import Helix, HelixLocation
+from .vectorized import _evaluate
+
+
+@dataclass
+class RayHits:
+    """The result of HelixBVH.ray_cast(), one entry per ray."""
+
+    hit: np.ndarray
+    """True if the ray passed within tolerance of a segment, shape (R,)"""
+
+    distance: np.ndarray
+    """Distance along the ray, in units of the direction, to the closest
+    approach of the first segment hit, inf if none, shape (R,)"""
+
+    segment: np.ndarray
+    """Index of the segment hit, -1 if none, shape (R,)"""
+
+    wire: np.ndarray
+    """Index of the wire of the segment hit, -1 if none, shape (R,)"""
+
+    t: np.ndarray
+    """t on the wire of the point hit, nan if none, shape (R,)"""
+
+
+def _slab(
+    origins: np.ndarray, inv_dirs: np.ndarray, lo: np.ndarray, hi: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the entry and exit ray parameters of the boxes lo-hi."""
+    with np.errstate(invalid="ignore"):
+        t1: np.ndarray = (lo - origins) * inv_dirs
+        t2: np.ndarray = (hi - origins) * inv_dirs
+    # nan arises from 0 * inf when a ray lies in a slab plane, treat as inside
+    t_near: np.ndarray = np.nanmax(np.minimum(t1, t2), axis=1, initial=-np.inf)
+    t_far: np.ndarray = np.nanmin(np.maximum(t1, t2), axis=1, initial=np.inf)
+    return t_near, t_far
+
+
+class HelixBVH:
+    """Bounding volume hierarchy over the segments of one or more wires.
+
+    :param wires: A sequence of point arrays, each of shape (N, 3), the
+                  segments are between consecutive points of a wire.
+    :param t: Optional sequence of t arrays, one per wire, used to report
+              the t of hits. Defaults to the point index.
+    :param pad: Optional per segment padding, one array of shape (N - 1,)
+                per wire, added to the bounds so they also contain the
+                curve between the points.
+    :param leaf_size: Maximum number of segments in a leaf
+    """
+
+    def __init__(
+        self,
+        wires: Sequence[np.ndarray],
+        t: Optional[Sequence[np.ndarray]] = None,
+        pad: Optional[Sequence[np.ndarray]] = None,
+        leaf_size: int = 8,
+    ):
+        if leaf_size < 1:
+            raise ValueError(f"leaf_size:{leaf_size} should be >= 1")
+        ps: List[np.ndarray] = []
+        qs: List[np.ndarray] = []
+        ts: List[np.ndarray] = []
+        pads: List[np.ndarray] = []
+        seg_wire: List[np.ndarray] = []
+        leaf_start: List[np.ndarray] = []
+        leaf_end: List[np.ndarray] = []
+        base: int = 0
+        for w, wire in enumerate(wires):
+            pts: np.ndarray = np.asarray(wire, dtype=np.float64)
+            if pts.ndim != 2 or pts.shape[1] != 3 or pts.shape[0] < 2:
+                raise ValueError(f"wire {w} shape:{pts.shape} should be (N >= 2, 3)")
+            n: int = pts.shape[0] - 1
+            ps.append(pts[:-1])
+            qs.append(pts[1:])
+            ts.append(
+                np.asarray(t[w], dtype=np.float64)
+                if t is not None
+                else np.arange(n + 1, dtype=np.float64)
+            )
+            pads.append(
+                np.asarray(pad[w], dtype=np.float64) if pad is not None else np.zeros(n)
+            )
+            seg_wire.append(np.full(n, w))
+            first: np.ndarray = base + np.arange(0, n, leaf_size)
+            leaf_start.append(first)
+            leaf_end.append(np.minimum(first + leaf_size, base + n))
+            base += n
+        if not ps:
+            raise ValueError("wires should not be empty")
+
+        self.p: np.ndarray = np.concatenate(ps)
+        """Start point of each segment, shape (S, 3)"""
+        self.q: np.ndarray = np.concatenate(qs)
+        """End point of each segment, shape (S, 3)"""
+        self.seg_wire: np.ndarray = np.concatenate(seg_wire)
+        """Wire index of each segment, shape (S,)"""
+        self.seg_t0: np.ndarray = np.concatenate([v[:-1] for v in ts])
+        """t at the start of each segment, shape (S,)"""
+        self.seg_t1: np.ndarray = np.concatenate([v[1:] for v in ts])
+        """t at the end of each segment, shape (S,)"""
+
+        # Leaves, each is a run of segments of one wire
+        self.leaf_start: np.ndarray = np.concatenate(leaf_start)
+        """First segment of each leaf"""
+        self.leaf_count: np.ndarray = np.concatenate(leaf_end) - self.leaf_start
+        """Number of segments in each leaf"""
+        starts: np.ndarray = self.leaf_start
+
+        seg_pad: np.ndarray = np.concatenate(pads)[:, None]
+        seg_lo: np.ndarray = np.minimum(self.p, self.q) - seg_pad
+        seg_hi: np.ndarray = np.maximum(self.p, self.q) + seg_pad
+        leaf_lo: np.ndarray = np.minimum.reduceat(seg_lo, starts, axis=0)
+        leaf_hi: np.ndarray = np.maximum.reduceat(seg_hi, starts, axis=0)
+
+        # Complete binary tree, unused leaves have empty (inverted) bounds
+        num_leaves: int = 1 << max(0, int(len(starts) - 1).bit_length())
+        self.num_leaves: int = num_leaves
+        self.lo: np.ndarray = np.full((2 * num_leaves, 3), np.inf)
+        """Lower corner of each node, shape (2 * num_leaves, 3)"""
+        self.hi: np.ndarray = np.full((2 * num_leaves, 3), -np.inf)
+        """Upper corner of each node, shape (2 * num_leaves, 3)"""
+        self.lo[num_leaves : num_leaves + len(starts)] = leaf_lo
+        self.hi[num_leaves : num_leaves + len(starts)] = leaf_hi
+        n = num_leaves
+        while n > 1:
+            self.lo[n // 2 : n] = np.minimum(
+                self.lo[n : 2 * n : 2], self.lo[n + 1 : 2 * n : 2]
+            )
+            self.hi[n // 2 : n] = np.maximum(
+                self.hi[n : 2 * n : 2], self.hi[n + 1 : 2 * n : 2]
+            )
+            n //= 2
+
+    @classmethod
+    def from_helix(
+        cls,
+        helix: Helix,
+        locations: Optional[Sequence[HelixLocation]] = None,
+        num_points: int = 1000,
+        leaf_size: int = 8,
+    ) -> "HelixBVH":
+        """Build the hierarchy over wires generated from a helix.
+
+        The bounds are padded by the maximum distance between the helix and
+        its chords, computed from the radius, offsets and angle between
+        samples, so queries are conservative for the actual helix. They
+        are also clipped to the cylinder of radius + horz_offset.
+
+        :param helix: The helix of every wire
+        :param locations: The HelixLocation of each wire, default one wire
+                          at HelixLocation()
+        :param num_points: Number of points generated for each wire
+        :param leaf_size: Maximum number of segments in a leaf
+        """
+        if num_points < 2:
+            raise ValueError(f"num_points:{num_points} should be >= 2")
+        hls: Sequence[HelixLocation] = locations if locations else [HelixLocation()]
+        t: np.ndarray = np.linspace(helix.first_t, helix.last_t, num_points)
+        wires: List[np.ndarray] = []
+        pads: List[np.ndarray] = []
+        r_max: float = 0
+        for hl in hls:
+            g = helix._geometry(hl)
+            wires.append(_evaluate(g, t)[0])
+
+            # Angle between samples and the change in taper_angle, which
+            # is at most pi / 2 over a whole taper range
+            da: float = (
+                abs((2 * pi / g.turns) * (t[1] - t[0]) / g.t_range)
+                if g.t_range != 0
+                else 0
+            )
+            dta: float = 0
+            for taper_range in (g.taper_out_range, g.taper_in_range):
+                if taper_range != 0:
+                    dta = max(dta, abs(pi / 2 * (t[1] - t[0]) / taper_range))
+            r: float = abs(g.radius) + abs(g.horz_offset)
+            sagitta: float = r * (1 - np.cos(min(da, pi) / 2))
+            taper: float = (abs(g.horz_offset) + abs(g.vert_offset)) * dta * dta / 8
+            pads.append(np.full(num_points - 1, sagitta + taper))
+            r_max = max(r_max, r)
+
+        bvh: HelixBVH = cls(wires, [t] * len(wires), pads, leaf_size)
+        for axis in (0, 1):
+            bvh.lo[:, axis] = np.maximum(bvh.lo[:, axis], -r_max)
+            bvh.hi[:, axis] = np.minimum(bvh.hi[:, axis], r_max)
+        return bvh
+
+    def _descend(
+        self, pairs: np.ndarray, keep: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Split the kept (query, node) pairs into those at leaves, returned as
+        (query, leaf index) and those whose children are visited next."""
+        pairs = pairs[keep]
+        at_leaf: np.ndarray = pairs[:, 1] >= self.num_leaves
+        leaves: np.ndarray = pairs[at_leaf]
+        leaves[:, 1] -= self.num_leaves
+        # The empty leaves padding the tree out to a power of two
+        leaves = leaves[leaves[:, 1] < len(self.leaf_start)]
+        inner: np.ndarray = pairs[~at_leaf]
+        children: np.ndarray = np.repeat(inner, 2, axis=0)
+        children[:, 1] = children[:, 1] * 2 + np.tile([0, 1], len(inner))
+        return leaves, children
+
+    def _leaf_segments(self, leaves: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Expand (query, leaf) pairs to (query, segment) pairs."""
+        counts: np.ndarray = self.leaf_count[leaves[:, 1]]
+        queries: np.ndarray = np.repeat(leaves[:, 0], counts)
+        offsets: np.ndarray = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        return queries, np.repeat(self.leaf_start[leaves[:, 1]], counts) + offsets
+
+    def ray_cast(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        tolerance: float = 0,
+        max_distance: float = np.inf,
+    ) -> RayHits:
+        """Return the first segment each ray passes within tolerance of.
+
+        :param origins: Array like of ray origins, shape (R, 3)
+        :param directions: Array like of ray directions, shape (R, 3), they
+                           need not be normalized.
+        :param tolerance: The radius around each segment that counts as a hit,
+                          segments have no thickness so rays only hit them
+                          exactly when tolerance is 0.
+        :param max_distance: Ignore hits further along the ray than this
+        :returns: The first hit of each ray
+        """
+        o: np.ndarray = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        d: np.ndarray = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        if o.shape != d.shape:
+            raise ValueError(f"origins shape:{o.shape} != directions shape:{d.shape}")
+        num_rays: int = o.shape[0]
+        if num_rays == 0:
+            return RayHits(
+                hit=np.zeros(0, dtype=bool),
+                distance=np.empty(0),
+                segment=np.empty(0, dtype=np.int64),
+                wire=np.empty(0, dtype=np.int64),
+                t=np.empty(0),
+            )
+        with np.errstate(divide="ignore"):
+            inv_d: np.ndarray = 1 / d
+
+        leaf_pairs: List[np.ndarray] = []
+        pairs: np.ndarray = np.stack(
+            [np.arange(num_rays), np.ones(num_rays, dtype=np.int64)], axis=1
+        )
+        while len(pairs):
+            r, n = pairs[:, 0], pairs[:, 1]
+            t_near, t_far = _slab(
+                o[r], inv_d[r], self.lo[n] - tolerance, self.hi[n] + tolerance
+            )
+            keep: np.ndarray = (
+                (t_near <= t_far) & (t_far >= 0) & (t_near <= max_distance)
+            )
+            leaves, pairs = self._descend(pairs, keep)
+            leaf_pairs.append(leaves)
+
+        best: np.ndarray = np.full(num_rays, np.inf)
+        segment: np.ndarray = np.full(num_rays, -1)
+        seg_s: np.ndarray = np.zeros(num_rays)
+        rays, segs = self._leaf_segments(np.concatenate(leaf_pairs))
+        if len(rays):
+            # The ray as a segment long enough to pass through the whole tree
+            length: np.ndarray = self._extent(o[rays], d[rays], max_distance)
+            dist, s, u = segment_segment(
+                self.p[segs], self.q[segs], o[rays], o[rays] + d[rays] * length[:, None]
+            )
+            along: np.ndarray = u * length
+            hit: np.ndarray = (dist <= tolerance) & (along <= max_distance)
+            rays, segs, along, s = rays[hit], segs[hit], along[hit], s[hit]
+
+            # The closest hit along each ray, sort by ray then distance
+            order: np.ndarray = np.lexsort((along, rays))
+            rays, segs, along, s = rays[order], segs[order], along[order], s[order]
+            first: np.ndarray = np.ones(len(rays), dtype=bool)
+            first[1:] = rays[1:] != rays[:-1]
+            best[rays[first]] = along[first]
+            segment[rays[first]] = segs[first]
+            seg_s[rays[first]] = s[first]
+
+        found: np.ndarray = segment >= 0
+        wire: np.ndarray = np.where(found, self.seg_wire[segment], -1)
+        t: np.ndarray = np.where(
+            found,
+            self.seg_t0[segment]
+            + seg_s * (self.seg_t1[segment] - self.seg_t0[segment]),
+            np.nan,
+        )
+        return RayHits(hit=found, distance=best, segment=segment, wire=wire, t=t)
+
+    def _extent(self, o: np.ndarray, d: np.ndarray, max_distance: float) -> np.ndarray:
+        """Ray parameter beyond which no ray can hit the root bounds."""
+        corners: np.ndarray = np.stack([self.lo[1], self.hi[1]])
+        far: float = float(np.linalg.norm(corners[1] - corners[0]))
+        speed: np.ndarray = np.linalg.norm(d, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            reach: np.ndarray = (np.linalg.norm(o - corners[0], axis=1) + far) / speed
+        reach = np.where(speed > 0, reach, 0)
+        return np.minimum(reach, max_distance)
+
+    def overlap_box(
+        self, lo: np.ndarray, hi: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the segments that intersect each of a batch of boxes.
+
+        :param lo: Array like of the lower corners of the boxes, shape (B, 3)
+        :param hi: Array like of the upper corners of the boxes, shape (B, 3)
+        :returns: (box, segment) two arrays of equal length, each entry is the
+                  index of a box and of a segment which intersect, sorted by
+                  box then segment.
+        """
+        box_lo: np.ndarray = np.asarray(lo, dtype=np.float64).reshape(-1, 3)
+        box_hi: np.ndarray = np.asarray(hi, dtype=np.float64).reshape(-1, 3)
+        if box_lo.shape != box_hi.shape:
+            raise ValueError(f"lo shape:{box_lo.shape} != hi shape:{box_hi.shape}")
+        num_boxes: int = box_lo.shape[0]
+        if num_boxes == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        leaf_pairs: List[np.ndarray] = []
+        pairs: np.ndarray = np.stack(
+            [np.arange(num_boxes), np.ones(num_boxes, dtype=np.int64)], axis=1
+        )
+        while len(pairs):
+            b, n = pairs[:, 0], pairs[:, 1]
+            keep: np.ndarray = np.all(
+                (self.lo[n] <= box_hi[b]) & (self.hi[n] >= box_lo[b]), axis=1
+            )
+            leaves, pairs = self._descend(pairs, keep)
+            leaf_pairs.append(leaves)
+
+        boxes, segs = self._leaf_segments(np.concatenate(leaf_pairs))
+
+        # Clip each segment to the slabs of its box
+        p: np.ndarray = self.p[segs]
+        d: np.ndarray = self.q[segs] - p
+        with np.errstate(divide="ignore"):
+            t_near, t_far = _slab(p, 1 / d, box_lo[boxes], box_hi[boxes])
+        hit: np.ndarray = np.maximum(t_near, 0) <= np.minimum(t_far, 1)
+        boxes, segs = boxes[hit], segs[hit]
+        order: np.ndarray = np.lexsort((segs, boxes))
+        return boxes[order], segs[order]
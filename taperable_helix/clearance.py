@@ -0,0 +1,216 @@
+"""Clearance between the wires of two thread profiles.
+
+A thread is described by a Helix and the HelixLocations of the wires
+along its edges. clearance() returns the minimum distance between any
+wire of one thread and any wire of the other, for instance between a
+bolt and its nut, without comparing every pair of sampled points:
+
+1. Every sampled point of the second thread is projected onto each wire
+   of the first with closest_points(), which uses the periodicity of the
+   helix to find the nearest turn directly. This gives an upper bound.
+2. The segments of the first thread are put in a uniform grid whose cell
+   size is derived from that bound, so each segment of the second thread
+   is only compared to the segments in the 27 cells around it.
+3. The closest pair of segments is refined on the actual helixes by
+   alternately projecting onto each wire.
+"""
+
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from ._segments import segment_segment
+from .closest import closest_points
+from .helix import Helix, HelixLocation
+from .vectorized import _evaluate
+
+# Number of segments of the second thread processed at a time, bounds
+# the memory used for the candidate pairs.
+_chunk_size: int = 1024
+
+# Maximum number of points of each wire of the second thread projected
+# onto the first to compute the upper bound.
+_bound_points: int = 256
+
+
+@dataclass
+class ThreadProfile:
+    """A thread, its Helix and the HelixLocation of each of its wires."""
+
+    helix: Helix
+    """The helix shared by all of the wires"""
+
+    locations: Sequence[HelixLocation]
+    """The location of each wire, for instance the three corners of a
+    triangular thread."""
+
+
+@dataclass
+class Clearance:
+    """The result of clearance()."""
+
+    distance: float
+    """The minimum distance between the wires, 0 if they intersect"""
+
+    wire_a: int
+    """Index in the first profile's locations of the closest wire"""
+
+    t_a: float
+    """t of the closest point on wire_a"""
+
+    point_a: Tuple[float, float, float]
+    """The closest point on wire_a"""
+
+    wire_b: int
+    """Index in the second profile's locations of the closest wire"""
+
+    t_b: float
+    """t of the closest point on wire_b"""
+
+    point_b: Tuple[float, float, float]
+    """The closest point on wire_b"""
+
+
+def _sample(profile: ThreadProfile, num_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return t, shape (N,), and the points of every wire, shape (W, N, 3)."""
+    if len(profile.locations) == 0:
+        raise ValueError("ThreadProfile.locations should not be empty")
+    h: Helix = profile.helix
+    t: np.ndarray = np.linspace(h.first_t, h.last_t, num_points)
+    wires: List[np.ndarray] = [
+        _evaluate(h._geometry(hl), t)[0] for hl in profile.locations
+    ]
+    return t, np.stack(wires)
+
+
+def _cell_keys(cells: np.ndarray) -> np.ndarray:
+    """Hash integer cell coordinates, shape (K, 3), to one int64 per cell.
+    Collisions only add candidates which are then rejected by distance.
+    """
+    c: np.ndarray = cells.astype(np.int64)
+    return (c[:, 0] * 73856093) ^ (c[:, 1] * 19349663) ^ (c[:, 2] * 83492791)
+
+
+def _point(profile: ThreadProfile, wire: int, t: float) -> np.ndarray:
+    g = profile.helix._geometry(profile.locations[wire])
+    return _evaluate(g, np.array([t]))[0][0]
+
+
+def clearance(
+    a: ThreadProfile, b: ThreadProfile, num_points: int = 1000, iterations: int = 3
+) -> Clearance:
+    """Return the minimum distance between the wires of two thread profiles.
+
+    :param a: The first thread profile
+    :param b: The second thread profile
+    :param num_points: The number of points sampled along each wire, the
+                       segments between them are what the spatial index holds.
+    :param iterations: Number of alternating projections used to refine
+                       the closest pair of segments on the actual helixes.
+    :returns: The minimum clearance and where it occurs
+    """
+    if num_points < 2:
+        raise ValueError(f"num_points:{num_points} should be >= 2")
+    t_a, wires_a = _sample(a, num_points)
+    t_b, wires_b = _sample(b, num_points)
+
+    # 1. Upper bound from the analytic projection of b's points onto a
+    stride: int = max(1, num_points // _bound_points)
+    best: Tuple[float, int, float, int, float] = (np.inf, 0, 0.0, 0, 0.0)
+    for wb in range(wires_b.shape[0]):
+        for wa, hl in enumerate(a.locations):
+            cp = closest_points(a.helix, wires_b[wb, ::stride], hl)
+            k: int = int(np.argmin(cp.distance))
+            if cp.distance[k] < best[0]:
+                tk: float = float(t_b[k * stride])
+                best = (float(cp.distance[k]), wa, float(cp.t[k]), wb, tk)
+    upper: float = best[0]
+
+    # 2. Segments of a in a uniform grid, b's segments query their neighbors
+    n: int = num_points - 1
+    p_a: np.ndarray = wires_a[:, :-1].reshape(-1, 3)
+    q_a: np.ndarray = wires_a[:, 1:].reshape(-1, 3)
+    p_b: np.ndarray = wires_b[:, :-1].reshape(-1, 3)
+    q_b: np.ndarray = wires_b[:, 1:].reshape(-1, 3)
+    mid_a: np.ndarray = (p_a + q_a) / 2
+    mid_b: np.ndarray = (p_b + q_b) / 2
+    len_a: float = float(np.linalg.norm(q_a - p_a, axis=1).max())
+    len_b: float = float(np.linalg.norm(q_b - p_b, axis=1).max())
+
+    # Segments closer than upper have midpoints closer than cell
+    cell: float = upper + (len_a + len_b) / 2
+    if upper > 0 and cell > 0:
+        keys_a: np.ndarray = _cell_keys(np.floor(mid_a / cell))
+        order: np.ndarray = np.argsort(keys_a, kind="stable")
+        sorted_keys: np.ndarray = keys_a[order]
+        offsets: np.ndarray = np.array(
+            [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)]
+        )
+
+        seg_best: Tuple[float, int, float, int, float] = (np.inf, 0, 0.0, 0, 0.0)
+        for start in range(0, p_b.shape[0], _chunk_size):
+            stop: int = min(start + _chunk_size, p_b.shape[0])
+            cells_b: np.ndarray = np.floor(mid_b[start:stop] / cell)
+            idx_b: List[np.ndarray] = []
+            idx_a: List[np.ndarray] = []
+            for off in offsets:
+                keys: np.ndarray = _cell_keys(cells_b + off)
+                lo: np.ndarray = np.searchsorted(sorted_keys, keys, side="left")
+                hi: np.ndarray = np.searchsorted(sorted_keys, keys, side="right")
+                counts: np.ndarray = hi - lo
+                total: int = int(counts.sum())
+                if total == 0:
+                    continue
+                rows: np.ndarray = np.repeat(np.arange(start, stop), counts)
+                first: np.ndarray = np.repeat(lo - np.cumsum(counts) + counts, counts)
+                idx_b.append(rows)
+                idx_a.append(order[first + np.arange(total)])
+            if not idx_b:
+                continue
+            ib: np.ndarray = np.concatenate(idx_b)
+            ia: np.ndarray = np.concatenate(idx_a)
+
+            # Reject hash collisions and pairs too far apart to matter
+            near: np.ndarray = np.linalg.norm(mid_a[ia] - mid_b[ib], axis=1) <= cell
+            ia, ib = ia[near], ib[near]
+            if ia.shape[0] == 0:
+                continue
+            dist, s, u = segment_segment(p_a[ia], q_a[ia], p_b[ib], q_b[ib])
+            k = int(np.argmin(dist))
+            if dist[k] < seg_best[0]:
+                sa: int = int(ia[k])
+                sb: int = int(ib[k])
+                seg_best = (
+                    float(dist[k]),
+                    sa // n,
+                    float(t_a[sa % n] + s[k] * (t_a[sa % n + 1] - t_a[sa % n])),
+                    sb // n,
+                    float(t_b[sb % n] + u[k] * (t_b[sb % n + 1] - t_b[sb % n])),
+                )
+        if seg_best[0] < best[0]:
+            best = seg_best
+
+    # 3. Refine on the helixes by alternating projections
+    _, wa, ta, wb, tb = best
+    pa: np.ndarray = _point(a, wa, ta)
+    pb: np.ndarray = _point(b, wb, tb)
+    dist_best: float = float(np.linalg.norm(pa - pb))
+    for _ in range(iterations):
+        cp_a = closest_points(a.helix, pb[None], a.locations[wa])
+        cp_b = closest_points(b.helix, cp_a.points, b.locations[wb])
+        if cp_b.distance[0] >= dist_best:
+            break
+        ta, pa = float(cp_a.t[0]), cp_a.points[0]
+        tb, pb = float(cp_b.t[0]), cp_b.points[0]
+        dist_best = float(cp_b.distance[0])
+
+    return Clearance(
+        distance=dist_best,
+        wire_a=wa,
+        t_a=ta,
+        point_a=(float(pa[0]), float(pa[1]), float(pa[2])),
+        wire_b=wb,
+        t_b=tb,
+        point_b=(float(pb[0]), float(pb[1]), float(pb[2])),
+    )
@@ -0,0 +1,316 @@
+"""The taperable-helix command line generator.
+
+Generates the points of one or more wires of a Helix, or the mesh of the
+surface they bound, and streams them in chunks to stdout or a file so it
+can be used as a filter in a pipeline::
+
+    taperable-helix --radius 5 --pitch 2 --height 6 --num-points 1000
+    taperable-helix --radius 5 --pitch 2 --height 6 \\
+        --location 0,0 --location 0.5,0.2 --location 0,0.4 --format obj > thread.obj
+
+The Helix and HelixLocation parameters may instead be read as a batch of
+jobs, one JSON object per line, from a file or stdin with --jobs. The keys
+of a job are the Helix attributes, "locations" a list of HelixLocation
+attributes and "num_points", "format" and "output". Missing keys default
+to the command line values. Jobs with the same output are written one after
+another as a single stream, the csv header is written once and the wire
+numbers continue across the jobs, as do the obj vertex numbers, so they
+should have the same format::
+
+    {"radius": 5, "pitch": 2, "height": 6, "output": "a.csv"}
+    {"radius": 3, "pitch": 1, "height": 4, "locations": [{"horz_offset": 0.2}]}
+
+Formats:
+
+* csv: a "wire,x,y,z" header then a row per point, wire by wire
+* binary: little endian float64 x, y, z per point, wire by wire, no header
+* obj: a Wavefront OBJ mesh, see taperable_helix.mesh, requires NumPy
+
+NumPy is used when it is installed, otherwise the points are generated by
+the function returned by Helix.helix().
+"""
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from dataclasses import fields
+from importlib.util import find_spec
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .helix import Helix, HelixLocation
+
+formats: List[str] = ["csv", "binary", "obj"]
+
+_helix_keys: List[str] = [f.name for f in fields(Helix)]
+_location_keys: List[str] = [f.name for f in fields(HelixLocation)]
+_job_keys: List[str] = _helix_keys + ["locations", "num_points", "format", "output"]
+
+
+def _num_points(text: str) -> int:
+    """Parse --num-points, which can't be negative."""
+    value: int = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"{value} should be >= 0")
+    return value
+
+
+def _location(text: str) -> Dict[str, float]:
+    """Parse "horz_offset,vert_offset[,radius]" of --location."""
+    values: List[float] = [float(v) for v in text.split(",")]
+    if len(values) < 2 or len(values) > 3:
+        raise argparse.ArgumentTypeError(
+            f"{text!r} should be horz_offset,vert_offset[,radius]"
+        )
+    location: Dict[str, float] = {"horz_offset": values[0], "vert_offset": values[1]}
+    if len(values) == 3:
+        location["radius"] = values[2]
+    return location
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="taperable-helix",
+        description="Generate the points or mesh of a taperable helix.",
+    )
+    parser.add_argument("--radius", type=float, help="radius of the helix")
+    parser.add_argument("--pitch", type=float, help="pitch of the helix")
+    parser.add_argument("--height", type=float, help="height of the helix")
+    parser.add_argument("--taper-out-rpos", type=float, default=0)
+    parser.add_argument("--taper-in-rpos", type=float, default=1)
+    parser.add_argument("--inset-offset", type=float, default=0)
+    parser.add_argument("--first-t", type=float, default=0)
+    parser.add_argument("--last-t", type=float, default=1)
+    parser.add_argument(
+        "--location",
+        type=_location,
+        action="append",
+        dest="locations",
+        metavar="HO,VO[,RADIUS]",
+        help="horz_offset, vert_offset and optional radius of a wire, "
+        "repeat for each wire (default one wire at 0,0)",
+    )
+    parser.add_argument("-n", "--num-points", type=_num_points, default=100)
+    parser.add_argument(
+        "--chunk-size", type=int, default=65536, help="points generated at a time"
+    )
+    parser.add_argument("-f", "--format", choices=formats, default="csv")
+    parser.add_argument(
+        "-o", "--output", default="-", help="output file, - for stdout (default)"
+    )
+    parser.add_argument(
+        "--jobs", metavar="PATH", help="JSON lines file of jobs, - for stdin"
+    )
+    return parser
+
+
+def _read_jobs(path: str) -> Iterator[Dict[str, Any]]:
+    """Generate the jobs of a JSON lines file, blank lines are ignored."""
+    stream: IO[str] = sys.stdin if path == "-" else open(path, "r")
+    try:
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            job: Any = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError(f"{path}:{number}: job should be a JSON object")
+            unknown: List[str] = sorted(set(job) - set(_job_keys))
+            if unknown:
+                raise ValueError(f"{path}:{number}: unknown keys {unknown}")
+            for location in job.get("locations") or []:
+                if not isinstance(location, dict):
+                    raise ValueError(
+                        f"{path}:{number}: location should be a JSON object"
+                    )
+                unknown = sorted(set(location) - set(_location_keys))
+                if unknown:
+                    raise ValueError(
+                        f"{path}:{number}: unknown location keys {unknown}"
+                    )
+            yield job
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def _job(
+    defaults: Dict[str, Any], job: Dict[str, Any]
+) -> Tuple[Helix, List[HelixLocation], int, str, str]:
+    """Return the Helix, locations, num_points, format and output of a job,
+    which are validated so nothing is written for a bad job."""
+    values: Dict[str, Any] = dict(defaults)
+    values.update(job)
+    missing: List[str] = [k for k in ("radius", "pitch", "height") if values[k] is None]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} required")
+    if values["format"] not in formats:
+        raise ValueError(f"format:{values['format']} should be one of {formats}")
+    helix: Helix = Helix(**{k: values[k] for k in _helix_keys})
+    locations: List[HelixLocation] = [
+        HelixLocation(**{k: loc[k] for k in _location_keys if k in loc})
+        for loc in (values["locations"] or [{}])
+    ]
+    for hl in locations:
+        helix._geometry(hl)
+    num_points: int = int(values["num_points"])
+    if num_points < 0:
+        raise ValueError(f"num_points:{num_points} should be >= 0")
+    if values["format"] == "obj" and num_points < 2:
+        raise ValueError(f"num_points:{num_points} should be >= 2 for obj format")
+    return (helix, locations, num_points, values["format"], values["output"])
+
+
+def _chunk_ts(helix: Helix, num_points: int, chunk_size: int) -> Iterator[List[float]]:
+    """Generate the t values of vectorized.helix_chunks() without NumPy."""
+    step: float = (
+        (helix.last_t - helix.first_t) / (num_points - 1) if num_points > 1 else 0
+    )
+    for first in range(0, num_points, chunk_size):
+        n: int = min(chunk_size, num_points - first)
+        t: List[float] = [helix.first_t + step * i for i in range(first, first + n)]
+        if first + n == num_points:
+            t[-1] = helix.last_t
+        yield t
+
+
+def _point_chunks(
+    helix: Helix, hl: HelixLocation, num_points: int, chunk_size: int, use_numpy: bool
+) -> Iterator[Any]:
+    """Generate the points of a wire in chunks, NumPy arrays or lists."""
+    if use_numpy:
+        from .vectorized import helix_chunks
+
+        yield from helix_chunks(helix, num_points, hl, chunk_size)
+        return
+    f = helix.helix(hl)
+    for t in _chunk_ts(helix, num_points, chunk_size):
+        yield list(map(f, t))
+
+
+def _encode(fmt: str, wire: int, chunk: Any) -> bytes:
+    """Return a chunk of points, a NumPy array or list of tuples, as the
+    csv rows or binary of fmt."""
+    if fmt == "csv":
+        # repr() is the shortest text that reads back exactly
+        row: str = f"{wire},%r,%r,%r\n"
+        rows = chunk if isinstance(chunk, list) else chunk.tolist()
+        return "".join(row % tuple(p) for p in rows).encode()
+    if not isinstance(chunk, list):
+        return chunk.astype("<f8").tobytes()
+    values = array("d", [v for p in chunk for v in p])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _write_points(
+    out: IO[bytes],
+    fmt: str,
+    helix: Helix,
+    locations: List[HelixLocation],
+    num_points: int,
+    chunk_size: int,
+    use_numpy: bool,
+    first_wire: int,
+) -> int:
+    """Write the wires numbered from first_wire, returns the next wire number."""
+    for wire, hl in enumerate(locations, first_wire):
+        for chunk in _point_chunks(helix, hl, num_points, chunk_size, use_numpy):
+            out.write(_encode(fmt, wire, chunk))
+    return first_wire + len(locations)
+
+
+def _write_obj(
+    out: IO[bytes],
+    helix: Helix,
+    locations: List[HelixLocation],
+    num_points: int,
+    chunk_size: int,
+    vertex_offset: int,
+) -> int:
+    """Write a mesh whose vertices follow vertex_offset vertices already
+    written to out, returns the new vertex count."""
+    from .mesh import mesh_chunks
+
+    for mesh in mesh_chunks(helix, locations, num_points, chunk_size):
+        out.write(
+            "".join("v %r %r %r\n" % tuple(v) for v in mesh.vertices.tolist()).encode()
+        )
+        faces = (mesh.faces + (vertex_offset + 1)).tolist()
+        out.write("".join("f %d %d %d\n" % tuple(f) for f in faces).encode())
+    return vertex_offset + num_points * len(locations)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the taperable-helix command, returns the exit status.
+
+    :param argv: The arguments, default sys.argv[1:]
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error(f"--chunk-size:{args.chunk_size} should be >= 1")
+    defaults: Dict[str, Any] = {k: getattr(args, k) for k in _job_keys}
+    jobs: Iterator[Dict[str, Any]] = (
+        _read_jobs(args.jobs) if args.jobs is not None else iter([{}])
+    )
+    use_numpy: bool = find_spec("numpy") is not None
+
+    # Outputs stay open across jobs so jobs with the same output are
+    # written one after another, wire and obj vertex numbers continue
+    # across them.
+    outputs: Dict[str, IO[bytes]] = {}
+    formats_of: Dict[str, str] = {}
+    counts: Dict[str, int] = {}
+    try:
+        for job in jobs:
+            helix, locations, num_points, fmt, output = _job(defaults, job)
+            if fmt == "obj" and not use_numpy:
+                raise ValueError("obj format requires numpy")
+            if formats_of.setdefault(output, fmt) != fmt:
+                raise ValueError(
+                    f"format:{fmt} of output:{output} should be {formats_of[output]}"
+                    " as it was for an earlier job"
+                )
+            if output not in outputs:
+                outputs[output] = (
+                    sys.stdout.buffer if output == "-" else open(output, "wb")
+                )
+                if fmt == "csv":
+                    outputs[output].write(b"wire,x,y,z\n")
+            out: IO[bytes] = outputs[output]
+            if fmt == "obj":
+                counts[output] = _write_obj(
+                    out,
+                    helix,
+                    locations,
+                    num_points,
+                    args.chunk_size,
+                    counts.get(output, 0),
+                )
+            else:
+                counts[output] = _write_points(
+                    out,
+                    fmt,
+                    helix,
+                    locations,
+                    num_points,
+                    args.chunk_size,
+                    use_numpy,
+                    counts.get(output, 0),
+                )
+            out.flush()
+    except BrokenPipeError:
+        # The reader went away, e.g. piped to head, which isn't an error.
+        # Point stdout at devnull so the interpreter's final flush is quiet.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError, TypeError) as err:
+        print(f"{parser.prog}: error: {err}", file=sys.stderr)
+        return 1
+    finally:
+        for name, stream in outputs.items():
+            if name != "-":
+                stream.close()
+    return 0
@@ -0,0 +1,164 @@
+"""Closest point queries against a helix.
+
+Instead of comparing every query point with every sampled point of the
+helix the analytic form is used. The angle of a query point about the
+z-axis, atan2, together with its z gives a small set of candidate t values,
+one per nearby turn, and the closest of a coarse sampling of each turn of
+the taper zones gives one more per turn. Each candidate is then refined
+with a few Newton steps on the full model and the best is kept. The cost
+is proportional to the number of query points times the number of turns
+in the taper zones.
+"""
+
+from dataclasses import dataclass
+from math import ceil, pi
+from typing import List, Optional
+
+import numpy as np
+
+from .helix import Helix, HelixLocation, _Geometry
+from .properties import _zones
+from .vectorized import _evaluate
+
+_taper_seeds_per_turn: int = 16
+"""The number of t sampled per turn of a taper zone to seed its candidate"""
+
+
+@dataclass
+class ClosestPoints:
+    """The result of closest_points(), one entry per query point."""
+
+    t: np.ndarray
+    """t of the closest point on the helix, shape (M,)"""
+
+    points: np.ndarray
+    """The closest points on the helix, shape (M, 3)"""
+
+    distance: np.ndarray
+    """The distance from the query point to the closest point, shape (M,)"""
+
+
+def _candidates(g: _Geometry, q: np.ndarray) -> np.ndarray:
+    """Return the initial t candidates, shape (M, C), for the query points q."""
+    # a = angle_scale * rel_height, x = -r * sin(a) and y = r * cos(a)
+    angle_scale: float = 2 * pi / g.turns
+    phi: np.ndarray = np.arctan2(-q[:, 0], q[:, 1])
+
+    # The slope of z with respect to rel_height in the untapered body
+    z_slope: float = g.helix_height if g.pitch != 0 else 0
+    if z_slope != 0:
+        rel_z: np.ndarray = (q[:, 2] - g.vert_offset - g.inset_offset) / z_slope
+        k0: np.ndarray = np.round((rel_z * angle_scale - phi) / (2 * pi))
+    else:
+        k0 = np.zeros(q.shape[0])
+
+    # Keep the turns in range so points beyond the ends of the helix
+    # still get candidates on the first and last turns.
+    k_a: np.ndarray = -phi / (2 * pi)
+    k_b: np.ndarray = (angle_scale - phi) / (2 * pi)
+    k_lo: np.ndarray = np.ceil(np.minimum(k_a, k_b))
+    k_hi: np.ndarray = np.floor(np.maximum(k_a, k_b))
+    k0 = np.clip(k0, k_lo, np.maximum(k_lo, k_hi))
+
+    rels: List[np.ndarray] = [
+        (phi + (2 * pi * (k0 + k))) / angle_scale for k in (-1, 0, 1)
+    ]
+    rels.append(np.zeros(q.shape[0]))
+    rels.append(np.ones(q.shape[0]))
+    rel: np.ndarray = np.clip(np.stack(rels, axis=1), 0, 1)
+    return g.first_t + rel * g.t_range
+
+
+def _taper_candidates(g: _Geometry, q: np.ndarray) -> np.ndarray:
+    """Return the t candidates in the taper zones, shape (M, T), for the
+    query points q.
+
+    In a taper zone the radius and z change with the taper_scale, so the
+    closest point needn't be on the turns the body candidates are seeded
+    from. Each turn of a zone is sampled evenly and the sample closest to
+    each query point is its candidate in that turn.
+    """
+    columns: List[np.ndarray] = []
+    for lo, hi in _zones(g)[2]:
+        # 1 / turns is the number of turns from first_t to last_t
+        turns: int = max(1, ceil((hi - lo) / abs(g.t_range) / abs(g.turns)))
+        seeds: np.ndarray = np.linspace(lo, hi, turns * _taper_seeds_per_turn + 1)
+        points: np.ndarray = _evaluate(g, seeds)[0]
+        for turn in range(turns):
+            first: int = turn * _taper_seeds_per_turn
+            best: np.ndarray = np.full(q.shape[0], np.inf)
+            t: np.ndarray = np.full(q.shape[0], seeds[first])
+            for seed, p in zip(
+                seeds[first : first + _taper_seeds_per_turn + 1],
+                points[first : first + _taper_seeds_per_turn + 1],
+            ):
+                d: np.ndarray = np.einsum("ij,ij->i", q - p, q - p)
+                closer: np.ndarray = d < best
+                best[closer] = d[closer]
+                t[closer] = seed
+            columns.append(t)
+    return np.stack(columns, axis=1) if columns else np.empty((q.shape[0], 0))
+
+
+def _refine(g: _Geometry, q: np.ndarray, t: np.ndarray, iterations: int) -> np.ndarray:
+    """Return t refined by Newton steps towards the closest t of each q.
+
+    :param g: The geometry returned by Helix._geometry()
+    :param q: The query points, shape (M, 3)
+    :param t: The initial t of each query point, shape (M,)
+    :param iterations: The number of Newton steps
+    :returns: The refined t, within first_t and last_t
+    """
+    if g.t_range == 0:
+        return t
+    t_lo: float = min(g.first_t, g.last_t)
+    t_hi: float = max(g.first_t, g.last_t)
+    for _ in range(iterations):
+        p, d1, d2 = _evaluate(g, t, 2)
+        diff: np.ndarray = p - q
+        grad: np.ndarray = np.einsum("ij,ij->i", diff, d1)
+        speed2: np.ndarray = np.einsum("ij,ij->i", d1, d1)
+        hess: np.ndarray = speed2 + np.einsum("ij,ij->i", diff, d2)
+
+        # Newton where the distance is locally convex otherwise fall
+        # back to a Gauss-Newton step which always descends.
+        denom: np.ndarray = np.where(hess > 0, hess, speed2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step: np.ndarray = np.where(denom > 0, grad / denom, 0)
+        t = np.clip(t - step, t_lo, t_hi)
+    return t
+
+
+def closest_points(
+    helix: Helix,
+    points: np.ndarray,
+    hl: Optional[HelixLocation] = None,
+    iterations: int = 4,
+) -> ClosestPoints:
+    """Return the closest point on the helix for every query point.
+
+    :param helix: The helix to query
+    :param points: Array like of shape (M, 3) of query points
+    :param hl: Defines a refinded location when the helix is tapered
+    :param iterations: The number of Newton steps used to refine each
+                       candidate, default 4.
+    :returns: The t, point and distance of the closest point for each query
+    """
+    q: np.ndarray = np.asarray(points, dtype=np.float64)
+    if q.ndim != 2 or q.shape[1] != 3:
+        raise ValueError(f"points shape:{q.shape} should be (M, 3)")
+
+    g: _Geometry = helix._geometry(hl)
+    cand: np.ndarray = np.concatenate(
+        [_candidates(g, q), _taper_candidates(g, q)], axis=1
+    )
+    m, c = cand.shape
+    qq: np.ndarray = np.repeat(q, c, axis=0)
+    t: np.ndarray = _refine(g, qq, cand.reshape(-1), iterations)
+
+    p: np.ndarray = _evaluate(g, t)[0]
+    dist: np.ndarray = np.linalg.norm(p - qq, axis=1).reshape(m, c)
+    best: np.ndarray = np.argmin(dist, axis=1)
+    rows: np.ndarray = np.arange(m)
+    idx: np.ndarray = rows * c + best
+    return ClosestPoints(t=t[idx], points=p[idx], distance=dist[rows, best])
@@ -0,0 +1,395 @@
+"""Fit the parameters of a Helix and HelixLocation to a point cloud.
+
+The points, for instance a scan of a thread, are in the frame of the
+helix, its axis is the z axis. Each is matched to its closest point on the
+helix, see taperable_helix.closest, and the parameters are refined by
+Levenberg-Marquardt steps minimizing the weighted sum of the squared
+distances::
+
+    result = fit_helix(scan, nominal, params=("radius", "pitch", "height"))
+    result.helix, result.rms, result.std_errors["pitch"]
+
+As t of each point is the closest t the residual, the point minus its
+closest point, is normal to the helix. The analytic derivatives of a point
+with respect to the parameters, at a fixed t, are projected onto the
+normal plane so the change of the closest t doesn't need its own unknown.
+
+Large clouds are subsampled to max_points for the fit and outliers are
+down weighted by a robust loss, with a scale estimated from the median
+distance every iteration. Between iterations the closest t of the points
+are only refined, a full search is done again before stopping.
+"""
+
+from dataclasses import dataclass, replace
+from math import pi, sqrt
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .closest import _refine, closest_points
+from .helix import Helix, HelixLocation, _Geometry
+from .vectorized import _evaluate, _taper, _taper_angle
+
+_helix_params: Tuple[str, ...] = (
+    "radius",
+    "pitch",
+    "height",
+    "inset_offset",
+    "taper_out_rpos",
+    "taper_in_rpos",
+)
+_location_params: Tuple[str, ...] = ("horz_offset", "vert_offset")
+
+_losses: Dict[str, float] = {"linear": 0, "huber": 1.345, "cauchy": 2.385}
+"""The robust losses and their tuning constants, in units of the scale"""
+
+
+@dataclass
+class HelixFit:
+    """The result of fit_helix()."""
+
+    helix: Helix
+    """The fitted helix"""
+
+    location: HelixLocation
+    """The fitted location"""
+
+    params: Dict[str, float]
+    """The fitted value of each parameter"""
+
+    std_errors: Dict[str, float]
+    """The estimated standard error of each parameter, inf when it can't be
+    determined from the points"""
+
+    distances: np.ndarray
+    """The distance from each point to the fitted helix, of every point when
+    all_points otherwise of the fitted subsample"""
+
+    rms: float
+    """The root mean square of the distances"""
+
+    median: float
+    """The median of the distances"""
+
+    p95: float
+    """The 95th percentile of the distances"""
+
+    max: float
+    """The maximum of the distances"""
+
+    num_fitted: int
+    """The number of points in the subsample which was fitted"""
+
+    iterations: int
+    """The number of iterations"""
+
+    converged: bool
+    """True if the parameters converged within max_iterations"""
+
+
+def _apply(
+    helix: Helix, hl: HelixLocation, names: Sequence[str], values: np.ndarray
+) -> Tuple[Helix, HelixLocation]:
+    """Return the helix and location with the parameters names set to values."""
+    changes: Dict[str, float] = dict(zip(names, values.tolist()))
+    if "radius" in changes and hl.radius is not None:
+        hl = replace(hl, radius=changes.pop("radius"))
+    helix = replace(helix, **{n: v for n, v in changes.items() if n in _helix_params})
+    hl = replace(hl, **{n: v for n, v in changes.items() if n in _location_params})
+    return helix, hl
+
+
+def _jacobian(g: _Geometry, t: np.ndarray, names: Sequence[str]) -> np.ndarray:
+    """Return the derivatives of the points at t with respect to the
+    parameters names, with t fixed, shape (len(t), 3, len(names))."""
+    rel: np.ndarray = (t - g.first_t) / g.t_range
+    a: np.ndarray = (2 * pi / g.turns) * rel
+    angle: np.ndarray = _taper_angle(g, t)[0]
+    s: np.ndarray = np.sin(angle)
+    zone: np.ndarray = _taper(g, t)
+    pitched: bool = g.pitch != 0 and g.helix_height != 0
+    zeros: np.ndarray = np.zeros(t.shape)
+
+    # The radial direction and the derivative with respect to a
+    r: np.ndarray = g.radius + g.horz_offset * s
+    radial: np.ndarray = np.stack([np.sin(-a), np.cos(a), zeros], axis=1)
+    dp_da: np.ndarray = np.stack([-r * np.cos(a), -r * np.sin(a), zeros], axis=1)
+    # The derivative with respect to the taper_scale
+    dp_ds: np.ndarray = g.horz_offset * radial
+    dp_ds[:, 2] = g.vert_offset
+
+    def z(values: np.ndarray) -> np.ndarray:
+        return np.stack([zeros, zeros, values], axis=1)
+
+    z_rel: np.ndarray = rel if g.pitch != 0 else np.ones(t.shape)
+    columns: List[np.ndarray] = []
+    for name in names:
+        if name == "radius":
+            column: np.ndarray = radial
+        elif name == "horz_offset":
+            column = s[:, None] * radial
+        elif name == "vert_offset":
+            column = z(s)
+        elif name == "pitch":
+            column = dp_da * (-a / g.pitch)[:, None] if pitched else z(zeros)
+        elif name == "height":
+            column = z(z_rel)
+            if pitched:
+                column = column + dp_da * (a / g.helix_height)[:, None]
+        elif name == "inset_offset":
+            column = z(1 - 2 * z_rel)
+            if pitched:
+                column = column - dp_da * (2 * a / g.helix_height)[:, None]
+        else:
+            # sin(angle) with angle = pi / 2 * rel / taper_out_rpos in the
+            # out zone and pi / 2 * (1 - rel) / (1 - taper_in_rpos) in the in
+            ds: np.ndarray = zeros.copy()
+            if name == "taper_out_rpos":
+                out: np.ndarray = zone < 0
+                rpos: float = g.taper_out_range / g.t_range
+                ds[out] = -np.cos(angle[out]) * angle[out] / rpos
+            else:
+                tin: np.ndarray = zone > 0
+                ds[tin] = np.cos(angle[tin]) * angle[tin] * g.t_range / g.taper_in_range
+            column = ds[:, None] * dp_ds
+        columns.append(column)
+    return np.stack(columns, axis=2)
+
+
+def _residuals(
+    helix: Helix, hl: HelixLocation, q: np.ndarray, t: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the closest t of the points q, the residuals q minus their
+    closest points and the unit tangents at those points.
+
+    Passing the closest t of the previous parameters only refines them by
+    two Newton steps, rather than searching every nearby turn.
+    """
+    g: _Geometry = helix._geometry(hl)
+    if t is None:
+        t = closest_points(helix, q, hl).t
+    else:
+        t = _refine(g, q, t, 2)
+    p, d1 = _evaluate(g, t, 1)
+    speed: np.ndarray = np.linalg.norm(d1, axis=1, keepdims=True)
+    return t, q - p, d1 / np.where(speed > 0, speed, 1)
+
+
+def _weights(distance: np.ndarray, loss: str, scale: Optional[float]) -> np.ndarray:
+    """Return the robust weight of each distance."""
+    k: float = _losses[loss]
+    if k == 0:
+        return np.ones(distance.shape)
+    sigma: float = scale if scale is not None else 1.4826 * float(np.median(distance))
+    if sigma <= 0:
+        return np.ones(distance.shape)
+    u: np.ndarray = distance / (k * sigma)
+    if loss == "huber":
+        return 1 / np.maximum(u, 1)
+    return 1 / (1 + u * u)
+
+
+def _validate(
+    helix: Helix,
+    hl: HelixLocation,
+    names: Sequence[str],
+    loss: str,
+    max_points: int,
+) -> None:
+    """Raise ValueError if the arguments of fit_helix() are invalid."""
+    for name in names:
+        if name not in _helix_params + _location_params:
+            raise ValueError(f"params {name} isn't a parameter")
+    if not names or len(set(names)) != len(names):
+        raise ValueError(f"params:{list(names)} should be distinct and not empty")
+    if loss not in _losses:
+        raise ValueError(f"loss:{loss} should be one of {list(_losses)}")
+    if max_points < len(names):
+        raise ValueError(f"max_points:{max_points} should be >= {len(names)}")
+    if helix._geometry(hl).t_range == 0:
+        raise ValueError("first_t and last_t should differ")
+    if "pitch" in names and helix.pitch == 0:
+        raise ValueError("pitch can only be fitted when it isn't 0")
+    for name in ("taper_out_rpos", "taper_in_rpos"):
+        if name in names and not 0 < getattr(helix, name) < 1:
+            raise ValueError(f"{name} can only be fitted when > 0 and < 1")
+
+
+def _normal_equations(
+    g: _Geometry,
+    names: Sequence[str],
+    t: np.ndarray,
+    e: np.ndarray,
+    tangent: np.ndarray,
+    w: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return J^T W J and J^T W e with the Jacobian J projected onto the
+    plane normal to the helix at each point."""
+    jac: np.ndarray = _jacobian(g, t, names)
+    jac -= tangent[:, :, None] * np.einsum("ij,ijk->ik", tangent, jac)[:, None]
+    wjac: np.ndarray = jac * w[:, None, None]
+    return np.einsum("ijk,ijl->kl", wjac, jac), np.einsum("ijk,ij->k", wjac, e)
+
+
+def _std_errors(normal: np.ndarray, distance: np.ndarray, w: np.ndarray) -> np.ndarray:
+    """Return the standard errors of the parameters from the normal matrix
+    and the weighted distances, inf if the parameters are degenerate."""
+    # Each residual has two degrees of freedom, in the plane normal to the
+    # helix
+    k: int = len(normal)
+    if int(np.linalg.matrix_rank(normal, hermitian=True)) < k:
+        return np.full(k, np.inf)
+    dof: int = max(2 * len(distance) - k, 1)
+    variance: float = float(np.dot(w, distance * distance)) / dof
+    covariance: np.ndarray = np.linalg.pinv(normal, hermitian=True) * variance
+    return np.sqrt(np.maximum(np.diag(covariance), 0))
+
+
+def fit_helix(
+    points: np.ndarray,
+    helix: Helix,
+    hl: Optional[HelixLocation] = None,
+    params: Sequence[str] = ("radius", "pitch", "height"),
+    loss: str = "huber",
+    scale: Optional[float] = None,
+    max_points: int = 100000,
+    max_iterations: int = 50,
+    tol: float = 1e-8,
+    seed: Optional[int] = 0,
+    all_points: bool = False,
+    chunk_size: int = 200000,
+) -> HelixFit:
+    """Return the helix and location which best fit points.
+
+    :param points: Array like of shape (M, 3) in the frame of the helix
+    :param helix: The initial helix, for instance the nominal design, its
+                  first_t and last_t are kept
+    :param hl: The initial location, default HelixLocation(). radius fits
+               its radius when it has one, otherwise the helix's
+    :param params: The names of the parameters to fit, from radius, pitch,
+                   height, inset_offset, taper_out_rpos, taper_in_rpos,
+                   horz_offset and vert_offset. The others are fixed.
+                   The tapers must start within their zones, > 0 and < 1,
+                   and only change the helix if an offset is non zero
+    :param loss: linear for least squares, huber or cauchy to down weight
+                 outliers
+    :param scale: The distance beyond which points are outliers for the
+                  robust losses is a few times scale, default estimated
+                  from the median distance
+    :param max_points: Fit a random subsample of at most max_points
+    :param max_iterations: The maximum number of iterations
+    :param tol: Converged when no parameter changes by more than tol
+                relative to its magnitude, or the cost by less than tol
+                relative to the cost
+    :param seed: The seed of the subsample, None for a random one
+    :param all_points: Compute the distances and statistics of every point
+                       rather than those of the subsample, for large clouds
+                       this takes longer than the fit
+    :param chunk_size: The number of points whose distances are computed
+                       at once when all_points, bounding the memory used
+    :returns: The fitted helix and location and the residual statistics
+    """
+    q: np.ndarray = np.asarray(points, dtype=np.float64)
+    if q.ndim != 2 or q.shape[1] != 3 or len(q) == 0:
+        raise ValueError(f"points shape:{q.shape} should be (M, 3) with M > 0")
+    names: List[str] = list(params)
+    location: HelixLocation = hl if hl is not None else HelixLocation()
+    _validate(helix, location, names, loss, max_points)
+
+    sample: np.ndarray = q
+    if len(q) > max_points:
+        rng: np.random.Generator = np.random.default_rng(seed)
+        sample = q[rng.choice(len(q), max_points, replace=False)]
+
+    values: np.ndarray = np.array(
+        [
+            (
+                location.radius
+                if name == "radius" and location.radius is not None
+                else getattr(location if name in _location_params else helix, name)
+            )
+            for name in names
+        ],
+        dtype=np.float64,
+    )
+    t, e, tangent = _residuals(helix, location, sample)
+    damping: float = 1e-3
+    converged: bool = False
+    iterations: int = 0
+    normal: np.ndarray = np.eye(len(names))
+    while iterations < max_iterations:
+        iterations += 1
+        distance: np.ndarray = np.linalg.norm(e, axis=1)
+        w: np.ndarray = _weights(distance, loss, scale)
+        cost: float = float(np.dot(w, distance * distance))
+
+        normal, gradient = _normal_equations(
+            helix._geometry(location), names, t, e, tangent, w
+        )
+        diag: np.ndarray = np.diag(normal).copy()
+        diag[diag == 0] = 1
+
+        small: bool = False
+        trial_cost: float = cost
+        while True:
+            step: np.ndarray = np.linalg.lstsq(
+                normal + damping * np.diag(diag), gradient, rcond=None
+            )[0]
+            trial: np.ndarray = values + step
+            small = bool(np.all(np.abs(step) <= tol * np.maximum(np.abs(values), 1)))
+            try:
+                trial_helix, trial_hl = _apply(helix, location, names, trial)
+                tt, te, ttangent = _residuals(trial_helix, trial_hl, sample, t)
+                td: np.ndarray = np.linalg.norm(te, axis=1)
+                trial_cost = float(np.dot(w, td * td))
+                accepted: bool = trial_cost <= cost
+            except ValueError:
+                accepted = False
+            if accepted or small:
+                break
+            damping *= 10
+
+        if accepted:
+            damping = max(damping / 10, 1e-12)
+            values = trial
+            helix, location = trial_helix, trial_hl
+            t, e, tangent = tt, te, ttangent
+        if small or cost - trial_cost <= tol * cost:
+            # Check that no point is closer to another turn before stopping
+            t_full, e_full, tangent_full = _residuals(helix, location, sample)
+            full: np.ndarray = np.linalg.norm(e_full, axis=1)
+            if float(np.dot(w, full * full)) >= (1 - tol) * float(
+                np.dot(w, np.sum(e * e, axis=1))
+            ):
+                converged = True
+                break
+            t, e, tangent = t_full, e_full, tangent_full
+
+    distances: np.ndarray = np.linalg.norm(e, axis=1)
+    if all_points:
+        distances = np.concatenate(
+            [
+                closest_points(helix, q[i : i + chunk_size], location).distance
+                for i in range(0, len(q), chunk_size)
+            ]
+        )
+
+    distance = np.linalg.norm(e, axis=1)
+    std_errors: np.ndarray = _std_errors(
+        normal, distance, _weights(distance, loss, scale)
+    )
+
+    return HelixFit(
+        helix=helix,
+        location=location,
+        params=dict(zip(names, values.tolist())),
+        std_errors=dict(zip(names, std_errors.tolist())),
+        distances=distances,
+        rms=sqrt(float(np.mean(distances * distances))),
+        median=float(np.median(distances)),
+        p95=float(np.percentile(distances, 95)),
+        max=float(distances.max()),
+        num_fitted=len(sample),
+        iterations=iterations,
+        converged=converged,
+    )
@@ -1,6 +1,16 @@
+from array import array
 from dataclasses import dataclass
+from itertools import chain
 from math import cos, degrees, pi, sin
-from typing import Callable, Optional, Tuple
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional, Sequence, Tuple
+
+from . import instrumentation as _instrumentation
+from .pointarray import PointArray
+
+if TYPE_CHECKING:
+    from .planner import PointPlan
+    from .samples import HelixSamples
 
 
 @dataclass
@@ -15,6 +25,28 @@ class HelixLocation:
     """vertical added to z of radius"""
 
 
+@dataclass(frozen=True)
+class _Geometry:
+    """The constants derived from a Helix and a HelixLocation that
+    every evaluator of the helix needs. See Helix._geometry().
+    """
+
+    first_t: float
+    last_t: float
+    t_range: float
+    radius: float
+    horz_offset: float
+    vert_offset: float
+    inset_offset: float
+    pitch: float
+    helix_height: float
+    turns: float
+    taper_out_range: float
+    taper_out_ends: float
+    taper_in_range: float
+    taper_in_starts: float
+
+
 @dataclass
 class Helix:
     """This class represents a taperable Helix.
@@ -74,31 +106,12 @@ class Helix:
     last_t: float = 1
     """last_t is the last t value passed to the returned function. Default 1"""
 
-    def helix(
-        self, hl: Optional[HelixLocation] = None
-    ) -> Callable[[float], Tuple[float, float, float]]:
-        """This function returns a Function that is used to generates points
-        on a helix.
-
-        It takes an optional HelixLocation which refines the location of the
-        final helix when its tapered. If HelixLocation is None then the radius
-        is Helix.radius and horz_offset and vert_offset will be 0. If its not None
-        HelixLocation.radius maybe None, in which case Helix.radius will be used.
-        and HelixLocation.horz_offset will be added to the radius and used to
-        calculate x and y. The HelixLocation.vert_offset will be added to z.
-
-        This function returns a function, f. The funciton f that takes one parameter,
-        an inclusive value between first_t and last_t.  We then define
-        t_range=last_t-first_t and the rel_height=(last_t-t)/t_range. The rel_height
-        is the relative position along the "z-axis" which is used to calculate function
-        functions returned tuple(x, y, z) for a point on the helix.
-
-        Credit: Adam Urbanczyk from cadquery [forum post](https://groups.google.com/g/cadquery/c/5kVRpECcxAU/m/7no7_ja6AAAJ)
+    def _geometry(self, hl: Optional[HelixLocation] = None) -> _Geometry:
+        """Validate the attributes and return the constants derived from
+        them and hl. Unlike helix() hl is never modified.
 
         :param hl: Defines a refinded location when the helix is tapered
-        :returns: A function which is passed "t", an inclusive value between first_t
-                  and last_t and returns a 3D point (x, y, z) on the helix as a
-                  function of t.
+        :returns: The derived constants
         """
         if self.taper_out_rpos > self.taper_in_rpos:
             raise ValueError(
@@ -115,11 +128,9 @@ class Helix:
                 f"taper_in_rpos:{self.taper_in_rpos} should be >= 0 and <= 1"
             )
 
-        # Being "Tricky" to be flexible
         if hl is None:
             hl = HelixLocation(self.radius)
-        elif hl.radius is None:
-            hl.radius = self.radius
+        radius: float = self.radius if hl.radius is None else hl.radius
 
         # Reduce the height by 2 * inset_offset. Threads start at inset_offset
         # and end at height - inset_offset
@@ -165,21 +176,82 @@ class Helix:
         # print(f"helix: tor={taper_out_range:.4f} toe={taper_out_ends:.4f}")
         # print(f"helix: tir={taper_in_range:.4f} tis={taper_in_starts:.4f}")
 
+        return _Geometry(
+            first_t=self.first_t,
+            last_t=self.last_t,
+            t_range=t_range,
+            radius=radius,
+            horz_offset=hl.horz_offset,
+            vert_offset=hl.vert_offset,
+            inset_offset=self.inset_offset,
+            pitch=self.pitch,
+            helix_height=helix_height,
+            turns=turns,
+            taper_out_range=taper_out_range,
+            taper_out_ends=taper_out_ends,
+            taper_in_range=taper_in_range,
+            taper_in_starts=taper_in_starts,
+        )
+
+    def helix(
+        self, hl: Optional[HelixLocation] = None
+    ) -> Callable[[float], Tuple[float, float, float]]:
+        """This function returns a Function that is used to generates points
+        on a helix.
+
+        It takes an optional HelixLocation which refines the location of the
+        final helix when its tapered. If HelixLocation is None then the radius
+        is Helix.radius and horz_offset and vert_offset will be 0. If its not None
+        HelixLocation.radius maybe None, in which case Helix.radius will be used.
+        and HelixLocation.horz_offset will be added to the radius and used to
+        calculate x and y. The HelixLocation.vert_offset will be added to z.
+
+        This function returns a function, f. The funciton f that takes one parameter,
+        an inclusive value between first_t and last_t.  We then define
+        t_range=last_t-first_t and the rel_height=(last_t-t)/t_range. The rel_height
+        is the relative position along the "z-axis" which is used to calculate function
+        functions returned tuple(x, y, z) for a point on the helix.
+
+        Neither self nor hl are modified and f only uses values captured when
+        it's created, later changes to self or hl don't affect it. So f can be
+        called concurrently from many threads, including on free-threaded
+        builds of CPython.
+
+        Credit: Adam Urbanczyk from cadquery [forum post](https://groups.google.com/g/cadquery/c/5kVRpECcxAU/m/7no7_ja6AAAJ)
+
+        :param hl: Defines a refinded location when the helix is tapered
+        :returns: A function which is passed "t", an inclusive value between first_t
+                  and last_t and returns a 3D point (x, y, z) on the helix as a
+                  function of t.
+        """
+        instrumented: bool = _instrumentation.enabled
+        start: float = perf_counter() if instrumented else 0
+
+        g: _Geometry = self._geometry(hl)
+
+        first_t: float = g.first_t
+        last_t: float = g.last_t
+        pitch: float = g.pitch
+        inset_offset: float = g.inset_offset
+        radius: float = g.radius
+        horz_offset: float = g.horz_offset
+        vert_offset: float = g.vert_offset
+        helix_height: float = g.helix_height
+        turns: float = g.turns
+        t_range: float = g.t_range
+        taper_out_range: float = g.taper_out_range
+        taper_out_ends: float = g.taper_out_ends
+        taper_in_range: float = g.taper_in_range
+        taper_in_starts: float = g.taper_in_starts
+
         def func(t: float) -> Tuple[float, float, float]:
             """
             Return a tuple(x, y, z)
-            :param t: A value between self.first_t .. self.last_t inclusive
+            :param t: A value between first_t .. last_t inclusive
             """
 
-            # This if statement is needed to satisfy mypy this is already
-            # guaranteed in helix() above so the if statement is always
-            # False. Furthermore this means the raise line is untestable.
-            # Hopefully this can be fixed in the future.
-            if (hl is None) or (hl.radius is None):
-                raise ValueError("hl or hl.radius is None, should never happen")
-
             taper_angle: float
-            toffset: float = t - self.first_t
+            toffset: float = t - first_t
             rel_height: float = toffset / t_range if t_range != 0 else 0
 
             # print(f"f:  t={t:.4f}")
@@ -191,7 +263,7 @@ class Helix:
                 # will smoothly taper from a point as taper angle starts at 0
                 # and increases to p/2.
                 # print(f"f:  out t={t:.4f} < taper_out_ends:{taper_out_ends}")
-                taper_angle = pi / 2 * (t - self.first_t) / taper_out_range
+                taper_angle = pi / 2 * (t - first_t) / taper_out_range
             elif t <= taper_in_starts:
                 # No tapering, taper_scale == 1
                 # print(f"f:  no  t={t:.4f} >= taper_out_ends:{taper_out_ends} <= taper_in_starts:{taper_in_starts}")
@@ -201,20 +273,20 @@ class Helix:
                 # will smoothly taper to a point as taper angle starts at p/2
                 # and decrease to 0.
                 # print(f"f:  in  t={t:.4f} > taper_in_starts:{taper_in_starts}")
-                taper_angle = pi / 2 * (self.last_t - t) / taper_in_range
+                taper_angle = pi / 2 * (last_t - t) / taper_in_range
 
             # print(f"taper_angle={taper_angle}")
             taper_scale: float = sin(taper_angle)
 
-            r: float = hl.radius + (hl.horz_offset * taper_scale)
+            r: float = radius + (horz_offset * taper_scale)
             a: float = (2 * pi / turns) * rel_height
 
             x: float = r * sin(-a)
             y: float = r * cos(a)
             z: float = (
-                (helix_height * (rel_height if self.pitch != 0 else 1))
-                + (hl.vert_offset * taper_scale)
-                + self.inset_offset
+                (helix_height * (rel_height if pitch != 0 else 1))
+                + (vert_offset * taper_scale)
+                + inset_offset
             )
 
             result: Tuple[float, float, float] = (x, y, z)
@@ -222,4 +294,161 @@ class Helix:
             # print(f"f:  t={t:.4f} toffset={toffset:.4f} rh={rel_height:.4f} result={result}")
             return result
 
+        if instrumented:
+            _instrumentation.count("evaluators")
+            _instrumentation.add_time("setup", perf_counter() - start)
+            return _instrumentation.instrument_scalar(func)
         return func
+
+    def points(
+        self,
+        t: Sequence[float],
+        hl: Optional[HelixLocation] = None,
+        backend: Optional[str] = None,
+    ) -> Any:
+        """Return the points on the helix for every value in t.
+
+        The points are the same as those of the function returned by
+        helix() but are generated by a backend, see taperable_helix.backends.
+
+        :param t: The t values, each between first_t and last_t inclusive
+        :param hl: Defines a refinded location when the helix is tapered
+        :param backend: The name of the backend, default the fastest available
+        :returns: A sequence of (x, y, z), a list of tuples from the python
+                  backend otherwise a float64 array of shape (len(t), 3)
+        """
+        from .backends import get_backend
+
+        return get_backend(backend).points(self, t, hl)
+
+    def point_array(
+        self,
+        num_points: int,
+        hl: Optional[HelixLocation] = None,
+        recurrence: bool = False,
+    ) -> PointArray:
+        """Return num_points evenly spaced from first_t to last_t inclusive
+        as a PointArray, a compact container which doesn't need NumPy.
+
+        :param num_points: The number of points
+        :param hl: Defines a refinded location when the helix is tapered
+        :param recurrence: If True (cos(a), sin(a)) of the untapered body are
+                           computed with few calls of cos and sin, see
+                           taperable_helix.recurrence. It's faster and the
+                           points differ by up to about 2 * r * a * 2.2e-16,
+                           r the radius and a the angle of all the turns
+        :returns: The points generated by the function returned by helix()
+        """
+        if recurrence:
+            from .recurrence import uniform_points
+
+            return PointArray(
+                uniform_points(self._geometry(hl), num_points, 0, num_points)
+            )
+
+        f = self.helix(hl)
+        step: float = (
+            (self.last_t - self.first_t) / (num_points - 1) if num_points > 1 else 0
+        )
+        ts: Iterator[float] = chain(
+            (self.first_t + step * i for i in range(num_points - 1)),
+            (self.last_t,) if num_points > 0 else (),
+        )
+        return PointArray(array("d", chain.from_iterable(map(f, ts))))
+
+    def samples(
+        self,
+        num_points: int,
+        hl: Optional[HelixLocation] = None,
+        recurrence: bool = False,
+    ) -> "HelixSamples":
+        """Return a lazy view of the points point_array() returns, a point is
+        only computed when it's read.
+
+        :param num_points: The number of points
+        :param hl: Defines a refinded location when the helix is tapered
+        :param recurrence: See taperable_helix.samples.HelixSamples
+        :returns: A read only sequence of the points, slices are PointArrays
+        """
+        from .samples import HelixSamples
+
+        return HelixSamples(self, num_points, hl, recurrence)
+
+    def plan_points(
+        self,
+        chord_error: Optional[float] = None,
+        max_segment: Optional[float] = None,
+        hl: Optional[HelixLocation] = None,
+    ) -> "PointPlan":
+        """Return the number of points needed so the segments joining them
+        are within chord_error of the helix and at most max_segment long.
+
+        The count is computed in constant time for each zone, the taper out
+        zone, the untapered body and the taper in zone, and for points
+        evenly spaced from first_t to last_t as generated by point_array()
+        and helix_chunks(). The chord error of the body is exact, in the
+        taper zones it and the segment length are upper bounds.
+
+        :param chord_error: The maximum distance between a segment and the helix
+        :param max_segment: The maximum length of a segment
+        :param hl: Defines a refinded location when the helix is tapered
+        :returns: The plan, see taperable_helix.planner.PointPlan
+        """
+        from .planner import plan_points
+
+        return plan_points(self._geometry(hl), chord_error, max_segment)
+
+    def arc_length(
+        self, hl: Optional[HelixLocation] = None, tol: float = 1e-10
+    ) -> float:
+        """Return the length of the helix from first_t to last_t.
+
+        The untapered body is computed in closed form and only the taper
+        zones use adaptive quadrature.
+
+        :param hl: Defines a refinded location when the helix is tapered
+        :param tol: Absolute tolerance of the quadrature over the taper zones
+        :returns: The arc length
+        """
+        from .properties import arc_length
+
+        return arc_length(self._geometry(hl), tol)
+
+    def swept_volume(
+        self, locations: Sequence[HelixLocation], tol: float = 1e-10
+    ) -> float:
+        """Return the volume of the thread whose edges are the wires at
+        locations.
+
+        The locations are the vertices, in order, of the profile of the
+        thread, for instance the three corners of a triangular thread. The
+        volume is computed with Pappus's theorem, the first moment of the
+        profile about the z-axis times the angle it is swept through. It
+        assumes successive turns of the thread don't overlap. Fewer than
+        three locations have no volume.
+
+        :param locations: The HelixLocation of each vertex of the profile
+        :param tol: Absolute tolerance of the quadrature over the taper zones
+        :returns: The volume
+        """
+        from .properties import swept_volume
+
+        return swept_volume([self._geometry(hl) for hl in locations], tol)
+
+    def surface_area(
+        self, locations: Sequence[HelixLocation], tol: float = 1e-10
+    ) -> float:
+        """Return the surface area of the thread whose edges are the wires
+        at locations.
+
+        The surface is the strips between consecutive wires, closed back to
+        the first wire when there are more than two, plus the profile at each
+        end where the thread does not taper to a point.
+
+        :param locations: The HelixLocation of each vertex of the profile
+        :param tol: Absolute tolerance of the quadrature over the taper zones
+        :returns: The surface area
+        """
+        from .properties import surface_area
+
+        return surface_area([self._geometry(hl) for hl in locations], tol)
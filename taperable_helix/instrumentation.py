@@ -0,0 +1,141 @@
+"""Opt-in instrumentation of helix generation.
+
+Instrumentation is disabled by default. When disabled the only cost is one
+check of the module level enabled flag each time an evaluator is built or a
+batch is generated, the function returned by Helix.helix() is not wrapped
+so generating points costs nothing extra.
+
+When enabled the counters and timings below are accumulated and every event
+is also passed to the registered listeners, which can forward them to a
+metrics system::
+
+    from taperable_helix import instrumentation
+
+    instrumentation.add_listener(lambda kind, name, value: print(kind, name, value))
+    instrumentation.enable()
+
+Counters:
+
+* evaluators: calls of Helix.helix()
+* points.scalar: points generated by functions returned by Helix.helix()
+* points.batch: points generated by helix_points() and batch_points()
+* points.streaming: points generated by helix_chunks()
+* points.parallel: points generated by parallel_points()
+* service.computed: GeometryService requests which were computed
+* service.coalesced: GeometryService requests which shared an in flight result
+
+Timings, in seconds:
+
+* setup: validating and deriving the constants in Helix.helix()
+* scalar: calls of functions returned by Helix.helix()
+* batch: helix_points() and batch_points()
+* streaming: generating the chunks of helix_chunks()
+* parallel: parallel_points()
+
+Other code, for instance a cache, may add its own with count() and timer().
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Tuple, TypeVar
+
+enabled: bool = False
+"""True when instrumentation is enabled, use enable() and disable()"""
+
+Listener = Callable[[str, str, float], None]
+"""A listener is passed (kind, name, value), kind is "count" or "time"."""
+
+_lock: Lock = Lock()
+_counters: Dict[str, int] = {}
+_timings: Dict[str, float] = {}
+_listeners: List[Listener] = []
+
+F = TypeVar("F", bound=Callable[..., Tuple[float, float, float]])
+
+
+def enable() -> None:
+    """Enable instrumentation, affects evaluators built afterwards."""
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    """Disable instrumentation, evaluators built while it was enabled
+    continue to be counted."""
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    """Clear the counters and timings."""
+    with _lock:
+        _counters.clear()
+        _timings.clear()
+
+
+def counters() -> Dict[str, int]:
+    """Return a copy of the counters."""
+    with _lock:
+        return dict(_counters)
+
+
+def timings() -> Dict[str, float]:
+    """Return a copy of the accumulated timings in seconds."""
+    with _lock:
+        return dict(_timings)
+
+
+def add_listener(listener: Listener) -> None:
+    """Register a listener called with every event."""
+    with _lock:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: Listener) -> None:
+    """Unregister a listener, a ValueError is raised if it isn't registered."""
+    with _lock:
+        _listeners.remove(listener)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to the counter name."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+        listeners: List[Listener] = list(_listeners)
+    for listener in listeners:
+        listener("count", name, n)
+
+
+def add_time(name: str, seconds: float) -> None:
+    """Add seconds to the timing name."""
+    with _lock:
+        _timings[name] = _timings.get(name, 0.0) + seconds
+        listeners: List[Listener] = list(_listeners)
+    for listener in listeners:
+        listener("time", name, seconds)
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """Context manager adding the time spent in its body to name."""
+    start: float = perf_counter()
+    try:
+        yield
+    finally:
+        add_time(name, perf_counter() - start)
+
+
+def instrument_scalar(func: F) -> F:
+    """Wrap a function returned by Helix.helix() to count and time its calls."""
+
+    @wraps(func)
+    def wrapper(t: float) -> Tuple[float, float, float]:
+        start: float = perf_counter()
+        result: Tuple[float, float, float] = func(t)
+        add_time("scalar", perf_counter() - start)
+        count("points.scalar")
+        return result
+
+    return wrapper  # type: ignore
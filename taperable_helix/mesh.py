@@ -0,0 +1,421 @@
+"""Triangle meshes of the surface swept by a thread profile.
+
+Every wire of the profile, one per HelixLocation, is sampled at the same
+num_points values of t. The vertices are stored ring by ring, ring i holds
+the point of each wire at the i'th t so vertex i * num_wires + w is wire w
+at the i'th t. Consecutive wires are joined by two triangles per step of t,
+the last wire is joined back to the first when there are more than two
+wires and the profile then also closes each end with a fan of triangles,
+as Helix.surface_area() does.
+
+The vertex normals and texture coordinates can be computed analytically
+with the vertices. The surface is S(t, p) with p the position around the
+profile, the normal of a vertex is dS/dt x dS/dp where dS/dt is the
+derivative of its wire and dS/dp is the difference of the wires either
+side of it. With s the taper_scale that difference is
+(dR + dho * s) * radial + dvo * s * z, dR the difference of the location
+radii, so when they're equal s is divided out and the normals are defined
+even at the tips of the tapers, where every wire meets.
+
+Wires which taper to the same point, or meshes stitched together from
+strips, have coincident vertices, weld() merges them and drops the
+triangles which collapse.
+"""
+
+from dataclasses import dataclass
+from itertools import product
+from math import pi
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .helix import Helix, HelixLocation, _Geometry
+from .vectorized import _chunk_ts, _evaluate, _taper_angle
+
+
+@dataclass
+class Mesh:
+    """A triangle mesh."""
+
+    vertices: np.ndarray
+    """float64 array of shape (V, 3) of (x, y, z) vertices"""
+
+    faces: np.ndarray
+    """int64 array of shape (F, 3) of vertex indices. The faces face outwards
+    when the locations are counter clockwise in the (radius, z) plane."""
+
+    normals: Optional[np.ndarray] = None
+    """float64 array of shape (V, 3) of unit vertex normals, on the side the
+    faces face, or None"""
+
+    uvs: Optional[np.ndarray] = None
+    """float64 array of shape (V, 2) of (u, v) texture coordinates or None"""
+
+
+def _wire_pairs(num_wires: int) -> np.ndarray:
+    """Return the (w0, w1) pairs of wires joined by triangles."""
+    w0: np.ndarray = np.arange(num_wires - 1)
+    if num_wires > 2:
+        w0 = np.arange(num_wires)
+    return np.stack([w0, (w0 + 1) % num_wires], axis=1)
+
+
+def _num_faces(num_wires: int, num_points: int) -> int:
+    """Return the number of faces of a mesh."""
+    if num_points < 1:
+        return 0
+    caps: int = 2 * (num_wires - 2) if num_wires > 2 else 0
+    return 2 * (num_points - 1) * len(_wire_pairs(num_wires)) + caps
+
+
+def _strip_faces(num_wires: int, first_ring: int, last_ring: int) -> np.ndarray:
+    """Return the faces joining ring i - 1 to ring i for first_ring <= i < last_ring."""
+    pairs: np.ndarray = _wire_pairs(num_wires)
+    rings: np.ndarray = np.arange(max(first_ring, 1), last_ring)
+    a: np.ndarray = (rings[:, None] - 1) * num_wires + pairs[None, :, 0]
+    b: np.ndarray = (rings[:, None] - 1) * num_wires + pairs[None, :, 1]
+    c: np.ndarray = b + num_wires
+    d: np.ndarray = a + num_wires
+    faces: np.ndarray = np.empty((len(rings), len(pairs), 2, 3), dtype=np.int64)
+    faces[:, :, 0] = np.stack([a, c, b], axis=-1)
+    faces[:, :, 1] = np.stack([a, d, c], axis=-1)
+    return faces.reshape(-1, 3)
+
+
+def _cap_faces(num_wires: int, ring: int, flip: bool) -> np.ndarray:
+    """Return a fan of faces closing the profile at ring."""
+    if num_wires < 3:
+        return np.empty((0, 3), dtype=np.int64)
+    w: np.ndarray = np.arange(1, num_wires - 1)
+    first: int = ring * num_wires
+    faces: np.ndarray = np.stack(
+        [np.full(len(w), first), first + w, first + w + 1], axis=1
+    )
+    return faces[:, ::-1] if flip else faces
+
+
+def _profile_v(gs: Sequence[_Geometry]) -> np.ndarray:
+    """Return the v texture coordinate of each wire, its distance around the
+    untapered profile in the (radius, z) plane over the profile's length."""
+    p: np.ndarray = np.array([(g.radius + g.horz_offset, g.vert_offset) for g in gs])
+    n: int = len(gs)
+    closed: bool = n > 2
+    edges: np.ndarray = np.linalg.norm(np.diff(p, axis=0), axis=1)
+    length: float = float(edges.sum())
+    if closed:
+        length += float(np.linalg.norm(p[0] - p[-1]))
+    if length == 0:
+        return np.arange(n) / max(n if closed else n - 1, 1)
+    return np.concatenate([[0], np.cumsum(edges)]) / length
+
+
+class _Normals:
+    """The constants of the analytic vertex normals of a mesh."""
+
+    def __init__(self, gs: Sequence[_Geometry]):
+        n: int = len(gs)
+        if n < 2:
+            raise ValueError("normals need at least two locations")
+        w: np.ndarray = np.arange(n)
+        if n > 2:
+            before, after = (w - 1) % n, (w + 1) % n
+        else:
+            before, after = np.maximum(w - 1, 0), np.minimum(w + 1, n - 1)
+
+        def diff(values: List[float]) -> np.ndarray:
+            a: np.ndarray = np.array(values)
+            return a[after] - a[before]
+
+        self.g: _Geometry = gs[0]
+        self.dR: np.ndarray = diff([g.radius for g in gs])
+        self.dho: np.ndarray = diff([g.horz_offset for g in gs])
+        self.dvo: np.ndarray = diff([g.vert_offset for g in gs])
+        # The faces are wound for t increasing
+        self.sign: float = -1 if self.g.t_range < 0 else 1
+
+    def normals(self, t: np.ndarray, w: int, d1: np.ndarray) -> np.ndarray:
+        """Return the normals of wire w at t given its derivatives d1."""
+        g: _Geometry = self.g
+        rel: np.ndarray = (
+            (t - g.first_t) / g.t_range if g.t_range != 0 else np.zeros(t.shape)
+        )
+        a: np.ndarray = (2 * pi / g.turns) * rel
+        s: np.ndarray = np.sin(_taper_angle(g, t)[0])
+        if self.dR[w] == 0:
+            dr, dz = np.full(t.shape, self.dho[w]), np.full(t.shape, self.dvo[w])
+        else:
+            dr, dz = self.dR[w] + self.dho[w] * s, self.dvo[w] * s
+        dp: np.ndarray = np.stack([dr * np.sin(-a), dr * np.cos(a), dz], axis=1)
+        normals: np.ndarray = np.cross(d1, dp) * self.sign
+        length: np.ndarray = np.linalg.norm(normals, axis=1, keepdims=True)
+        return normals / np.where(length > 0, length, 1)
+
+
+def mesh_chunks(
+    helix: Helix,
+    locations: Sequence[HelixLocation],
+    num_points: int,
+    chunk_size: int = 4096,
+    normals: bool = False,
+    uvs: bool = False,
+) -> Iterator[Mesh]:
+    """Generate the mesh of a thread in chunks of rings, so very large
+    meshes can be streamed in bounded memory.
+
+    The faces of a chunk index into the vertices of the whole mesh, they
+    join the chunk's first ring to the previous chunk's last ring. So the
+    vertices and faces of all chunks concatenated are the whole mesh.
+
+    :param helix: The helix of every wire
+    :param locations: The HelixLocation of each wire, in order around the profile
+    :param num_points: The number of rings, points on each wire
+    :param chunk_size: The maximum number of rings in each chunk
+    :param normals: Also compute the unit vertex normals, which needs at
+                    least two locations. They're zero where the
+                    neighbouring locations coincide
+    :param uvs: Also compute the texture coordinates, u is (t - first_t) /
+                (last_t - first_t) and v the distance around the profile,
+                from 0 at the first location, over the profile's length
+    :returns: An iterator of meshes
+    """
+    if len(locations) < 1:
+        raise ValueError("locations should not be empty")
+    gs: List[_Geometry] = [helix._geometry(hl) for hl in locations]
+    num_wires: int = len(gs)
+    analytic: Optional[_Normals] = _Normals(gs) if normals else None
+    profile_v: np.ndarray = _profile_v(gs)
+    first: int = 0
+    for t in _chunk_ts(gs[0], num_points, chunk_size):
+        n: int = len(t)
+        vertices: np.ndarray = np.empty((n, num_wires, 3))
+        vertex_normals: Optional[np.ndarray] = None
+        if analytic is not None:
+            vertex_normals = np.empty((n, num_wires, 3))
+            for w, g in enumerate(gs):
+                vertices[:, w], d1 = _evaluate(g, t, 1)
+                vertex_normals[:, w] = analytic.normals(t, w, d1)
+            vertex_normals = vertex_normals.reshape(-1, 3)
+        else:
+            for w, g in enumerate(gs):
+                vertices[:, w] = _evaluate(g, t)[0]
+        vertex_uvs: Optional[np.ndarray] = None
+        if uvs:
+            g = gs[0]
+            vertex_uvs = np.empty((n, num_wires, 2))
+            vertex_uvs[:, :, 0] = (
+                ((t - g.first_t) / g.t_range)[:, None] if g.t_range != 0 else 0
+            )
+            vertex_uvs[:, :, 1] = profile_v
+            vertex_uvs = vertex_uvs.reshape(-1, 2)
+        parts: List[np.ndarray] = [_strip_faces(num_wires, first, first + n)]
+        if first == 0:
+            parts.insert(0, _cap_faces(num_wires, 0, flip=False))
+        if first + n == num_points:
+            parts.append(_cap_faces(num_wires, num_points - 1, flip=True))
+        yield Mesh(
+            vertices=vertices.reshape(-1, 3),
+            faces=np.concatenate(parts),
+            normals=vertex_normals,
+            uvs=vertex_uvs,
+        )
+        first += n
+
+
+def helix_mesh(
+    helix: Helix,
+    locations: Optional[Sequence[HelixLocation]] = None,
+    num_points: int = 100,
+    normals: bool = False,
+    uvs: bool = False,
+) -> Mesh:
+    """Return the mesh of a thread.
+
+    :param helix: The helix of every wire
+    :param locations: The HelixLocation of each wire, in order around the
+                      profile, default one wire at HelixLocation()
+    :param num_points: The number of rings, points on each wire
+    :param normals: Also compute the vertex normals, see mesh_chunks()
+    :param uvs: Also compute the texture coordinates, see mesh_chunks()
+    :returns: The mesh
+    """
+    hls: Sequence[HelixLocation] = locations if locations else [HelixLocation()]
+    chunks: List[Mesh] = list(
+        mesh_chunks(helix, hls, num_points, max(num_points, 1), normals, uvs)
+    )
+    if not chunks:
+        return Mesh(
+            vertices=np.empty((0, 3)),
+            faces=np.empty((0, 3), dtype=np.int64),
+            normals=np.empty((0, 3)) if normals else None,
+            uvs=np.empty((0, 2)) if uvs else None,
+        )
+    return chunks[0]
+
+
+def _cell_hash(q: np.ndarray) -> np.ndarray:
+    """Return a 64 bit hash of each row of integer cell coordinates."""
+    with np.errstate(over="ignore"):
+        u: np.ndarray = q.view(np.uint64)
+        h: np.ndarray = (
+            (u[:, 0] * np.uint64(0x9E3779B97F4A7C15))
+            ^ (u[:, 1] * np.uint64(0xC2B2AE3D27D4EB4F))
+            ^ (u[:, 2] * np.uint64(0x165667B19E3779F9))
+        )
+        h ^= h >> np.uint64(29)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(32)
+    return h
+
+
+def _range_pairs(
+    a: np.ndarray, lo: np.ndarray, hi: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the pairs (a[i], k) for every k in lo[i] <= k < hi[i]."""
+    counts: np.ndarray = hi - lo
+    ends: np.ndarray = np.cumsum(counts)
+    k: np.ndarray = np.arange(ends[-1] if len(ends) else 0) - np.repeat(
+        ends - counts, counts
+    )
+    return np.repeat(a, counts), np.repeat(lo, counts) + k
+
+
+def _components(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Return the lowest index in the connected component of each of n
+    nodes joined by the edges (a, b)."""
+    labels: np.ndarray = np.arange(n)
+    while True:
+        # Hook each root to the lowest root it's joined to, then compress
+        low: np.ndarray = np.minimum(labels[a], labels[b])
+        before: np.ndarray = labels.copy()
+        np.minimum.at(labels, labels[a], low)
+        np.minimum.at(labels, labels[b], low)
+        while True:
+            jumped: np.ndarray = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels, before):
+            return labels
+
+
+def weld_vertices(
+    vertices: np.ndarray, tolerance: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge vertices within tolerance of each other.
+
+    Space is divided into cubic cells 16 * tolerance across, which are
+    hashed and sorted. A vertex is compared with the others in its cell
+    and, only when it's within tolerance of a side of its cell, those in
+    the neighbouring cells, so the cost is close to linear in the number of
+    vertices when few are within 16 * tolerance of each other. Vertices
+    connected by a chain of vertices within tolerance of each other are
+    merged into the first of them.
+
+    :param vertices: float64 array of shape (V, 3)
+    :param tolerance: The distance within which vertices are merged
+    :returns: (welded, index) the merged vertices, in the order of their
+              first vertex, and for each vertex the index of its merged
+              vertex, so welded[index] is within tolerance of vertices
+    """
+    if not tolerance > 0:
+        raise ValueError(f"tolerance:{tolerance} should be > 0")
+    v: np.ndarray = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    n: int = len(v)
+    if not np.isfinite(v).all():
+        raise ValueError("vertices should be finite")
+    cell: float = 16 * tolerance
+    with np.errstate(over="ignore"):
+        scaled: np.ndarray = v / cell
+    if n and not np.abs(scaled).max() < 2**62:
+        raise ValueError(f"tolerance:{tolerance} is too small for the vertices")
+    q: np.ndarray = np.floor(scaled).astype(np.int64)
+    frac: np.ndarray = scaled - q
+    near: float = tolerance / cell
+
+    hashes: np.ndarray = _cell_hash(q)
+    order: np.ndarray = np.argsort(hashes, kind="stable")
+    hashes = hashes[order]
+    keys, starts = np.unique(hashes, return_index=True)
+    ends: np.ndarray = np.append(starts[1:], n)
+
+    # Candidate pairs of sorted positions: earlier vertices of the same
+    # hash, then the vertices of each neighbouring cell
+    firsts: np.ndarray = np.repeat(starts, ends - starts)
+    pa, pb = _range_pairs(np.arange(n), firsts, np.arange(n))
+    pairs_a: List[np.ndarray] = [order[pa]]
+    pairs_b: List[np.ndarray] = [order[pb]]
+    low: np.ndarray = frac < near
+    high: np.ndarray = frac >= 1 - near
+    for offset in product((-1, 0, 1), repeat=3):
+        if offset == (0, 0, 0):
+            continue
+        mask: np.ndarray = np.ones(n, dtype=bool)
+        for axis, d in enumerate(offset):
+            if d < 0:
+                mask &= low[:, axis]
+            elif d > 0:
+                mask &= high[:, axis]
+        a: np.ndarray = np.flatnonzero(mask)
+        if not len(a):
+            continue
+        h: np.ndarray = _cell_hash(q[a] + np.array(offset, dtype=np.int64))
+        pos: np.ndarray = np.minimum(np.searchsorted(keys, h), len(keys) - 1)
+        found: np.ndarray = keys[pos] == h
+        a, pos = a[found], pos[found]
+        qa, pb = _range_pairs(a, starts[pos], ends[pos])
+        pairs_a.append(qa)
+        pairs_b.append(order[pb])
+
+    ia: np.ndarray = np.concatenate(pairs_a)
+    ib: np.ndarray = np.concatenate(pairs_b)
+    diff: np.ndarray = v[ia] - v[ib]
+    close: np.ndarray = np.einsum("ij,ij->i", diff, diff) <= tolerance * tolerance
+    labels: np.ndarray = _components(n, ia[close], ib[close])
+
+    first: np.ndarray = labels == np.arange(n)
+    index: np.ndarray = (np.cumsum(first) - 1)[labels]
+    return v[first], index
+
+
+def weld(mesh: Mesh, tolerance: float = 1e-9, drop_degenerate: bool = True) -> Mesh:
+    """Return the mesh with vertices within tolerance of each other merged,
+    see weld_vertices(), and the faces indexing the merged vertices.
+
+    The wires of locations which share a corner of the profile, or which
+    taper to the same point, have coincident vertices which welding joins
+    so the mesh is watertight. The normals of merged vertices are averaged
+    and their uvs are those of the first vertex.
+
+    :param mesh: The mesh
+    :param tolerance: The distance within which vertices are merged
+    :param drop_degenerate: Remove the faces which then have fewer than
+                            three distinct vertices
+    :returns: The welded mesh
+    """
+    vertices, index = weld_vertices(mesh.vertices, tolerance)
+    faces: np.ndarray = index[np.asarray(mesh.faces, dtype=np.int64)]
+    normals: Optional[np.ndarray] = None
+    if mesh.normals is not None:
+        normals = np.stack(
+            [
+                np.bincount(index, weights=c, minlength=len(vertices))
+                for c in np.asarray(mesh.normals).T
+            ],
+            axis=1,
+        ).reshape(-1, 3)
+        length: np.ndarray = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals = normals / np.where(length > 0, length, 1)
+    uvs: Optional[np.ndarray] = None
+    if mesh.uvs is not None:
+        # The merged vertices are in the order of their first vertex
+        firsts: np.ndarray = np.flatnonzero(
+            np.diff(np.maximum.accumulate(index), prepend=-1) > 0
+        )
+        uvs = np.asarray(mesh.uvs)[firsts]
+    if drop_degenerate and len(faces):
+        faces = faces[
+            (faces[:, 0] != faces[:, 1])
+            & (faces[:, 1] != faces[:, 2])
+            & (faces[:, 2] != faces[:, 0])
+        ]
+    return Mesh(vertices=vertices, faces=faces, normals=normals, uvs=uvs)
@@ -0,0 +1,190 @@
+"""Plan how many points to generate for a given accuracy.
+
+This is the implementation of Helix.plan_points(). The points are joined
+by straight segments, the chord error is the distance between a segment
+and the helix, and the segment length is the length of a segment.
+
+In the untapered body the helix has constant curvature so a step of dt in
+t, sweeping an angle of da * dt, has the exact chord error
+r * (1 - cos(da * dt / 2)) at its midpoint, which is solved for dt. In a
+taper zone the radius and z vary with sin(taper_angle), there the chord
+error is bounded by dt**2 * max|P''| / 8 and the segment length by
+dt * max|P'| using analytic bounds of the derivatives over the zone.
+Either way the plan is computed in constant time.
+"""
+
+from dataclasses import dataclass
+from math import acos, ceil, cos, pi, sin, sqrt
+from typing import List, Optional
+
+from .helix import _Geometry
+from .properties import _rates, _zones
+
+
+@dataclass
+class ZonePlan:
+    """The plan for one zone of t."""
+
+    name: str
+    """taper_out, body or taper_in"""
+
+    first_t: float
+    """The first t of the zone"""
+
+    last_t: float
+    """The last t of the zone"""
+
+    num_segments: int
+    """The number of segments needed in the zone"""
+
+    max_chord_error: float
+    """The maximum chord error, a bound in the taper zones, with num_segments"""
+
+    max_segment: float
+    """The maximum segment length, a bound in the taper zones, with num_segments"""
+
+
+@dataclass
+class PointPlan:
+    """The number of points needed for a chord error and segment length."""
+
+    zones: List[ZonePlan]
+    """The plan of each zone of t which isn't empty, in order of t"""
+
+    num_points: int
+    """The number of points evenly spaced from first_t to last_t inclusive,
+    as passed to helix_chunks() or Helix.point_array(), which meets the
+    targets in every zone"""
+
+    max_chord_error: float
+    """The maximum chord error with num_points"""
+
+    max_segment: float
+    """The maximum segment length with num_points"""
+
+
+class _Zone:
+    """The derivative bounds of a zone."""
+
+    def __init__(self, g: _Geometry, name: str, a: float, b: float):
+        self.name: str = name
+        self.a: float = a
+        self.b: float = b
+        da, dz = _rates(g)
+        self.body: bool = name == "body"
+        self.r: float = abs(g.radius + g.horz_offset)
+        self.da: float = abs(da)
+        self.dz: float = abs(dz)
+        if self.body:
+            return
+
+        # r = radius + ho * s and z = dz * t + vo * s with s = sin(angle)
+        # and angle changing by dangle per unit of t, so |s| and |ds/dangle|
+        # are at most 1.
+        taper_range: float = (
+            g.taper_out_range if name == "taper_out" else g.taper_in_range
+        )
+        dangle: float = pi / 2 / taper_range
+        ho: float = abs(g.horz_offset)
+        vo: float = abs(g.vert_offset)
+        r_max: float = max(abs(g.radius), abs(g.radius + g.horz_offset))
+        self.speed: float = ho * dangle + r_max * self.da + self.dz + vo * dangle
+        self.accel: float = (
+            ho * dangle * dangle
+            + 2 * ho * dangle * self.da
+            + r_max * self.da * self.da
+            + vo * dangle * dangle
+        )
+
+    def chord_error(self, dt: float) -> float:
+        if self.body:
+            return self.r * (1 - cos(min(self.da * dt / 2, pi / 2)))
+        return self.accel * dt * dt / 8
+
+    def segment(self, dt: float) -> float:
+        if self.body:
+            return sqrt(
+                (2 * self.r * sin(min(self.da * dt / 2, pi / 2))) ** 2
+                + (self.dz * dt) ** 2
+            )
+        return self.speed * dt
+
+    def step(self, chord_error: Optional[float], max_segment: Optional[float]) -> float:
+        """Return the largest step of t meeting the targets, inf if any will."""
+        dt: float = float("inf")
+        if chord_error is not None:
+            if self.body:
+                if self.r * self.da > 0:
+                    # Segments span at most half a turn
+                    half: float = acos(max(1 - chord_error / self.r, 0))
+                    dt = min(dt, 2 * min(half, pi / 2) / self.da)
+            elif self.accel > 0:
+                dt = min(dt, sqrt(8 * chord_error / self.accel))
+        if max_segment is not None:
+            speed: float = (
+                sqrt(self.r * self.r * self.da * self.da + self.dz * self.dz)
+                if self.body
+                else self.speed
+            )
+            if speed > 0:
+                dt = min(dt, max_segment / speed)
+        return dt
+
+
+def plan_points(
+    g: _Geometry,
+    chord_error: Optional[float] = None,
+    max_segment: Optional[float] = None,
+) -> PointPlan:
+    """Return the number of points needed for a chord error and segment length.
+
+    :param g: The geometry returned by Helix._geometry()
+    :param chord_error: The maximum distance between a segment and the helix
+    :param max_segment: The maximum length of a segment
+    :returns: The plan
+    """
+    if chord_error is None and max_segment is None:
+        raise ValueError("chord_error or max_segment is required")
+    if chord_error is not None and chord_error <= 0:
+        raise ValueError(f"chord_error:{chord_error} should be > 0")
+    if max_segment is not None and max_segment <= 0:
+        raise ValueError(f"max_segment:{max_segment} should be > 0")
+
+    # There are only taper zones when first_t < last_t
+    body_lo, body_hi, tapers = _zones(g)
+    zones: List[_Zone] = []
+    for a, b in tapers:
+        zones.append(_Zone(g, "taper_out" if a < body_lo else "taper_in", a, b))
+    if body_lo < body_hi:
+        zones.append(_Zone(g, "body", body_lo, body_hi))
+    zones.sort(key=lambda z: z.a)
+
+    plans: List[ZonePlan] = []
+    uniform: float = float("inf")
+    for zone in zones:
+        length: float = zone.b - zone.a
+        dt: float = zone.step(chord_error, max_segment)
+        n: int = max(1, ceil(length / dt)) if dt < float("inf") else 1
+        plans.append(
+            ZonePlan(
+                zone.name,
+                zone.a,
+                zone.b,
+                n,
+                zone.chord_error(length / n),
+                zone.segment(length / n),
+            )
+        )
+        uniform = min(uniform, dt)
+
+    t_span: float = abs(g.t_range)
+    segments: int = 0
+    if t_span > 0:
+        segments = max(1, ceil(t_span / uniform)) if uniform < float("inf") else 1
+    dt_uniform: float = t_span / segments if segments else 0
+    return PointPlan(
+        zones=plans,
+        num_points=segments + 1,
+        max_chord_error=max((z.chord_error(dt_uniform) for z in zones), default=0),
+        max_segment=max((z.segment(dt_uniform) for z in zones), default=0),
+    )
@@ -0,0 +1,142 @@
+"""A compact container of points which doesn't need NumPy.
+
+A list of (x, y, z) tuples costs about 150 bytes per point, a PointArray
+stores the coordinates in one array("d") at 24 bytes per point. It's a
+read only Sequence of (x, y, z) tuples and also exposes its storage as
+columnar x, y and z views, view() and the NumPy array interface, so NumPy,
+when it's installed, can use it without copying::
+
+    points = Helix(radius=1, pitch=0.5, height=2).point_array(100000)
+    xs = points.x                   # memoryview of every x
+    arr = numpy.asarray(points)     # (100000, 3) float64 view
+    mv = points.view()              # (100000, 3) memoryview
+
+A Python class can only export the buffer protocol from Python 3.12
+(PEP 688), so memoryview(points) works there but raises TypeError before.
+view() and __array_interface__ work on every supported version.
+"""
+
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+Point = Tuple[float, float, float]
+
+
+class PointArray(Sequence):
+    """A read only sequence of (x, y, z) points stored in an array("d").
+
+    The storage is shared without copying by view(), a memoryview, and
+    __array_interface__, which numpy.asarray() uses. memoryview(points)
+    and other buffer protocol consumers need Python 3.12 or later, use
+    view() or points.data before that.
+
+    :param data: The coordinates, x0, y0, z0, x1, ..., an array("d") is
+                 used without copying
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Iterable[float] = ()):
+        if isinstance(data, array) and data.typecode == "d":
+            self._data: array = data
+        else:
+            self._data = array("d", data)
+        if len(self._data) % 3 != 0:
+            raise ValueError(f"len(data):{len(self._data)} should be a multiple of 3")
+
+    @classmethod
+    def from_points(cls, points: Iterable[Iterable[float]]) -> "PointArray":
+        """Return a PointArray of (x, y, z) points."""
+        return cls(array("d", chain.from_iterable(points)))
+
+    @property
+    def data(self) -> array:
+        """The array("d") of coordinates, it must not be resized"""
+        return self._data
+
+    def __len__(self) -> int:
+        return len(self._data) // 3
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Point, "PointArray"]:
+        """Return the point at index as a tuple or a slice as a PointArray."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return PointArray(self._data[3 * start : 3 * max(start, stop)])
+            data: array = self._data
+            return PointArray(
+                array(
+                    "d",
+                    chain.from_iterable(
+                        data[3 * i : 3 * i + 3] for i in range(start, stop, step)
+                    ),
+                )
+            )
+        n: int = len(self)
+        i: int = index + n if index < 0 else index
+        if i < 0 or i >= n:
+            raise IndexError("PointArray index out of range")
+        return (self._data[3 * i], self._data[3 * i + 1], self._data[3 * i + 2])
+
+    def __iter__(self) -> Iterator[Point]:
+        it: Iterator[float] = iter(self._data)
+        return zip(it, it, it)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PointArray):
+            return self._data == other._data
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"PointArray({len(self)} points)"
+
+    def tolist(self) -> List[Point]:
+        """Return the points as a list of tuples."""
+        return list(self)
+
+    @property
+    def x(self) -> memoryview:
+        """A memoryview of the x coordinates, it's a view of the storage"""
+        return memoryview(self._data).toreadonly()[0::3]
+
+    @property
+    def y(self) -> memoryview:
+        """A memoryview of the y coordinates, it's a view of the storage"""
+        return memoryview(self._data).toreadonly()[1::3]
+
+    @property
+    def z(self) -> memoryview:
+        """A memoryview of the z coordinates, it's a view of the storage"""
+        return memoryview(self._data).toreadonly()[2::3]
+
+    def columns(self) -> Tuple[array, array, array]:
+        """Return copies of the x, y and z coordinates as contiguous arrays."""
+        return self._data[0::3], self._data[1::3], self._data[2::3]
+
+    def view(self) -> memoryview:
+        """Return a read only memoryview of shape (len(self), 3), or of
+        shape (0,) when empty as memoryviews can't have a 0 dimension."""
+        mv: memoryview = memoryview(self._data).toreadonly()
+        if not len(self):
+            return mv
+        return mv.cast("B").cast("d", (len(self), 3))  # type: ignore
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """The buffer protocol, Python 3.12 and later."""
+        return self.view()
+
+    @property
+    def __array_interface__(self) -> Dict[str, Any]:
+        """The NumPy array interface, a read only view of the storage."""
+        address, _ = self._data.buffer_info()
+        return {
+            "version": 3,
+            "shape": (len(self), 3),
+            "typestr": ("<" if sys.byteorder == "little" else ">") + "f8",
+            "data": (address, True),
+        }
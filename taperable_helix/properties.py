@@ -0,0 +1,282 @@
+"""Geometric properties of helixes and thread profiles.
+
+These are the implementations of Helix.arc_length(), Helix.swept_volume()
+and Helix.surface_area(). In the untapered body every quantity is constant
+per unit of t so it is computed in closed form, adaptive Simpson
+quadrature is only used over the taper zones.
+"""
+
+from math import asinh, cos, pi, sin, sqrt
+from typing import Callable, List, Sequence, Tuple
+
+from .helix import _Geometry
+
+# Gauss-Legendre nodes and weights on [0, 1] used across a strip between
+# two wires in the taper zones.
+_gl_nodes: List[float] = [
+    0.5 + x / 2
+    for x in (
+        -0.9602898564975363,
+        -0.7966664774136267,
+        -0.5255324099163290,
+        -0.1834346424956498,
+        0.1834346424956498,
+        0.5255324099163290,
+        0.7966664774136267,
+        0.9602898564975363,
+    )
+]
+_gl_weights: List[float] = [
+    w / 2
+    for w in (
+        0.1012285362903763,
+        0.2223810344533745,
+        0.3137066278286366,
+        0.3626837833783620,
+        0.3626837833783620,
+        0.3137066278286366,
+        0.2223810344533745,
+        0.1012285362903763,
+    )
+]
+
+
+def _simpson(
+    f: Callable[[float], float], a: float, b: float, tol: float, depth: int = 50
+) -> float:
+    """Adaptive Simpson quadrature of f over [a, b]."""
+
+    def recurse(
+        a: float,
+        fa: float,
+        m: float,
+        fm: float,
+        b: float,
+        fb: float,
+        whole: float,
+        tol: float,
+        depth: int,
+    ) -> float:
+        lm: float = (a + m) / 2
+        rm: float = (m + b) / 2
+        flm: float = f(lm)
+        frm: float = f(rm)
+        left: float = (m - a) / 6 * (fa + 4 * flm + fm)
+        right: float = (b - m) / 6 * (fm + 4 * frm + fb)
+        delta: float = left + right - whole
+        if depth <= 0 or abs(delta) <= 15 * tol:
+            return left + right + delta / 15
+        return recurse(a, fa, lm, flm, m, fm, left, tol / 2, depth - 1) + recurse(
+            m, fm, rm, frm, b, fb, right, tol / 2, depth - 1
+        )
+
+    if a == b:
+        return 0
+    fa: float = f(a)
+    fb: float = f(b)
+    m: float = (a + b) / 2
+    fm: float = f(m)
+    whole: float = (b - a) / 6 * (fa + 4 * fm + fb)
+    return recurse(a, fa, m, fm, b, fb, whole, tol, depth)
+
+
+def _zones(g: _Geometry) -> Tuple[float, float, List[Tuple[float, float]]]:
+    """Return the body, [body_lo, body_hi], and the taper zones of t."""
+    t_lo: float = min(g.first_t, g.last_t)
+    t_hi: float = max(g.first_t, g.last_t)
+    body_lo: float = max(t_lo, g.taper_out_ends)
+    body_hi: float = min(t_hi, g.taper_in_starts)
+    tapers: List[Tuple[float, float]] = []
+    if t_lo < body_lo:
+        tapers.append((t_lo, body_lo))
+    if body_hi < t_hi:
+        tapers.append((body_hi, t_hi))
+    return body_lo, body_hi, tapers
+
+
+def _taper(g: _Geometry, t: float) -> Tuple[float, float]:
+    """Return the taper_scale and its derivative with respect to t."""
+    if t < g.taper_out_ends:
+        dangle: float = pi / 2 / g.taper_out_range
+        angle: float = dangle * (t - g.first_t)
+    elif t <= g.taper_in_starts:
+        return 1, 0
+    else:
+        dangle = -pi / 2 / g.taper_in_range
+        angle = dangle * (t - g.last_t)
+    return sin(angle), cos(angle) * dangle
+
+
+def _rates(g: _Geometry) -> Tuple[float, float]:
+    """Return da/dt and the body's dz/dt, both constant."""
+    if g.t_range == 0:
+        return 0, 0
+    da: float = (2 * pi / g.turns) / g.t_range
+    dz: float = (g.helix_height if g.pitch != 0 else 0) / g.t_range
+    return da, dz
+
+
+def arc_length(g: _Geometry, tol: float = 1e-10) -> float:
+    """Return the length of a wire.
+
+    :param g: The geometry returned by Helix._geometry()
+    :param tol: Absolute tolerance of the quadrature over the taper zones
+    """
+    da, dz = _rates(g)
+
+    def speed(t: float) -> float:
+        s, ds = _taper(g, t)
+        r: float = g.radius + g.horz_offset * s
+        dr: float = g.horz_offset * ds
+        dzt: float = dz + g.vert_offset * ds
+        return sqrt(dr * dr + r * r * da * da + dzt * dzt)
+
+    body_lo, body_hi, tapers = _zones(g)
+    r: float = g.radius + g.horz_offset
+    length: float = (
+        sqrt(r * r * da * da + dz * dz) * (body_hi - body_lo)
+        if body_lo < body_hi
+        else 0
+    )
+    for a, b in tapers:
+        length += _simpson(speed, a, b, tol)
+    return length
+
+
+def _profile(gs: Sequence[_Geometry], s: float) -> List[Tuple[float, float]]:
+    """Return the (radius, z offset) vertices of the profile at taper_scale s."""
+    return [(g.radius + g.horz_offset * s, g.vert_offset * s) for g in gs]
+
+
+def _area_moment(vertices: List[Tuple[float, float]]) -> Tuple[float, float]:
+    """Return the area and the first moment about the z-axis, the integral
+    of the radius over the area, of a polygon in the (radius, z) plane."""
+    area: float = 0
+    moment: float = 0
+    n: int = len(vertices)
+    for i in range(n):
+        r0, z0 = vertices[i]
+        r1, z1 = vertices[(i + 1) % n]
+        cross: float = r0 * z1 - r1 * z0
+        area += cross
+        moment += cross * (r0 + r1)
+    return abs(area) / 2, abs(moment) / 6
+
+
+def swept_volume(gs: Sequence[_Geometry], tol: float = 1e-10) -> float:
+    """Return the volume swept by a profile along the helix.
+
+    :param gs: The geometry of each wire of the profile, in order around it
+    :param tol: Absolute tolerance of the quadrature over the taper zones
+    """
+    if len(gs) < 3:
+        return 0
+    g: _Geometry = gs[0]
+    da, _ = _rates(g)
+
+    # By Pappus the volume swept per unit of t is the first moment of the
+    # profile about the axis times the rate of rotation.
+    def rate(t: float) -> float:
+        return _area_moment(_profile(gs, _taper(g, t)[0]))[1] * abs(da)
+
+    body_lo, body_hi, tapers = _zones(g)
+    volume: float = (
+        _area_moment(_profile(gs, 1))[1] * abs(da) * (body_hi - body_lo)
+        if body_lo < body_hi
+        else 0
+    )
+    for a, b in tapers:
+        volume += _simpson(rate, a, b, tol)
+    return volume
+
+
+def _strip_body(
+    r0: float, r1: float, z0: float, z1: float, da: float, dz: float
+) -> float:
+    """Return the area per unit of t of the untapered strip between two wires.
+
+    With r(u) = r0 + (r1 - r0) * u the area element is
+    sqrt(A * r(u)**2 + B) with A = da**2 * ((r1 - r0)**2 + (z1 - z0)**2)
+    and B = ((r1 - r0) * dz)**2 which integrates in closed form.
+    """
+    dr: float = r1 - r0
+    a: float = da * da * (dr * dr + (z1 - z0) ** 2)
+    b: float = (dr * dz) ** 2
+    if dr == 0:
+        return sqrt(a) * abs(r0)
+    if a == 0:
+        return sqrt(b)
+
+    def antiderivative(r: float) -> float:
+        if b == 0:
+            return sqrt(a) * r * abs(r) / 2
+        q: float = sqrt(a * r * r + b)
+        return r * q / 2 + b / (2 * sqrt(a)) * asinh(sqrt(a) * r / sqrt(b))
+
+    return (antiderivative(r1) - antiderivative(r0)) / dr
+
+
+def _strip_taper(g0: _Geometry, g1: _Geometry, t: float, da: float, dz: float) -> float:
+    """Return the area per unit of t of the strip between two wires at t."""
+    s, ds = _taper(g0, t)
+    dr_u: float = (g1.radius - g0.radius) + s * (g1.horz_offset - g0.horz_offset)
+    dz_u: float = s * (g1.vert_offset - g0.vert_offset)
+    total: float = 0
+    for u, w in zip(_gl_nodes, _gl_weights):
+        ho: float = g0.horz_offset + u * (g1.horz_offset - g0.horz_offset)
+        vo: float = g0.vert_offset + u * (g1.vert_offset - g0.vert_offset)
+        r: float = g0.radius + u * (g1.radius - g0.radius) + s * ho
+
+        # d/du is (dr_u, 0, dz_u) and d/dt is (ds * ho, r * da, dz + ds * vo)
+        # in the (radial, tangential, z) frame
+        tr: float = ds * ho
+        tt: float = r * da
+        tz: float = dz + ds * vo
+        cross_r: float = -dz_u * tt
+        cross_t: float = dz_u * tr - dr_u * tz
+        cross_z: float = dr_u * tt
+        total += w * sqrt(cross_r * cross_r + cross_t * cross_t + cross_z * cross_z)
+    return total
+
+
+def surface_area(gs: Sequence[_Geometry], tol: float = 1e-10) -> float:
+    """Return the area of the surface swept by a profile along the helix.
+
+    The surface is made of the strips between consecutive wires, closed
+    from the last wire back to the first if there are more than two, plus
+    the profile at each end when the helix does not taper to a point there.
+
+    :param gs: The geometry of each wire of the profile, in order around it
+    :param tol: Absolute tolerance of the quadrature over the taper zones
+    """
+    if len(gs) < 2:
+        return 0
+    g: _Geometry = gs[0]
+    da, dz = _rates(g)
+    pairs: List[Tuple[_Geometry, _Geometry]] = [
+        (gs[i], gs[i + 1]) for i in range(len(gs) - 1)
+    ]
+    if len(gs) > 2:
+        pairs.append((gs[-1], gs[0]))
+
+    body_lo, body_hi, tapers = _zones(g)
+    area: float = 0
+    for g0, g1 in pairs:
+        if body_lo < body_hi:
+            area += _strip_body(
+                g0.radius + g0.horz_offset,
+                g1.radius + g1.horz_offset,
+                g0.vert_offset,
+                g1.vert_offset,
+                da,
+                dz,
+            ) * (body_hi - body_lo)
+        for a, b in tapers:
+            area += _simpson(
+                lambda t: _strip_taper(g0, g1, t, da, dz), a, b, tol / len(pairs)
+            )
+
+    if len(gs) > 2:
+        for t in (g.first_t, g.last_t):
+            area += _area_moment(_profile(gs, _taper(g, t)[0]))[0]
+    return area
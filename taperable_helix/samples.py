@@ -0,0 +1,103 @@
+"""A lazy view of the points of a helix which doesn't need NumPy.
+
+HelixSamples is a read only Sequence, like range, of the num_points evenly
+spaced samples of Helix.point_array() but a point is only computed when
+it's read, so reading a few points of a very fine tessellation costs only
+those points::
+
+    samples = Helix(radius=1, pitch=0.5, height=2).samples(10_000_000)
+    samples[-1]                     # the last point, an (x, y, z) tuple
+    samples[::1000]                 # every 1000th point, a PointArray
+    samples[-100_000:]              # the last points, a PointArray
+"""
+
+from array import array
+from collections.abc import Sequence
+from itertools import chain
+from typing import Callable, Iterator, Optional, Union
+
+from .helix import Helix, HelixLocation, _Geometry
+from .pointarray import Point, PointArray
+
+
+class HelixSamples(Sequence):
+    """A read only sequence of num_points evenly spaced from first_t to
+    last_t inclusive, the same points as Helix.point_array(), computed on
+    demand.
+
+    :param helix: The helix
+    :param num_points: The number of samples
+    :param hl: Defines a refinded location when the helix is tapered
+    :param recurrence: If True slices with a step of 1 are computed as
+                       Helix.point_array(recurrence=True) does, it's faster
+                       and the points differ by up to about
+                       2 * r * a * 2.2e-16, see taperable_helix.recurrence
+    """
+
+    __slots__ = ("_geometry", "_func", "_num_points", "_step", "_recurrence")
+
+    def __init__(
+        self,
+        helix: Helix,
+        num_points: int,
+        hl: Optional[HelixLocation] = None,
+        recurrence: bool = False,
+    ):
+        if num_points < 0:
+            raise ValueError(f"num_points:{num_points} should be >= 0")
+        self._geometry: _Geometry = helix._geometry(hl)
+        self._func: Callable[[float], Point] = helix.helix(hl)
+        self._num_points: int = num_points
+        self._step: float = (
+            (helix.last_t - helix.first_t) / (num_points - 1) if num_points > 1 else 0
+        )
+        self._recurrence: bool = recurrence
+
+    def __len__(self) -> int:
+        return self._num_points
+
+    def _index(self, index: int) -> int:
+        n: int = self._num_points
+        i: int = index + n if index < 0 else index
+        if i < 0 or i >= n:
+            raise IndexError("HelixSamples index out of range")
+        return i
+
+    def _t(self, i: int) -> float:
+        if i == self._num_points - 1:
+            return self._geometry.last_t
+        return self._geometry.first_t + self._step * i
+
+    def t(self, index: int) -> float:
+        """Return the t of the sample at index."""
+        return self._t(self._index(index))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Point, PointArray]:
+        """Return the point at index as a tuple or a slice as a PointArray,
+        only the points read are computed."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._num_points)
+            if step == 1 and self._recurrence:
+                from .recurrence import uniform_points
+
+                return PointArray(
+                    uniform_points(
+                        self._geometry, self._num_points, start, max(stop - start, 0)
+                    )
+                )
+            return self._points(range(start, stop, step))
+        return self._func(self._t(self._index(index)))
+
+    def _points(self, indices: range) -> PointArray:
+        return PointArray(
+            array("d", chain.from_iterable(map(self._func, map(self._t, indices))))
+        )
+
+    def __iter__(self) -> Iterator[Point]:
+        return map(self._func, map(self._t, range(self._num_points)))
+
+    def __reversed__(self) -> Iterator[Point]:
+        return map(self._func, map(self._t, reversed(range(self._num_points))))
+
+    def __repr__(self) -> str:
+        return f"HelixSamples({self._num_points} points)"
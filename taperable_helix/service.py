@@ -0,0 +1,332 @@
+"""A local geometry service.
+
+GeometryService is an asyncio API over the NumPy generators. The work is
+done in an executor so the event loop stays responsive, and identical
+requests which arrive while one is being computed share its result rather
+than computing it again. Requests are identical when their Helix,
+HelixLocations and sampling parameters are, so bursts of clients asking
+for the same thread cost one computation::
+
+    service = GeometryService()
+    points = await service.points(Helix(radius=1, pitch=0.5, height=2), num_points=1000)
+
+Results are shared between the requests they satisfy so the arrays are
+read only. A GeometryService must be used from one event loop.
+
+serve() runs a small HTTP server over a GeometryService which streams the
+points as csv or binary, see taperable_helix.cli, in chunks using chunked
+transfer encoding::
+
+    python -m taperable_helix.service --port 8000
+    curl 'http://127.0.0.1:8000/points?radius=1&pitch=0.5&height=2&num_points=1000'
+
+The query parameters are the Helix attributes, horz_offset, vert_offset,
+location_radius, the HelixLocation radius, num_points, chunk_size and
+format. Instrumentation counts service.computed and service.coalesced
+requests.
+"""
+
+import argparse
+import asyncio
+import sys
+from concurrent.futures import Executor
+from dataclasses import fields, replace
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from . import instrumentation as _instrumentation
+from .cli import _encode
+from .helix import Helix, HelixLocation, _Geometry
+from .mesh import Mesh, helix_mesh
+from .vectorized import _chunk_t, _evaluate
+
+
+def _points(g: _Geometry, num_points: int, first: int, n: int) -> np.ndarray:
+    """Return the n points from index first of num_points, read only."""
+    points: np.ndarray = _evaluate(g, _chunk_t(g, num_points, first, n))[0]
+    points.flags.writeable = False
+    return points
+
+
+def _mesh(helix: Helix, locations: List[HelixLocation], num_points: int) -> Mesh:
+    """Return the mesh of a thread, read only."""
+    mesh: Mesh = helix_mesh(helix, locations, num_points)
+    mesh.vertices.flags.writeable = False
+    mesh.faces.flags.writeable = False
+    return mesh
+
+
+class GeometryService:
+    """Generates helix geometry in an executor, coalescing identical
+    in flight requests.
+
+    :param executor: Where the geometry is computed, default the event
+                     loop's default executor, a thread pool
+    :param chunk_size: The default number of points in each chunk of chunks()
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, chunk_size: int = 65536):
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size:{chunk_size} should be >= 1")
+        self.executor: Optional[Executor] = executor
+        self.chunk_size: int = chunk_size
+        self._in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def _run(self, key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """Return func(*args) or the result of the in flight request for key."""
+        future: Optional["asyncio.Future[Any]"] = self._in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            new: "asyncio.Future[Any]" = loop.run_in_executor(
+                self.executor, func, *args
+            )
+
+            def done(_: "asyncio.Future[Any]") -> None:
+                if self._in_flight.get(key) is new:
+                    del self._in_flight[key]
+
+            new.add_done_callback(done)
+            self._in_flight[key] = future = new
+            name: str = "service.computed"
+        else:
+            name = "service.coalesced"
+        if _instrumentation.enabled:
+            _instrumentation.count(name)
+
+        # Shielded so a cancelled request doesn't cancel the others
+        return await asyncio.shield(future)
+
+    async def points(
+        self, helix: Helix, hl: Optional[HelixLocation] = None, num_points: int = 100
+    ) -> np.ndarray:
+        """Return num_points evenly spaced from first_t to last_t inclusive.
+
+        :param helix: The helix to evaluate
+        :param hl: Defines a refinded location when the helix is tapered
+        :param num_points: The number of points
+        :returns: A read only float64 array of shape (num_points, 3)
+        """
+        g: _Geometry = helix._geometry(hl)
+        return await self._run(
+            ("points", g, num_points, 0, num_points),
+            _points,
+            g,
+            num_points,
+            0,
+            num_points,
+        )
+
+    async def chunks(
+        self,
+        helix: Helix,
+        hl: Optional[HelixLocation] = None,
+        num_points: int = 100,
+        chunk_size: Optional[int] = None,
+    ) -> AsyncIterator[np.ndarray]:
+        """Generate the points of points() in chunks, each computed when
+        the previous one has been consumed and coalesced separately.
+
+        :param helix: The helix to evaluate
+        :param hl: Defines a refinded location when the helix is tapered
+        :param num_points: The total number of points
+        :param chunk_size: The maximum number of points in each chunk,
+                           default self.chunk_size
+        :returns: An async iterator of read only float64 arrays of
+                  shape (n, 3), n <= chunk_size
+        """
+        size: int = self.chunk_size if chunk_size is None else chunk_size
+        if size < 1:
+            raise ValueError(f"chunk_size:{size} should be >= 1")
+        g: _Geometry = helix._geometry(hl)
+        for first in range(0, num_points, size):
+            n: int = min(size, num_points - first)
+            yield await self._run(
+                ("points", g, num_points, first, n), _points, g, num_points, first, n
+            )
+
+    async def mesh(
+        self, helix: Helix, locations: Sequence[HelixLocation], num_points: int = 100
+    ) -> Mesh:
+        """Return the mesh of a thread, see taperable_helix.mesh.
+
+        :param helix: The helix of every wire
+        :param locations: The HelixLocation of each wire, in order around
+                          the profile
+        :param num_points: The number of rings, points on each wire
+        :returns: The mesh, its arrays are read only
+        """
+        gs: Tuple[_Geometry, ...] = tuple(helix._geometry(hl) for hl in locations)
+        # Copies so changes made while it's computed don't affect it
+        return await self._run(
+            ("mesh", gs, num_points),
+            _mesh,
+            replace(helix),
+            [replace(hl) for hl in locations],
+            num_points,
+        )
+
+
+_helix_params: List[str] = [f.name for f in fields(Helix)]
+_location_params: Dict[str, str] = {
+    "horz_offset": "horz_offset",
+    "vert_offset": "vert_offset",
+    "location_radius": "radius",
+}
+_content_types: Dict[str, str] = {
+    "csv": "text/csv",
+    "binary": "application/octet-stream",
+}
+
+
+def _request(
+    service: GeometryService, target: str
+) -> Tuple[Helix, HelixLocation, int, int, str]:
+    """Return the helix, location, num_points, chunk_size and format of
+    a /points request target, raises ValueError if it's invalid."""
+    params: Dict[str, str] = dict(
+        parse_qsl(urlsplit(target).query, strict_parsing=True)
+    )
+    unknown: List[str] = sorted(
+        set(params)
+        - set(_helix_params)
+        - set(_location_params)
+        - {"num_points", "chunk_size", "format"}
+    )
+    if unknown:
+        raise ValueError(f"unknown parameters {unknown}")
+    missing: List[str] = [k for k in ("radius", "pitch", "height") if k not in params]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} required")
+    helix: Helix = Helix(
+        **{k: float(v) for k, v in params.items() if k in _helix_params}
+    )
+    hl: HelixLocation = HelixLocation(
+        **{
+            _location_params[k]: float(v)
+            for k, v in params.items()
+            if k in _location_params
+        }
+    )
+    fmt: str = params.get("format", "csv")
+    if fmt not in _content_types:
+        raise ValueError(f"format:{fmt} should be one of {sorted(_content_types)}")
+    chunk_size: int = int(params.get("chunk_size", service.chunk_size))
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size:{chunk_size} should be >= 1")
+    helix._geometry(hl)  # Validate before the response starts
+    return helix, hl, int(params.get("num_points", 100)), chunk_size, fmt
+
+
+async def _respond(
+    writer: asyncio.StreamWriter, status: str, content_type: str, body: bytes = b""
+) -> None:
+    writer.write(
+        f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+
+async def _handle(
+    service: GeometryService,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Serve one request on a connection."""
+    try:
+        request_line: List[str] = (await reader.readline()).decode("latin-1").split()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass  # The headers aren't used
+        if len(request_line) != 3:
+            await _respond(writer, "400 Bad Request", "text/plain", b"bad request\n")
+            return
+        method, target, _ = request_line
+        if urlsplit(target).path != "/points":
+            await _respond(writer, "404 Not Found", "text/plain", b"not found\n")
+            return
+        if method != "GET":
+            await _respond(writer, "405 Method Not Allowed", "text/plain", b"use GET\n")
+            return
+        try:
+            helix, hl, num_points, chunk_size, fmt = _request(service, target)
+        except (ValueError, TypeError) as err:
+            await _respond(writer, "400 Bad Request", "text/plain", f"{err}\n".encode())
+            return
+
+        writer.write(
+            f"HTTP/1.1 200 OK\r\nContent-Type: {_content_types[fmt]}\r\n"
+            "Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n".encode()
+        )
+        if fmt == "csv":
+            writer.write(b"b\r\nwire,x,y,z\n\r\n")
+        async for chunk in service.chunks(helix, hl, num_points, chunk_size):
+            data: bytes = _encode(fmt, 0, chunk)
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+    except ConnectionError:
+        pass  # The client went away
+    finally:
+        writer.close()
+
+
+async def serve(
+    host: str = "127.0.0.1", port: int = 8000, service: Optional[GeometryService] = None
+) -> asyncio.AbstractServer:
+    """Start an HTTP server streaming points from service.
+
+    :param host: The address to listen on, default only the local host
+    :param port: The port to listen on, 0 for any free port
+    :param service: The service, default a new GeometryService()
+    :returns: The started server
+    """
+    svc: GeometryService = service if service is not None else GeometryService()
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await _handle(svc, reader, writer)
+
+    return await asyncio.start_server(handle, host, port)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the HTTP server until interrupted.
+
+    :param argv: The arguments, default sys.argv[1:]
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m taperable_helix.service",
+        description="Serve helix points over HTTP.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        server = await serve(args.host, args.port)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
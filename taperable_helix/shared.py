@@ -0,0 +1,308 @@
+"""Helix points and meshes in multiprocessing.shared_memory blocks.
+
+Geometry generated by a worker process and returned through a pool is
+pickled and copied. Instead it can be generated directly into a shared
+memory block, and only a small SharedDescriptor is passed between the
+processes, which attach to the block and use it as a NumPy array without
+copying::
+
+    with SharedArray.create((num_points, 3)) as points:
+        with Pool() as pool:
+            pool.starmap(fill_points, [
+                (points.descriptor, helix, hl, first, n) for first, n in slices
+            ])
+        use(points.array)
+        points.unlink()
+
+The process which creates a block owns it, it must unlink() the block when
+every process has finished with it. Other processes attach() and close()
+their view of it, which never removes the block.
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from multiprocessing import parent_process, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .helix import Helix, HelixLocation, _Geometry
+from .mesh import Mesh, _num_faces, mesh_chunks
+from .vectorized import Scratch, _chunk_t, _evaluate_into
+
+_created: Set[str] = set()
+"""The names of the blocks created by this process which aren't unlinked"""
+
+
+class _UntrackedSharedMemory(SharedMemory):
+    """Attaches to an existing posix block without registering it with the
+    resource tracker, as SharedMemory(name, track=False) does from Python
+    3.13."""
+
+    def __init__(self, name: str, create: bool = False, size: int = 0):
+        import _posixshmem  # type: ignore
+        import mmap
+
+        self._name = "/" + name
+        self._fd = _posixshmem.shm_open(self._name, os.O_RDWR, mode=0o600)
+        try:
+            self._mmap = mmap.mmap(self._fd, os.fstat(self._fd).st_size)
+        except OSError:
+            os.close(self._fd)
+            raise
+        self._size = self._mmap.size()
+        self._buf = memoryview(self._mmap)
+
+
+def _attach(name: str) -> SharedMemory:
+    """Return the existing shared memory block name without leaving it
+    registered with the resource tracker, which would unlink it when this
+    process exits, but only its creator should."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)  # type: ignore
+    if os.name != "posix" or name in _created:
+        # Only posix registers blocks and the creator's is registered anyway
+        return SharedMemory(name=name)
+    if parent_process() is not None:
+        # A multiprocessing child may share its parent's resource tracker,
+        # unregistering the name there would drop the creator's registration
+        return _UntrackedSharedMemory(name)
+    shm: SharedMemory = SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore
+    return shm
+
+
+def _create(size: int) -> SharedMemory:
+    """Return a new shared memory block of size bytes owned by this process."""
+    shm: SharedMemory = SharedMemory(create=True, size=size)
+    _created.add(shm.name)
+    return shm
+
+
+@dataclass(frozen=True)
+class SharedDescriptor:
+    """Identifies an array in a shared memory block, it is small and can
+    be pickled to pass it to another process."""
+
+    name: str
+    """The name of the shared memory block"""
+
+    shape: Tuple[int, ...]
+    """The shape of the array"""
+
+    dtype: str
+    """The NumPy dtype of the array"""
+
+
+class SharedArray:
+    """A NumPy array in a shared memory block.
+
+    Use create() or attach() rather than the constructor. It's a context
+    manager which closes this process's view of the block on exit.
+    """
+
+    def __init__(self, descriptor: SharedDescriptor, shm: SharedMemory):
+        self.descriptor: SharedDescriptor = descriptor
+        """Pass this to other processes to attach to the array"""
+
+        self.array: np.ndarray = np.ndarray(
+            descriptor.shape, dtype=descriptor.dtype, buffer=shm.buf
+        )
+        """The array, it's invalid after close()"""
+
+        self._shm: SharedMemory = shm
+
+    @classmethod
+    def create(cls, shape: Tuple[int, ...], dtype: str = "float64") -> "SharedArray":
+        """Create a shared memory block holding an uninitialized array.
+
+        :param shape: The shape of the array
+        :param dtype: The NumPy dtype of the array
+        :returns: The array, this process owns the block
+        """
+        size: int = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        # Zero sized blocks aren't allowed
+        shm: SharedMemory = _create(max(size, 1))
+        return cls(SharedDescriptor(shm.name, tuple(shape), dtype), shm)
+
+    @classmethod
+    def attach(cls, descriptor: SharedDescriptor) -> "SharedArray":
+        """Attach to an array created by another process.
+
+        :param descriptor: The descriptor of the array
+        :returns: The array
+        """
+        return cls(descriptor, _attach(descriptor.name))
+
+    def close(self) -> None:
+        """Close this process's view of the block, the array is invalid after."""
+        # The array references the buffer, it must be released first
+        self.array = np.empty((0,))
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Remove the block, only the process which created it should."""
+        self._shm.unlink()
+        _created.discard(self._shm.name)
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def fill_points(
+    descriptor: SharedDescriptor,
+    helix: Helix,
+    hl: Optional[HelixLocation] = None,
+    first: int = 0,
+    n: Optional[int] = None,
+    chunk_size: int = 65536,
+) -> None:
+    """Generate points into rows first to first + n of a shared (N, 3)
+    float64 array. The N points are evenly spaced from first_t to last_t
+    inclusive, as helix_chunks() generates them, so processes can fill
+    disjoint rows of one array.
+
+    :param descriptor: The descriptor of the array
+    :param helix: The helix to evaluate
+    :param hl: Defines a refinded location when the helix is tapered
+    :param first: The first row
+    :param n: The number of rows, default the rows from first to the end
+    :param chunk_size: The maximum number of points generated at a time
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size:{chunk_size} should be >= 1")
+    num_points: int = descriptor.shape[0]
+    last: int = num_points if n is None else first + n
+    if first < 0 or last > num_points or first > last:
+        raise ValueError(f"rows {first}:{last} should be within 0:{num_points}")
+    g: _Geometry = helix._geometry(hl)
+    scratch: Scratch = Scratch()
+    with SharedArray.attach(descriptor) as shared:
+        for start in range(first, last, chunk_size):
+            count: int = min(chunk_size, last - start)
+            _evaluate_into(
+                g,
+                _chunk_t(g, num_points, start, count),
+                shared.array[start : start + count],
+                scratch,
+            )
+
+
+def shared_points(
+    helix: Helix,
+    num_points: int,
+    hl: Optional[HelixLocation] = None,
+    chunk_size: int = 65536,
+) -> SharedArray:
+    """Return num_points evenly spaced from first_t to last_t inclusive
+    in a new shared memory block owned by this process.
+
+    :param helix: The helix to evaluate
+    :param num_points: The number of points
+    :param hl: Defines a refinded location when the helix is tapered
+    :param chunk_size: The maximum number of points generated at a time
+    :returns: A shared float64 array of shape (num_points, 3)
+    """
+    helix._geometry(hl)  # Validate before creating the block
+    points: SharedArray = SharedArray.create((num_points, 3))
+    try:
+        fill_points(points.descriptor, helix, hl, chunk_size=chunk_size)
+    except BaseException:
+        points.close()
+        points.unlink()
+        raise
+    return points
+
+
+@dataclass(frozen=True)
+class SharedMeshDescriptor:
+    """Identifies a mesh in shared memory blocks, it can be pickled."""
+
+    vertices: SharedDescriptor
+    faces: SharedDescriptor
+
+
+@dataclass
+class SharedMesh:
+    """A taperable_helix.mesh.Mesh whose arrays are in shared memory blocks."""
+
+    vertices: SharedArray
+    faces: SharedArray
+
+    @property
+    def descriptor(self) -> SharedMeshDescriptor:
+        """Pass this to other processes to attach to the mesh"""
+        return SharedMeshDescriptor(self.vertices.descriptor, self.faces.descriptor)
+
+    @property
+    def mesh(self) -> Mesh:
+        """The mesh, a view of the shared arrays"""
+        return Mesh(vertices=self.vertices.array, faces=self.faces.array)
+
+    @classmethod
+    def attach(cls, descriptor: SharedMeshDescriptor) -> "SharedMesh":
+        """Attach to a mesh created by another process."""
+        return cls(
+            SharedArray.attach(descriptor.vertices),
+            SharedArray.attach(descriptor.faces),
+        )
+
+    def close(self) -> None:
+        """Close this process's view of the blocks."""
+        self.vertices.close()
+        self.faces.close()
+
+    def unlink(self) -> None:
+        """Remove the blocks, only the process which created them should."""
+        self.vertices.unlink()
+        self.faces.unlink()
+
+    def __enter__(self) -> "SharedMesh":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def shared_mesh(
+    helix: Helix,
+    locations: Sequence[HelixLocation],
+    num_points: int,
+    chunk_size: int = 4096,
+) -> SharedMesh:
+    """Return the mesh of a thread in new shared memory blocks owned by
+    this process, see taperable_helix.mesh.
+
+    :param helix: The helix of every wire
+    :param locations: The HelixLocation of each wire, in order around the profile
+    :param num_points: The number of rings, points on each wire
+    :param chunk_size: The maximum number of rings generated at a time
+    :returns: The shared mesh
+    """
+    if len(locations) < 1:
+        raise ValueError("locations should not be empty")
+    for hl in locations:
+        helix._geometry(hl)  # Validate before creating the blocks
+    num_wires: int = len(locations)
+    num_faces: int = _num_faces(num_wires, num_points)
+    vertices: SharedArray = SharedArray.create((num_points * num_wires, 3))
+    faces: SharedArray = SharedArray.create((num_faces, 3), "int64")
+    mesh: SharedMesh = SharedMesh(vertices, faces)
+    try:
+        v: int = 0
+        f: int = 0
+        for chunk in mesh_chunks(helix, locations, num_points, chunk_size):
+            vertices.array[v : v + len(chunk.vertices)] = chunk.vertices
+            faces.array[f : f + len(chunk.faces)] = chunk.faces
+            v += len(chunk.vertices)
+            f += len(chunk.faces)
+    except BaseException:
+        mesh.close()
+        mesh.unlink()
+        raise
+    return mesh
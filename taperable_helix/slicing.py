@@ -0,0 +1,213 @@
+"""Crossings of helixes with horizontal planes.
+
+In the untapered body z is linear in t, so the crossing of each plane is
+solved directly. In a taper zone z = linear(t) + vert_offset * sin(taper_angle)
+with taper_angle linear in t over a quarter period, so z is convex or
+concave there and has at most one turning point, which is also found
+analytically. Each monotone piece is then solved for all of the planes at
+once with Newton iterations, falling back to bisection when a step leaves
+the bracket or doesn't shrink fast enough, until z is within tol of each
+plane.
+"""
+
+from dataclasses import dataclass
+from math import acos, pi
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .helix import Helix, HelixLocation, _Geometry
+from .vectorized import _evaluate
+
+
+@dataclass
+class Crossings:
+    """The crossings of one wire with a set of z planes sorted by level
+    then t, a level may be crossed zero or more times."""
+
+    level: np.ndarray
+    """Index into the z levels of each crossing, shape (K,)"""
+
+    t: np.ndarray
+    """t of each crossing, shape (K,)"""
+
+    x: np.ndarray
+    """x of each crossing, shape (K,)"""
+
+    y: np.ndarray
+    """y of each crossing, shape (K,)"""
+
+
+def _z(g: _Geometry, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return z and dz/dt at t."""
+    p, d1 = _evaluate(g, t, 1)
+    return p[:, 2], d1[:, 2]
+
+
+def _monotone(
+    g: _Geometry,
+    z_levels: np.ndarray,
+    a: float,
+    b: float,
+    include_a: bool,
+    include_b: bool,
+    iterations: int,
+    tol: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Solve z(t) == level for t in [a, b] where z is monotone.
+
+    :returns: (level index, t) of the crossings
+    """
+    za, zb = _z(g, np.array([a, b]))[0]
+    lo_z, hi_z = min(za, zb), max(za, zb)
+    sel: np.ndarray = (z_levels >= lo_z) & (z_levels <= hi_z)
+    if not include_a:
+        sel &= z_levels != za
+    if not include_b:
+        sel &= z_levels != zb
+    idx: np.ndarray = np.nonzero(sel)[0]
+    if len(idx) == 0 or za == zb:
+        return idx[:0], np.empty(0)
+
+    level: np.ndarray = z_levels[idx]
+    increasing: bool = zb > za
+    lo: np.ndarray = np.full(len(idx), a)
+    hi: np.ndarray = np.full(len(idx), b)
+
+    # Start from the secant then Newton, bisecting if a step leaves the
+    # bracket or is more than half the previous one, i.e. it's converging
+    # no faster than bisection would. Stop at tol or when the bracket can't
+    # shrink any more.
+    t: np.ndarray = a + (level - za) * (b - a) / (zb - za)
+    last_step: np.ndarray = np.full(len(idx), abs(b - a))
+    for _ in range(iterations):
+        z, dz = _z(g, t)
+        active: np.ndarray = (np.abs(z - level) >= tol) & (
+            hi - lo > 4 * np.spacing(np.maximum(np.abs(lo), np.abs(hi)))
+        )
+        if not active.any():
+            break
+        below: np.ndarray = (z < level) if increasing else (z > level)
+        lo = np.where(below, t, lo)
+        hi = np.where(below, hi, t)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step: np.ndarray = t - (z - level) / dz
+        newton: np.ndarray = (
+            np.isfinite(step)
+            & (step >= lo)
+            & (step <= hi)
+            & (np.abs(step - t) <= last_step / 2)
+        )
+        new_t: np.ndarray = np.where(newton, step, (lo + hi) / 2)
+        last_step = np.abs(new_t - t)
+        t = np.where(active, new_t, t)
+    return idx, t
+
+
+def crossings(
+    helix: Helix,
+    z_levels: np.ndarray,
+    hl: Optional[HelixLocation] = None,
+    iterations: int = 100,
+    tol: float = 1e-12,
+) -> Crossings:
+    """Return where a helix crosses each of a set of z planes.
+
+    A helix with pitch 0 has a constant z body which lies in a plane
+    rather than crossing it, so only its taper zones report crossings.
+
+    :param helix: The helix to slice
+    :param z_levels: Array like of the z of each plane, shape (L,)
+    :param hl: Defines a refinded location when the helix is tapered
+    :param iterations: Maximum number of root finding iterations in the taper
+                       zones
+    :param tol: The root finding stops when z is within tol of the level,
+                or t is as close as floating point allows
+    :returns: The crossings
+    """
+    z: np.ndarray = np.asarray(z_levels, dtype=np.float64).reshape(-1)
+    g: _Geometry = helix._geometry(hl)
+    levels: List[np.ndarray] = []
+    ts: List[np.ndarray] = []
+
+    t_lo: float = min(g.first_t, g.last_t)
+    t_hi: float = max(g.first_t, g.last_t)
+    body_lo: float = max(t_lo, g.taper_out_ends)
+    body_hi: float = min(t_hi, g.taper_in_starts)
+    z_slope: float = g.helix_height if g.pitch != 0 else 0
+
+    # The body, z = z_slope * (t - first_t) / t_range + vert_offset + inset_offset
+    if g.t_range != 0 and z_slope != 0 and body_lo <= body_hi:
+        t_body: np.ndarray = (
+            g.first_t + (z - g.vert_offset - g.inset_offset) * g.t_range / z_slope
+        )
+        idx: np.ndarray = np.nonzero((t_body >= body_lo) & (t_body <= body_hi))[0]
+        levels.append(idx)
+        ts.append(t_body[idx])
+
+    # The taper zones, each split at the turning point of z, if any. The
+    # taper_angle is measured from the tip, first_t for the out zone and
+    # last_t for the in zone, and changes by dangle per unit of t.
+    zones: List[Tuple[float, float, float, float, bool, bool]] = []
+    if g.t_range != 0 and t_lo < body_lo:
+        dangle_out: float = pi / 2 / g.taper_out_range
+        zones.append((t_lo, body_lo, g.first_t, dangle_out, True, False))
+    if g.t_range != 0 and body_hi < t_hi:
+        dangle_in: float = -pi / 2 / g.taper_in_range
+        zones.append((body_hi, t_hi, g.last_t, dangle_in, False, True))
+    for a, b, tip, dangle, include_a, include_b in zones:
+        # dz/dt = z_slope / t_range + vert_offset * cos(taper_angle) * dangle
+        edges: List[float] = [a, b]
+        if g.vert_offset != 0:
+            c: float = -(z_slope / g.t_range) / (g.vert_offset * dangle)
+            if 0 < c < 1:
+                turn: float = tip + acos(c) / dangle
+                if a < turn < b:
+                    edges = [a, turn, b]
+        for i in range(len(edges) - 1):
+            idx, t = _monotone(
+                g,
+                z,
+                edges[i],
+                edges[i + 1],
+                include_a or i > 0,
+                include_b or i < len(edges) - 2,
+                iterations,
+                tol,
+            )
+            # A level at the turning point touches it from both pieces
+            if i > 0:
+                turn_z: float = _z(g, np.array([edges[i]]))[0][0]
+                keep: np.ndarray = z[idx] != turn_z
+                idx, t = idx[keep], t[keep]
+            levels.append(idx)
+            ts.append(t)
+
+    level: np.ndarray = np.concatenate(levels) if levels else np.empty(0, np.int64)
+    t_all: np.ndarray = np.concatenate(ts) if ts else np.empty(0)
+    order: np.ndarray = np.lexsort((t_all, level))
+    level, t_all = level[order], t_all[order]
+    p: np.ndarray = _evaluate(g, t_all)[0]
+    return Crossings(level=level, t=t_all, x=p[:, 0], y=p[:, 1])
+
+
+def slice_wires(
+    helix: Helix,
+    z_levels: np.ndarray,
+    locations: Optional[Sequence[HelixLocation]] = None,
+    iterations: int = 100,
+    tol: float = 1e-12,
+) -> List[Crossings]:
+    """Return the crossings of every wire of a thread with a set of z planes.
+
+    :param helix: The helix of every wire
+    :param z_levels: Array like of the z of each plane, shape (L,)
+    :param locations: The HelixLocation of each wire, default one wire
+                      at HelixLocation()
+    :param iterations: Maximum number of root finding iterations in the taper
+                       zones
+    :param tol: See crossings()
+    :returns: The crossings of each wire
+    """
+    hls: Sequence[HelixLocation] = locations if locations else [HelixLocation()]
+    return [crossings(helix, z_levels, hl, iterations, tol) for hl in hls]
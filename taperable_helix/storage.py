@@ -0,0 +1,312 @@
+"""A compressed file format for helix wires and meshes.
+
+Successive points along a helix are close together, so each chunk of
+rows is delta encoded, byte shuffled, which puts the mostly zero high
+bytes of the deltas together, and compressed with zlib. Chunks are encoded
+and decoded by a pool of threads, zlib releases the GIL, and each can be
+read on its own::
+
+    save("thread.thz", {"wire0": points, "wire1": points1}, tolerance=1e-6)
+    with Archive("thread.thz") as archive:
+        rows = archive.read_rows("wire0", 1000, 2000)
+
+Float64 arrays are stored either exactly, as the second differences of
+the bits of the values, or quantized to the nearest multiple of
+2 * tolerance, so every value is within tolerance, as the differences of
+the multiples. Integer arrays, for instance the faces of a mesh, are
+stored exactly as their differences.
+
+The file is the magic, the compressed chunks, a JSON index of the arrays
+and their chunks, and a trailer of the index length and the magic.
+"""
+
+import json
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .mesh import Mesh
+
+_magic: bytes = b"THLX"
+_trailer: struct.Struct = struct.Struct("<Q4s")
+_version: int = 1
+
+PathOrFile = Union[str, "os.PathLike[str]", IO[bytes]]
+
+
+def _shuffle(a: np.ndarray) -> bytes:
+    """Return the bytes of a 64 bit array, byte 0 of every value first."""
+    return a.reshape(-1).view(np.uint8).reshape(-1, 8).T.tobytes()
+
+
+def _unshuffle(data: bytes, dtype: str, shape: Tuple[int, ...]) -> np.ndarray:
+    return (
+        np.frombuffer(data, dtype=np.uint8)
+        .reshape(8, -1)
+        .T.copy()
+        .view(dtype)
+        .reshape(shape)
+    )
+
+
+def _orders(encoding: str) -> int:
+    """Return the order of the differences of an encoding.
+
+    The bits of successive float64 values on a smooth curve have small
+    second differences, quantized values and integers small first ones.
+    """
+    return 2 if encoding == "exact" else 1
+
+
+def _encode(chunk: np.ndarray, encoding: str, step: float, level: int) -> bytes:
+    """Return a chunk of rows delta encoded, shuffled and compressed."""
+    values: np.ndarray
+    if encoding == "exact":
+        values = np.ascontiguousarray(chunk).view(np.int64)
+    elif encoding == "quantized":
+        values = np.round(chunk / step).astype(np.int64)
+    else:
+        values = chunk.astype(np.int64)
+    # The differences wrap around on overflow, which cumsum() undoes
+    deltas: np.ndarray = values.copy()
+    for _ in range(_orders(encoding)):
+        deltas[1:] = deltas[1:] - deltas[:-1].copy()
+    return zlib.compress(_shuffle(deltas), level)
+
+
+def _decode(
+    data: bytes, encoding: str, step: float, dtype: str, shape: Tuple[int, ...]
+) -> np.ndarray:
+    """Return the chunk of rows encoded by _encode()."""
+    values: np.ndarray = _unshuffle(zlib.decompress(data), "<i8", shape)
+    for _ in range(_orders(encoding)):
+        values = np.cumsum(values, axis=0)
+    if encoding == "exact":
+        return values.view(dtype)
+    if encoding == "quantized":
+        return values * step
+    return values.astype(dtype)
+
+
+def save(
+    file: PathOrFile,
+    arrays: Dict[str, Any],
+    tolerance: Optional[float] = None,
+    chunk_size: int = 65536,
+    level: int = 6,
+    workers: Optional[int] = None,
+) -> None:
+    """Write arrays to a compressed file.
+
+    :param file: A path or a binary file object, which must be seekable to
+                 be read
+    :param arrays: The arrays by name, float64 or integer, for instance
+                   wires of shape (N, 3)
+    :param tolerance: None stores float64 arrays exactly, otherwise each value
+                      is quantized to within tolerance
+    :param chunk_size: The number of rows in each chunk
+    :param level: The zlib compression level, 0 to 9
+    :param workers: The number of threads encoding chunks, default
+                    os.cpu_count()
+    """
+    if tolerance is not None and not tolerance > 0:
+        raise ValueError(f"tolerance:{tolerance} should be > 0")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size:{chunk_size} should be >= 1")
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "wb") as f:
+            save(f, arrays, tolerance, chunk_size, level, workers)
+        return
+
+    base: int = file.tell()
+    file.write(_magic)
+    index: Dict[str, Any] = {"version": _version, "arrays": {}}
+    with ThreadPoolExecutor(workers) as pool:
+        for name, value in arrays.items():
+            a: np.ndarray = np.asarray(value)
+            if a.ndim < 1:
+                raise ValueError(f"{name} should have at least one dimension")
+            step: float = 0
+            if a.dtype == np.float64:
+                encoding: str = "exact" if tolerance is None else "quantized"
+                if tolerance is not None:
+                    step = 2 * tolerance
+                    limit: float = float(np.abs(a).max(initial=0)) / step
+                    if not limit < 2**62:
+                        raise ValueError(
+                            f"{name} can't be quantized to tolerance:{tolerance}"
+                        )
+            elif a.dtype.kind in "iu" and a.dtype.itemsize <= 8:
+                if a.dtype == np.uint64 and a.size and a.max() >= 2**63:
+                    raise ValueError(f"{name} values should be < 2**63")
+                encoding = "delta"
+            else:
+                raise ValueError(f"{name} dtype:{a.dtype} should be float64 or integer")
+
+            chunks: List[List[int]] = []
+            for data in pool.map(
+                lambda first: _encode(
+                    a[first : first + chunk_size], encoding, step, level
+                ),
+                range(0, len(a), chunk_size),
+            ):
+                chunks.append([file.tell() - base, len(data)])
+                file.write(data)
+            index["arrays"][name] = {
+                "dtype": a.dtype.str,
+                "shape": list(a.shape),
+                "encoding": encoding,
+                "step": step,
+                "chunk_size": chunk_size,
+                "chunks": chunks,
+            }
+    data = json.dumps(index).encode()
+    file.write(data)
+    file.write(_trailer.pack(len(data), _magic))
+
+
+class Archive:
+    """Reads a file written by save(), it's a context manager.
+
+    :param file: A path or a seekable binary file object
+    :param workers: The number of threads decoding chunks in read(),
+                    default os.cpu_count()
+    """
+
+    def __init__(self, file: PathOrFile, workers: Optional[int] = None):
+        self._own: bool = isinstance(file, (str, os.PathLike))
+        self._file: IO[bytes] = (
+            open(file, "rb") if isinstance(file, (str, os.PathLike)) else file
+        )
+        self._workers: Optional[int] = workers
+        try:
+            self._base: int = self._file.tell()
+            if self._file.read(len(_magic)) != _magic:
+                raise ValueError("not a taperable_helix archive")
+            self._file.seek(-_trailer.size, os.SEEK_END)
+            size, magic = _trailer.unpack(self._file.read(_trailer.size))
+            if magic != _magic:
+                raise ValueError("truncated taperable_helix archive")
+            self._file.seek(-_trailer.size - size, os.SEEK_END)
+            index: Dict[str, Any] = json.loads(self._file.read(size))
+            if index.get("version") != _version:
+                raise ValueError(
+                    f"archive version:{index.get('version')} isn't supported"
+                )
+            self._arrays: Dict[str, Any] = index["arrays"]
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def names(self) -> List[str]:
+        """The names of the arrays, in the order they were saved"""
+        return list(self._arrays)
+
+    def shape(self, name: str) -> Tuple[int, ...]:
+        """Return the shape of the array name."""
+        return tuple(self._arrays[name]["shape"])
+
+    def num_chunks(self, name: str) -> int:
+        """Return the number of chunks of the array name."""
+        return len(self._arrays[name]["chunks"])
+
+    def _raw(self, name: str, index: int) -> bytes:
+        offset, size = self._arrays[name]["chunks"][index]
+        self._file.seek(self._base + offset)
+        return self._file.read(size)
+
+    def _decode(self, name: str, index: int, data: bytes) -> np.ndarray:
+        meta: Dict[str, Any] = self._arrays[name]
+        shape: List[int] = meta["shape"]
+        first: int = index * meta["chunk_size"]
+        rows: int = min(meta["chunk_size"], shape[0] - first)
+        return _decode(
+            data, meta["encoding"], meta["step"], meta["dtype"], (rows, *shape[1:])
+        )
+
+    def read_chunk(self, name: str, index: int) -> np.ndarray:
+        """Return chunk index of the array name, only it is read and decoded.
+
+        :param name: The name of the array
+        :param index: The index of the chunk, rows index * chunk_size onwards
+        :returns: The rows of the chunk
+        """
+        if index < 0 or index >= self.num_chunks(name):
+            raise IndexError(f"chunk:{index} of {name} out of range")
+        return self._decode(name, index, self._raw(name, index))
+
+    def read_rows(self, name: str, start: int, stop: int) -> np.ndarray:
+        """Return rows start to stop of the array name, only the chunks
+        holding them are read and decoded."""
+        meta: Dict[str, Any] = self._arrays[name]
+        start, stop, _ = slice(start, stop).indices(meta["shape"][0])
+        if start >= stop:
+            return np.empty((0, *meta["shape"][1:]), dtype=meta["dtype"])
+        size: int = meta["chunk_size"]
+        first: int = start // size
+        chunks: List[np.ndarray] = [
+            self.read_chunk(name, i) for i in range(first, (stop - 1) // size + 1)
+        ]
+        return np.concatenate(chunks)[start - first * size : stop - first * size]
+
+    def read(self, name: str) -> np.ndarray:
+        """Return the array name, decoded by a pool of threads."""
+        meta: Dict[str, Any] = self._arrays[name]
+        raws: List[bytes] = [self._raw(name, i) for i in range(self.num_chunks(name))]
+        result: np.ndarray = np.empty(meta["shape"], dtype=meta["dtype"])
+        size: int = meta["chunk_size"]
+
+        def decode(i: int) -> None:
+            result[i * size : (i + 1) * size] = self._decode(name, i, raws[i])
+
+        with ThreadPoolExecutor(self._workers) as pool:
+            list(pool.map(decode, range(len(raws))))
+        return result
+
+    def close(self) -> None:
+        """Close the file if the Archive opened it."""
+        if self._own:
+            self._file.close()
+
+    def __enter__(self) -> "Archive":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def save_mesh(file: PathOrFile, mesh: Mesh, **kwargs: Any) -> None:
+    """Write a mesh, see taperable_helix.mesh, to a compressed file.
+
+    :param file: A path or a binary file object
+    :param mesh: The mesh
+    :param kwargs: Passed to save(), tolerance applies to the vertices,
+                   normals and uvs
+    """
+    arrays: Dict[str, Any] = {"vertices": mesh.vertices, "faces": mesh.faces}
+    if mesh.normals is not None:
+        arrays["normals"] = mesh.normals
+    if mesh.uvs is not None:
+        arrays["uvs"] = mesh.uvs
+    save(file, arrays, **kwargs)
+
+
+def load_mesh(file: PathOrFile, workers: Optional[int] = None) -> Mesh:
+    """Read a mesh written by save_mesh().
+
+    :param file: A path or a seekable binary file object
+    :param workers: The number of threads decoding chunks
+    :returns: The mesh
+    """
+    with Archive(file, workers) as archive:
+        return Mesh(
+            vertices=archive.read("vertices"),
+            faces=archive.read("faces"),
+            normals=archive.read("normals") if "normals" in archive.names else None,
+            uvs=archive.read("uvs") if "uvs" in archive.names else None,
+        )
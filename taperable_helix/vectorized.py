@@ -0,0 +1,475 @@
+"""NumPy evaluation of a Helix over arrays of t.
+
+These functions compute the same points as the function returned by
+Helix.helix() but for a whole array of t values at once. They also
+provide the analytic derivatives with respect to t which are used by
+the closest point, slicing and fitting code.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from math import pi
+from time import perf_counter
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from . import instrumentation as _instrumentation
+from .helix import Helix, HelixLocation, _Geometry
+from .recurrence import _anchor_every
+
+
+def _taper(g: _Geometry, t: np.ndarray) -> np.ndarray:
+    """Return the zone of each t, -1 taper out, 0 no taper and 1 taper in.
+
+    The comparisons are identical to those in the function returned
+    by Helix.helix() so both agree on which zone a t belongs to.
+    """
+    zone: np.ndarray = np.zeros(t.shape, dtype=np.int8)
+    zone[t > g.taper_in_starts] = 1
+    zone[t < g.taper_out_ends] = -1
+    return zone
+
+
+def _taper_angle(g: _Geometry, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the taper_angle of each t and its derivative, d(taper_angle)/dt."""
+    zone: np.ndarray = _taper(g, t)
+    out: np.ndarray = zone < 0
+    tin: np.ndarray = zone > 0
+    taper_angle: np.ndarray = np.full(t.shape, pi / 2)
+    dtaper_angle: np.ndarray = np.zeros(t.shape)
+    if out.any():
+        taper_angle[out] = pi / 2 * (t[out] - g.first_t) / g.taper_out_range
+        dtaper_angle[out] = pi / 2 / g.taper_out_range
+    if tin.any():
+        taper_angle[tin] = pi / 2 * (g.last_t - t[tin]) / g.taper_in_range
+        dtaper_angle[tin] = -pi / 2 / g.taper_in_range
+    return taper_angle, dtaper_angle
+
+
+def _evaluate(g: _Geometry, t: np.ndarray, order: int = 0) -> List[np.ndarray]:
+    """Evaluate the helix and optionally its derivatives.
+
+    :param g: The geometry returned by Helix._geometry()
+    :param t: A one dimensional float64 array of t values
+    :param order: 0 returns the points, 1 also the first derivatives
+                  and 2 also the second derivatives.
+    :returns: A list of order + 1 arrays each of shape (len(t), 3)
+    """
+    taper_angle, dtaper_angle = _taper_angle(g, t)
+    taper_scale: np.ndarray = np.sin(taper_angle)
+    rel_height: np.ndarray = (
+        (t - g.first_t) / g.t_range if g.t_range != 0 else np.zeros(t.shape)
+    )
+
+    r: np.ndarray = g.radius + (g.horz_offset * taper_scale)
+    a: np.ndarray = (2 * pi / g.turns) * rel_height
+    sin_a: np.ndarray = np.sin(-a)
+    cos_a: np.ndarray = np.cos(a)
+
+    points: np.ndarray = np.empty((t.shape[0], 3))
+    points[:, 0] = r * sin_a
+    points[:, 1] = r * cos_a
+    points[:, 2] = (
+        (g.helix_height * (rel_height if g.pitch != 0 else 1))
+        + (g.vert_offset * taper_scale)
+        + g.inset_offset
+    )
+    result: List[np.ndarray] = [points]
+    if order < 1:
+        return result
+
+    # sin_a is sin(-a) so -sin_a is sin(a)
+    drel: float = 1 / g.t_range if g.t_range != 0 else 0
+    da: float = (2 * pi / g.turns) * drel
+    dz: float = g.helix_height * drel if g.pitch != 0 else 0
+    cos_ta: np.ndarray = np.cos(taper_angle)
+    dts: np.ndarray = cos_ta * dtaper_angle
+    dr: np.ndarray = g.horz_offset * dts
+
+    d1: np.ndarray = np.empty_like(points)
+    d1[:, 0] = dr * sin_a - r * cos_a * da
+    d1[:, 1] = dr * cos_a + r * sin_a * da
+    d1[:, 2] = dz + g.vert_offset * dts
+    result.append(d1)
+    if order < 2:
+        return result
+
+    d2ts: np.ndarray = -taper_scale * dtaper_angle * dtaper_angle
+    d2r: np.ndarray = g.horz_offset * d2ts
+
+    d2: np.ndarray = np.empty_like(points)
+    d2[:, 0] = d2r * sin_a - 2 * dr * cos_a * da - r * sin_a * da * da
+    d2[:, 1] = d2r * cos_a + 2 * dr * sin_a * da - r * cos_a * da * da
+    d2[:, 2] = g.vert_offset * d2ts
+    result.append(d2)
+    return result
+
+
+class Scratch:
+    """Reusable storage for the intermediate arrays of helix_points().
+
+    Passing the same Scratch, and an out buffer, to every call of
+    helix_points() means regenerating a helix allocates no arrays. It
+    grows to the largest number of points it has been used for. A
+    Scratch must not be used by two threads at once.
+
+    :param size: The number of points to allocate storage for up front
+    """
+
+    def __init__(self, size: int = 0):
+        self.size: int = 0
+        """The number of points there is storage for"""
+
+        self._reserve(size)
+
+    def _reserve(self, size: int) -> None:
+        """Make sure there is storage for size points."""
+        if size <= self.size:
+            return
+        self.size = size
+        self.rel: np.ndarray = np.empty(size)
+        self.angle: np.ndarray = np.empty(size)
+        self.scale: np.ndarray = np.empty(size)
+        self.r: np.ndarray = np.empty(size)
+        self.a: np.ndarray = np.empty(size)
+        self.tmp: np.ndarray = np.empty(size)
+        self.mask: np.ndarray = np.empty(size, dtype=bool)
+
+
+def _evaluate_into(g: _Geometry, t: np.ndarray, out: np.ndarray, s: Scratch) -> None:
+    """Evaluate the points of the helix into out using only s for the
+    intermediate values, the results are identical to _evaluate()."""
+    n: int = len(t)
+    s._reserve(n)
+    rel: np.ndarray = s.rel[:n]
+    angle: np.ndarray = s.angle[:n]
+    scale: np.ndarray = s.scale[:n]
+    r: np.ndarray = s.r[:n]
+    a: np.ndarray = s.a[:n]
+    tmp: np.ndarray = s.tmp[:n]
+    mask: np.ndarray = s.mask[:n]
+
+    # The taper_angle, as _taper() the out zone takes precedence
+    angle.fill(pi / 2)
+    np.greater(t, g.taper_in_starts, out=mask)
+    np.subtract(g.last_t, t, out=angle, where=mask)
+    np.multiply(pi / 2, angle, out=angle, where=mask)
+    np.divide(angle, g.taper_in_range, out=angle, where=mask)
+    np.less(t, g.taper_out_ends, out=mask)
+    np.subtract(t, g.first_t, out=angle, where=mask)
+    np.multiply(pi / 2, angle, out=angle, where=mask)
+    np.divide(angle, g.taper_out_range, out=angle, where=mask)
+    np.sin(angle, out=scale)
+
+    if g.t_range != 0:
+        np.subtract(t, g.first_t, out=rel)
+        np.divide(rel, g.t_range, out=rel)
+    else:
+        rel.fill(0)
+
+    np.multiply(g.horz_offset, scale, out=r)
+    np.add(g.radius, r, out=r)
+    np.multiply(2 * pi / g.turns, rel, out=a)
+
+    np.negative(a, out=tmp)
+    np.sin(tmp, out=tmp)
+    np.multiply(r, tmp, out=out[:, 0])
+    np.cos(a, out=tmp)
+    np.multiply(r, tmp, out=out[:, 1])
+
+    z: np.ndarray = out[:, 2]
+    if g.pitch != 0:
+        np.multiply(g.helix_height, rel, out=z)
+    else:
+        z.fill(g.helix_height)
+    np.multiply(g.vert_offset, scale, out=tmp)
+    np.add(z, tmp, out=z)
+    np.add(z, g.inset_offset, out=z)
+
+
+def _out_array(out: Any, n: int) -> np.ndarray:
+    """Return out, any writable buffer of 3 * n float64, as an (n, 3) array."""
+    arr: np.ndarray = (
+        out if isinstance(out, np.ndarray) else np.asarray(memoryview(out))
+    )
+    if arr.dtype != np.float64:
+        raise ValueError(f"out dtype:{arr.dtype} should be float64")
+    if not arr.flags.writeable:
+        raise ValueError("out should be writable")
+    if arr.shape != (n, 3):
+        if arr.size != 3 * n or not arr.flags.c_contiguous:
+            raise ValueError(
+                f"out shape:{arr.shape} should be ({n}, 3) or contiguous {3 * n} values"
+            )
+        arr = arr.reshape(n, 3)
+    return arr
+
+
+def helix_points(
+    helix: Helix,
+    t: np.ndarray,
+    hl: Optional[HelixLocation] = None,
+    out: Optional[Any] = None,
+    scratch: Optional[Scratch] = None,
+) -> np.ndarray:
+    """Return the points on the helix for every value in t.
+
+    When out and scratch are both passed and t is a float64 array no
+    arrays are allocated.
+
+    :param helix: The helix to evaluate
+    :param t: Array like of t values between first_t and last_t inclusive
+    :param hl: Defines a refinded location when the helix is tapered
+    :param out: Optional writable buffer the points are written to, an
+                object supporting the buffer protocol of float64 with shape
+                (len(t), 3) or 3 * len(t) contiguous values
+    :param scratch: Optional storage for the intermediate values, reused
+                    between calls
+    :returns: A float64 array of shape (len(t), 3) of (x, y, z) points,
+              a view of out if it was passed
+    """
+    instrumented: bool = _instrumentation.enabled
+    start: float = perf_counter() if instrumented else 0
+    ta: np.ndarray = np.asarray(t, dtype=np.float64).reshape(-1)
+    points: np.ndarray
+    if out is None and scratch is None:
+        points = _evaluate(helix._geometry(hl), ta)[0]
+    else:
+        points = _out_array(out, len(ta)) if out is not None else np.empty((len(ta), 3))
+        _evaluate_into(
+            helix._geometry(hl),
+            ta,
+            points,
+            scratch if scratch is not None else Scratch(),
+        )
+    if instrumented:
+        _instrumentation.count("points.batch", len(ta))
+        _instrumentation.add_time("batch", perf_counter() - start)
+    return points
+
+
+def helix_derivatives(
+    helix: Helix, t: np.ndarray, hl: Optional[HelixLocation] = None, order: int = 1
+) -> List[np.ndarray]:
+    """Return the points on the helix and their derivatives with respect to t.
+
+    :param helix: The helix to evaluate
+    :param t: Array like of t values between first_t and last_t inclusive
+    :param hl: Defines a refinded location when the helix is tapered
+    :param order: The highest derivative returned, 1 or 2
+    :returns: A list [points, d/dt, d2/dt2] truncated to order + 1 entries,
+              each a float64 array of shape (len(t), 3)
+    """
+    if order < 1 or order > 2:
+        raise ValueError(f"order:{order} should be 1 or 2")
+    ta: np.ndarray = np.asarray(t, dtype=np.float64).reshape(-1)
+    return _evaluate(helix._geometry(hl), ta, order)
+
+
+def _chunk_t(g: _Geometry, num_points: int, first: int, n: int) -> np.ndarray:
+    """Return the n t values from index first of num_points evenly spaced
+    from first_t to last_t inclusive, equal to np.linspace()[first:first + n].
+    """
+    step: float = (g.last_t - g.first_t) / (num_points - 1) if num_points > 1 else 0
+    t: np.ndarray = g.first_t + step * np.arange(first, first + n, dtype=np.float64)
+    if n > 0 and first + n == num_points:
+        # Exactly last_t as linspace does
+        t[-1] = g.last_t
+    return t
+
+
+def _chunk_ts(g: _Geometry, num_points: int, chunk_size: int) -> Iterator[np.ndarray]:
+    """Generate the t values of num_points evenly spaced from first_t to
+    last_t inclusive in arrays of at most chunk_size.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size:{chunk_size} should be >= 1")
+    for first in range(0, num_points, chunk_size):
+        yield _chunk_t(g, num_points, first, min(chunk_size, num_points - first))
+
+
+def _evaluate_uniform(g: _Geometry, num_points: int, first: int, n: int) -> np.ndarray:
+    """Return the n points from index first of num_points evenly spaced
+    from first_t to last_t inclusive, see taperable_helix.recurrence.
+
+    The angle of the points in each block of _anchor_every is the angle of
+    its first point plus a multiple of the step, so (cos, sin) are
+    computed with the angle addition formulas from one table of the
+    anchors and one of the offsets. Points in the taper zones are
+    evaluated directly.
+    """
+    t: np.ndarray = _chunk_t(g, num_points, first, n)
+    rel: np.ndarray = (t - g.first_t) / g.t_range if g.t_range != 0 else np.zeros(n)
+    k: float = 2 * pi / g.turns
+    step: float = (g.last_t - g.first_t) / (num_points - 1) if num_points > 1 else 0
+    da: float = k * step / g.t_range if g.t_range != 0 else 0
+
+    anchors: np.ndarray = k * rel[::_anchor_every]
+    offsets: np.ndarray = da * np.arange(min(n, _anchor_every))
+    cos_a: np.ndarray = np.cos(anchors)[:, None]
+    sin_a: np.ndarray = np.sin(anchors)[:, None]
+    cos_o: np.ndarray = np.cos(offsets)
+    sin_o: np.ndarray = np.sin(offsets)
+    r: float = g.radius + g.horz_offset
+    points: np.ndarray = np.empty((n, 3))
+    points[:, 0] = (-r * (sin_a * cos_o + cos_a * sin_o)).reshape(-1)[:n]
+    points[:, 1] = (r * (cos_a * cos_o - sin_a * sin_o)).reshape(-1)[:n]
+    points[:, 2] = (
+        (g.helix_height * rel if g.pitch != 0 else g.helix_height)
+        + g.vert_offset
+        + g.inset_offset
+    )
+
+    # There are only taper zones, the first lo and the last n - hi points,
+    # when t increases
+    if g.t_range > 0:
+        lo: int = int(np.searchsorted(t, g.taper_out_ends, "left"))
+        hi: int = max(lo, int(np.searchsorted(t, g.taper_in_starts, "right")))
+        if lo > 0:
+            points[:lo] = _evaluate(g, t[:lo])[0]
+        if hi < n:
+            points[hi:] = _evaluate(g, t[hi:])[0]
+    return points
+
+
+def helix_chunks(
+    helix: Helix,
+    num_points: int,
+    hl: Optional[HelixLocation] = None,
+    chunk_size: int = 65536,
+    recurrence: bool = False,
+) -> Iterator[np.ndarray]:
+    """Generate num_points evenly spaced from first_t to last_t inclusive
+    in chunks, so very large helixes can be streamed in bounded memory.
+
+    :param helix: The helix to evaluate
+    :param num_points: The total number of points
+    :param hl: Defines a refinded location when the helix is tapered
+    :param chunk_size: The maximum number of points in each chunk
+    :param recurrence: If True (cos(a), sin(a)) of the untapered body are
+                       computed with few calls of cos and sin, see
+                       taperable_helix.recurrence. It's faster and the
+                       points differ by up to about 2 * r * a * 2.2e-16,
+                       r the radius and a the angle of all the turns
+    :returns: An iterator of float64 arrays of shape (n, 3), n <= chunk_size
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size:{chunk_size} should be >= 1")
+    g: _Geometry = helix._geometry(hl)
+    for first in range(0, num_points, chunk_size):
+        n: int = min(chunk_size, num_points - first)
+        instrumented: bool = _instrumentation.enabled
+        start: float = perf_counter() if instrumented else 0
+        points: np.ndarray = (
+            _evaluate_uniform(g, num_points, first, n)
+            if recurrence
+            else _evaluate(g, _chunk_t(g, num_points, first, n))[0]
+        )
+        if instrumented:
+            _instrumentation.count("points.streaming", n)
+            _instrumentation.add_time("streaming", perf_counter() - start)
+        yield points
+
+
+def helix_xyz(
+    helix: Helix,
+    num_points: int,
+    hl: Optional[HelixLocation] = None,
+    chunk_size: int = 65536,
+    recurrence: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return num_points evenly spaced from first_t to last_t inclusive
+    as separate contiguous x, y and z arrays, the columnar layout plotting
+    libraries take.
+
+    :param helix: The helix to evaluate
+    :param num_points: The number of points
+    :param hl: Defines a refinded location when the helix is tapered
+    :param chunk_size: The number of points evaluated at a time
+    :param recurrence: See helix_chunks()
+    :returns: (x, y, z) float64 arrays of shape (num_points,), the points
+              are identical to those of helix_chunks()
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size:{chunk_size} should be >= 1")
+    g: _Geometry = helix._geometry(hl)
+    columns: np.ndarray = np.empty((3, num_points))
+    # An (N, 3) view whose columns are the contiguous rows of columns
+    points: np.ndarray = columns.T
+    scratch: Scratch = Scratch()
+    for first in range(0, num_points, chunk_size):
+        n: int = min(chunk_size, num_points - first)
+        if recurrence:
+            points[first : first + n] = _evaluate_uniform(g, num_points, first, n)
+        else:
+            _evaluate_into(
+                g, _chunk_t(g, num_points, first, n), points[first : first + n], scratch
+            )
+    return columns[0], columns[1], columns[2]
+
+
+def parallel_points(
+    helix: Helix,
+    num_points: int,
+    hl: Optional[HelixLocation] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 65536,
+    out: Optional[Any] = None,
+) -> np.ndarray:
+    """Return num_points evenly spaced from first_t to last_t inclusive,
+    generated by a pool of threads.
+
+    The points are split into chunks which the threads evaluate into
+    disjoint slices of one array. NumPy releases the GIL while it computes
+    so the threads run in parallel. Each thread reuses one Scratch so the
+    only allocation is the result. The points are identical to those of
+    helix_chunks().
+
+    :param helix: The helix to evaluate
+    :param num_points: The number of points
+    :param hl: Defines a refinded location when the helix is tapered
+    :param workers: The number of threads, default os.cpu_count(), 1 uses
+                    the calling thread
+    :param chunk_size: The number of points evaluated at a time by a thread
+    :param out: Optional writable buffer the points are written to, as
+                helix_points()
+    :returns: A float64 array of shape (num_points, 3), a view of out if it
+              was passed
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size:{chunk_size} should be >= 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers:{workers} should be >= 1")
+    instrumented: bool = _instrumentation.enabled
+    start: float = perf_counter() if instrumented else 0
+    g: _Geometry = helix._geometry(hl)
+    points: np.ndarray = (
+        _out_array(out, num_points) if out is not None else np.empty((num_points, 3))
+    )
+    firsts: range = range(0, num_points, chunk_size)
+    local: threading.local = threading.local()
+
+    def evaluate(first: int) -> None:
+        scratch: Optional[Scratch] = getattr(local, "scratch", None)
+        if scratch is None:
+            scratch = local.scratch = Scratch(chunk_size)
+        n: int = min(chunk_size, num_points - first)
+        _evaluate_into(
+            g, _chunk_t(g, num_points, first, n), points[first : first + n], scratch
+        )
+
+    if workers == 1 or len(firsts) < 2:
+        for first in firsts:
+            evaluate(first)
+    else:
+        with ThreadPoolExecutor(min(workers, len(firsts))) as pool:
+            # list() to raise the first exception of a worker
+            list(pool.map(evaluate, firsts))
+    if instrumented:
+        _instrumentation.count("points.parallel", num_points)
+        _instrumentation.add_time("parallel", perf_counter() - start)
+    return points
@@ -0,0 +1,181 @@
+"""View helixes interactively with plotly, requires plotly and NumPy.
+
+plotly draws Scatter3d traces with WebGL, what makes large traces slow is
+building lists of coordinates and sending every point to the browser.
+Here the coordinates are columnar NumPy arrays, which plotly serializes as
+typed arrays, and the points are decimated to a chord tolerance of a
+pixel: the points dropped are within a pixel of the line drawn however the
+view is rotated, and the number kept depends on the shape of the thread
+not the number of points, so a full resolution thread can be inspected::
+
+    from taperable_helix.viewer import view
+
+    view(helix, locations, num_points=10_000_000).show()
+"""
+
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+import plotly.graph_objects as go
+
+from .helix import Helix, HelixLocation
+from .vectorized import helix_xyz
+
+
+def _extent(columns: Sequence[np.ndarray]) -> float:
+    """Return the largest dimension of the bounding box of columns."""
+    if not len(columns) or not len(columns[0]):
+        return 0
+    return float(max(np.ptp(c) for c in columns))
+
+
+def _deviations(points: np.ndarray, keep: np.ndarray) -> np.ndarray:
+    """Return the distance of each point from the segment of the polyline
+    through points[keep] which spans it."""
+    i: np.ndarray = np.arange(len(points))
+    seg: np.ndarray = np.clip(
+        np.searchsorted(keep, i, side="right") - 1, 0, len(keep) - 2
+    )
+    a: np.ndarray = points[keep[seg]]
+    d: np.ndarray = points[keep[seg + 1]] - a
+    length2: np.ndarray = np.einsum("ij,ij->i", d, d)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u: np.ndarray = np.where(
+            length2 > 0, np.einsum("ij,ij->i", points - a, d) / length2, 0
+        )
+    nearest: np.ndarray = a + np.clip(u, 0, 1)[:, None] * d
+    return np.linalg.norm(points - nearest, axis=1)
+
+
+def decimate(
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    pixels: int = 2000,
+    extent: Optional[float] = None,
+) -> np.ndarray:
+    """Return the indices of the points of a polyline to draw.
+
+    The points dropped are within extent / pixels, a pixel when the extent
+    fills the view, of the drawn line in 3D, so they're within a pixel of
+    it in any orthographic view. The number of points kept depends on the
+    curvature of the line not on how finely it's sampled, about
+    length * sqrt(curvature / (8 * extent / pixels)) points. The first and
+    last points are always kept.
+
+    :param x: The x coordinates
+    :param y: The y coordinates
+    :param z: The z coordinates
+    :param pixels: The number of pixels across the extent
+    :param extent: The size which is pixels across, default the largest
+                   dimension of the bounding box of the points. Pass the same
+                   extent for the wires of one figure
+    :returns: The ascending indices of the points to keep
+    """
+    if pixels < 1:
+        raise ValueError(f"pixels:{pixels} should be >= 1")
+    columns: List[np.ndarray] = [np.asarray(c, dtype=np.float64) for c in (x, y, z)]
+    n: int = len(columns[0])
+    if extent is None:
+        extent = _extent(columns)
+    if n < 3 or extent <= 0:
+        return np.arange(n)
+    tol: float = extent / pixels
+    points: np.ndarray = np.column_stack(columns)
+
+    # A chord of length L across an arc of curvature k deviates by about
+    # k * L**2 / 8 from it, with k about the turning angle over the step
+    # ds, so each step needs sqrt(angle * ds / (8 * tol)) chords
+    d: np.ndarray = np.diff(points, axis=0)
+    ds: np.ndarray = np.linalg.norm(d, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos: np.ndarray = np.einsum("ij,ij->i", d[:-1], d[1:]) / (ds[:-1] * ds[1:])
+    angle: np.ndarray = np.arccos(np.clip(np.nan_to_num(cos, nan=1.0), -1, 1))
+    chords: np.ndarray = np.cumsum(
+        np.sqrt(np.concatenate([[0], angle]) * ds / (8 * tol))
+    )
+    keep: np.ndarray = np.zeros(n, dtype=bool)
+    keep[1:-1] = np.floor(chords[1:]) != np.floor(chords[:-1])
+    keep[0] = keep[-1] = True
+
+    # Split the spans which still deviate too far at their worst point
+    while True:
+        kept: np.ndarray = np.flatnonzero(keep)
+        deviation: np.ndarray = _deviations(points, kept)
+        worst: np.ndarray = np.maximum.reduceat(deviation, kept[:-1])
+        span: np.ndarray = np.clip(
+            np.searchsorted(kept, np.arange(n), side="right") - 1, 0, len(kept) - 2
+        )
+        split: np.ndarray = (worst[span] > tol) & (deviation == worst[span])
+        if not split.any():
+            return kept
+        keep |= split
+
+
+def wire_trace(
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    pixels: int = 2000,
+    extent: Optional[float] = None,
+    **kwargs: Any,
+) -> go.Scatter3d:
+    """Return a decimated Scatter3d line of a wire.
+
+    :param x: The x coordinates
+    :param y: The y coordinates
+    :param z: The z coordinates
+    :param pixels: See decimate()
+    :param extent: See decimate()
+    :param kwargs: Passed to go.Scatter3d, for instance name
+    :returns: The trace
+    """
+    keep: np.ndarray = decimate(x, y, z, pixels, extent)
+    return go.Scatter3d(
+        x=np.asarray(x)[keep],
+        y=np.asarray(y)[keep],
+        z=np.asarray(z)[keep],
+        mode="lines",
+        **kwargs,
+    )
+
+
+def view(
+    helix: Helix,
+    locations: Optional[Sequence[HelixLocation]] = None,
+    num_points: int = 100000,
+    pixels: int = 2000,
+    names: Optional[Sequence[str]] = None,
+    fig: Optional[go.Figure] = None,
+) -> go.Figure:
+    """Return a figure with a decimated trace of each wire of a helix.
+
+    :param helix: The helix of every wire
+    :param locations: The HelixLocation of each wire, default one wire at
+                      the helix radius
+    :param num_points: The number of points generated for each wire
+    :param pixels: See decimate()
+    :param names: The trace name of each wire
+    :param fig: Add the traces to this figure, default a new figure with
+                an orthographic camera
+    :returns: The figure
+    """
+    hls: Sequence[Optional[HelixLocation]] = (
+        locations if locations is not None else [None]
+    )
+    if names is not None and len(names) != len(hls):
+        raise ValueError(f"len(names):{len(names)} should be {len(hls)}")
+    wires = [helix_xyz(helix, num_points, hl) for hl in hls]
+    extent: float = _extent([np.concatenate(c) for c in zip(*wires)])
+    if fig is None:
+        fig = go.Figure(
+            layout_scene_camera_projection_type="orthographic",
+            layout_scene_aspectmode="data",
+        )
+    for i, (x, y, z) in enumerate(wires):
+        fig.add_trace(
+            wire_trace(
+                x, y, z, pixels, extent, name=names[i] if names is not None else None
+            )
+        )
+    return fig
@@ -0,0 +1,182 @@
+import ast
+from math import isclose
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from numpy import arange, linspace
+
+from taperable_helix import Helix, HelixLocation, backends
+from taperable_helix.backends import Backend
+
+# Data directory string
+data_dir_str = "tests/data/"
+
+# The Helix, HelixLocation and t increment of each golden data file
+# written by tests/test_taperable_helix.py
+golden: Dict[str, Tuple[Dict[str, float], Dict[str, float], float]] = {
+    "test_helix": (dict(radius=1, pitch=1, height=1), {}, 0.1),
+    "test_helix_backwards": (dict(radius=1, pitch=1, height=1), {}, 0.1),
+    "test_helix_torp_0pt1_tirp_0pt9_ho_0pt2": (
+        dict(radius=1, pitch=1, height=1, taper_out_rpos=0.1, taper_in_rpos=0.9),
+        dict(horz_offset=0.2),
+        0.05,
+    ),
+    "test_pitch_0_height_0": (dict(radius=1, pitch=0, height=0), {}, 0.1),
+    "test_pitch_0_height_1": (dict(radius=1, pitch=0, height=1), {}, 0.1),
+    "test_pitch_0_ho_1": (
+        dict(radius=1, pitch=0, height=0),
+        dict(horz_offset=1),
+        0.1,
+    ),
+    "test_pitch_0_vo_1": (dict(radius=1, pitch=0, height=0), dict(vert_offset=1), 0.1),
+    "test_radius_0": (dict(radius=0, pitch=1, height=1), {}, 0.1),
+    "test_radius_0_ft_0_lt_0": (
+        dict(radius=0, pitch=1, height=1, first_t=0, last_t=0),
+        {},
+        0.1,
+    ),
+    "test_radius_0_ft_0_lt_0_io_neg_0pt1": (
+        dict(radius=0, pitch=1, height=1, inset_offset=-0.1, first_t=0, last_t=0),
+        {},
+        0.1,
+    ),
+    "test_radius_0_ft_0_lt_neg_1": (
+        dict(radius=0, pitch=1, height=1, first_t=0, last_t=-1),
+        {},
+        -0.1,
+    ),
+    "test_radius_0_ft_neg_1_lt_neg_2": (
+        dict(radius=0, pitch=1, height=1, first_t=-1, last_t=-2),
+        {},
+        -0.1,
+    ),
+    "test_radius_0_ft_neg_1_lt_pos_1": (
+        dict(radius=0, pitch=1, height=1, first_t=-1, last_t=1),
+        {},
+        0.1,
+    ),
+    "test_radius_0_ft_neg_2_lt_neg_1": (
+        dict(radius=0, pitch=1, height=1, first_t=-2, last_t=-1),
+        {},
+        0.1,
+    ),
+    "test_radius_0_ft_pos_0_lt_neg_1_height_neg_1": (
+        dict(radius=0, pitch=1, height=-1, first_t=0, last_t=-1),
+        {},
+        -0.1,
+    ),
+    "test_radius_0_height_0": (dict(radius=0, pitch=1, height=0), {}, 0.1),
+    "test_radius_0_height_neg_1": (dict(radius=0, pitch=1, height=-1), {}, 0.1),
+    "test_radius_0_io_0pt1": (
+        dict(radius=0, pitch=1, height=1, inset_offset=0.1),
+        {},
+        0.1,
+    ),
+}
+
+# All registered, not only available, so a missing backend shows as skipped
+all_backends: List[str] = ["numba", "numpy", "python"]
+
+
+def require(name: str) -> None:
+    if name not in backends.backends():
+        pytest.skip(f"backend {name} is not available")
+
+
+def read_points(fname: str) -> List[Tuple[float, float, float]]:
+    with open(fname + ".txt", "r") as f:
+        return [ast.literal_eval(line) for line in f]
+
+
+def test_golden_cover_data_files():
+    import os
+
+    names = {f[:-4] for f in os.listdir(data_dir_str) if f.endswith(".txt")}
+    assert names == set(golden)
+
+
+@pytest.mark.parametrize("name", all_backends)
+@pytest.mark.parametrize("case", sorted(golden))
+def test_golden(name: str, case: str):
+    require(name)
+    helix_kwargs, hl_kwargs, inc = golden[case]
+    h = Helix(**helix_kwargs)
+    t = list(arange(h.first_t, h.last_t, inc)) + [h.last_t]
+    points = h.points(t, HelixLocation(**hl_kwargs), backend=name)
+    expected = read_points(data_dir_str + case)
+    assert len(points) == len(expected)
+    for p, e in zip(points, expected):
+        assert all(isclose(a, b, rel_tol=1e-9, abs_tol=1e-6) for a, b in zip(p, e))
+
+
+@pytest.mark.parametrize("name", all_backends)
+def test_agrees_with_reference(name: str):
+    require(name)
+    h = Helix(
+        radius=2,
+        pitch=0.3,
+        height=1.5,
+        taper_out_rpos=0.2,
+        taper_in_rpos=0.7,
+        inset_offset=0.05,
+        first_t=-1,
+        last_t=2,
+    )
+    hl = HelixLocation(radius=1.5, horz_offset=0.1, vert_offset=-0.05)
+    t = linspace(h.first_t, h.last_t, 1001)
+    reference = h.points(t, hl, backend="python")
+    points = h.points(t, hl, backend=name)
+    assert len(points) == len(reference)
+    for p, r in zip(points, reference):
+        assert all(isclose(a, b, rel_tol=0, abs_tol=1e-12) for a, b in zip(p, r))
+
+
+def test_default_is_highest_priority_available():
+    available = backends.backends()
+    assert available[-1] == "python"
+    assert backends.get_backend().name == available[0]
+    assert "numpy" in available  # Installed for the test suite
+
+
+def test_python_does_not_modify_location():
+    hl = HelixLocation(horz_offset=0.1)
+    Helix(radius=1, pitch=1, height=1).points([0, 0.5, 1], hl, backend="python")
+    assert hl.radius is None
+
+
+def test_register_and_default():
+    calls: List[Any] = []
+
+    def points(helix: Helix, t: Any, hl: Any) -> Any:
+        calls.append((helix, t, hl))
+        return []
+
+    h = Helix(radius=1, pitch=1, height=1)
+    backends.register(Backend("test", -1, lambda: True, points))
+    try:
+        with pytest.raises(ValueError):
+            backends.register(Backend("test", -1, lambda: True, points))
+        assert backends.backends()[-1] == "test"
+        assert h.points([0.5], backend="test") == []
+        assert calls == [(h, [0.5], None)]
+
+        backends.set_default("test")
+        h.points([0.25])
+        assert len(calls) == 2
+    finally:
+        backends.unregister("test")
+    assert backends.get_backend().name == backends.backends()[0]
+
+
+def test_unknown_and_unavailable():
+    backends.register(Backend("missing", 100, lambda: False, lambda h, t, hl: []))
+    try:
+        assert "missing" not in backends.backends()
+        with pytest.raises(ValueError, match="not available"):
+            backends.get_backend("missing")
+        with pytest.raises(ValueError, match="not available"):
+            backends.set_default("missing")
+    finally:
+        backends.unregister("missing")
+    with pytest.raises(ValueError, match="should be one of"):
+        Helix(radius=1, pitch=1, height=1).points([0], backend="nope")
@@ -0,0 +1,96 @@
+from typing import List, Optional
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.batch import HelixColumns, batch_points, validate
+from taperable_helix.vectorized import helix_points
+
+helixes: List[Helix] = [
+    Helix(radius=1, pitch=1, height=1),
+    Helix(radius=1, pitch=1, height=1, first_t=1, last_t=0),
+    Helix(radius=1, pitch=1, height=1, taper_out_rpos=0.1, taper_in_rpos=0.9),
+    Helix(radius=2, pitch=0.5, height=3, taper_out_rpos=0.5, taper_in_rpos=0.5),
+    Helix(radius=1, pitch=0, height=0),
+    Helix(radius=1, pitch=0, height=1),
+    Helix(radius=0, pitch=1, height=1, first_t=0, last_t=0),
+    Helix(radius=0, pitch=1, height=1, inset_offset=-0.1, first_t=-1, last_t=-2),
+    Helix(radius=1, pitch=0.2, height=1, inset_offset=0.1, first_t=-1, last_t=1),
+    Helix(radius=1, pitch=0.5, height=1, inset_offset=0.5),
+]
+locations: List[Optional[HelixLocation]] = [
+    None,
+    HelixLocation(horz_offset=0.2),
+    HelixLocation(horz_offset=0.2, vert_offset=0.1),
+    HelixLocation(radius=1.5, horz_offset=-0.3),
+    HelixLocation(horz_offset=1),
+    HelixLocation(vert_offset=1),
+    None,
+    HelixLocation(vert_offset=-0.1),
+    HelixLocation(radius=0.5),
+    None,
+]
+
+
+def test_batch_points():
+    u = np.linspace(0, 1, 101)
+    result = batch_points(u, HelixColumns.from_helixes(helixes, locations))
+    assert result.points.shape == (len(helixes), len(u), 3)
+    assert result.valid.all()
+    assert result.errors == {}
+    for i, (h, hl) in enumerate(zip(helixes, locations)):
+        t = np.linspace(h.first_t, h.last_t, len(u))
+        np.testing.assert_array_equal(result.points[i], helix_points(h, t, hl))
+
+
+def test_batch_points_scalars():
+    radius = np.array([1, 2, 3])
+    u = np.linspace(0, 1, 11)
+    result = batch_points(u, HelixColumns(radius=radius, pitch=0.5, height=1))
+    for i, r in enumerate(radius):
+        h = Helix(radius=float(r), pitch=0.5, height=1)
+        np.testing.assert_array_equal(result.points[i], helix_points(h, u))
+
+
+def test_batch_points_errors():
+    columns = HelixColumns(
+        radius=[1, 1, 1, np.nan, 1],
+        pitch=1,
+        height=1,
+        taper_out_rpos=[0, 0.6, -0.1, 0, 0],
+        taper_in_rpos=[1, 0.4, 1, 1, 1.5],
+    )
+    result = batch_points(np.linspace(0, 1, 5), columns)
+    assert result.valid.tolist() == [True, False, False, False, False]
+    assert result.errors == {
+        1: ["taper_out_rpos:0.6 > taper_in_rpos:0.4"],
+        2: ["taper_out_rpos:-0.1 should be >= 0 and <= 1"],
+        3: ["radius:nan should be finite"],
+        4: ["taper_in_rpos:1.5 should be >= 0 and <= 1"],
+    }
+    assert validate(columns) == result.errors
+    assert np.isnan(result.points[1:]).all()
+    assert np.isfinite(result.points[0]).all()
+
+    # The messages are those Helix raises
+    with pytest.raises(ValueError, match=result.errors[1][0]):
+        Helix(
+            radius=1, pitch=1, height=1, taper_out_rpos=0.6, taper_in_rpos=0.4
+        ).helix()
+
+
+def test_batch_points_shapes():
+    with pytest.raises(ValueError):
+        HelixColumns(radius=[1, 2], pitch=[1, 2, 3], height=1)
+    with pytest.raises(ValueError):
+        HelixColumns(radius=1, pitch=1, height=1)
+    with pytest.raises(ValueError):
+        batch_points(np.zeros((2, 2)), HelixColumns(radius=[1], pitch=1, height=1))
+    with pytest.raises(ValueError):
+        HelixColumns.from_helixes(helixes, locations[:2])
+
+    result = batch_points([], HelixColumns(radius=[1, 2], pitch=1, height=1))
+    assert result.points.shape == (2, 0, 3)
+    result = batch_points([0.5], HelixColumns.from_helixes([]))
+    assert result.points.shape == (0, 1, 3)
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix._segments import segment_segment
+from taperable_helix.bvh import HelixBVH
+from taperable_helix.vectorized import helix_points
+
+
+def thread_bvh(num_points: int = 2000, leaf_size: int = 8) -> HelixBVH:
+    h = Helix(radius=1, pitch=0.5, height=3, taper_out_rpos=0.1, taper_in_rpos=0.9)
+    hls = [
+        HelixLocation(vert_offset=0.1),
+        HelixLocation(vert_offset=-0.1),
+        HelixLocation(horz_offset=0.15),
+    ]
+    return HelixBVH.from_helix(h, hls, num_points=num_points, leaf_size=leaf_size)
+
+
+@pytest.mark.parametrize("leaf_size", [1, 3, 8])
+def test_bvh_ray_cast_matches_brute_force(leaf_size: int):
+    bvh = thread_bvh(leaf_size=leaf_size)
+    rng = np.random.default_rng(28)
+    num_rays = 40
+    origins = rng.uniform(-3, 3, (num_rays, 3))
+    targets = rng.uniform(-0.5, 0.5, (num_rays, 3))
+    targets[:, 2] = rng.uniform(0, 3, num_rays)
+    directions = targets - origins
+    tolerance = 0.02
+    hits = bvh.ray_cast(origins, directions, tolerance=tolerance)
+
+    num_segs = len(bvh.p)
+    length = 100.0
+    for i in range(num_rays):
+        o = np.repeat(origins[i : i + 1], num_segs, axis=0)
+        dist, _, u = segment_segment(bvh.p, bvh.q, o, o + directions[i] * length)
+        near = dist <= tolerance
+        assert hits.hit[i] == near.any()
+        if near.any():
+            assert hits.distance[i] == pytest.approx((u * length)[near].min())
+            assert 0 <= hits.wire[i] < 3
+            assert hits.segment[i] >= 0
+        else:
+            assert hits.segment[i] == -1 and np.isnan(hits.t[i])
+
+
+def test_bvh_ray_cast_reports_t():
+    h = Helix(radius=1, pitch=1, height=1)
+    bvh = HelixBVH.from_helix(h, num_points=101)
+
+    # Rays pointing at the z-axis through points on the helix
+    t = np.array([0.13, 0.5, 0.77])
+    pts = helix_points(h, t)
+    origins = pts * np.array([3, 3, 1])
+    hits = bvh.ray_cast(origins, pts - origins, tolerance=1e-3)
+    assert hits.hit.all()
+    assert np.allclose(hits.t, t, atol=1e-3)
+    assert np.allclose(hits.distance, 1, atol=1e-3)
+
+    # Pointing away from the helix
+    assert not bvh.ray_cast(origins, origins - pts).hit.any()
+
+
+def test_bvh_overlap_box_matches_brute_force():
+    bvh = thread_bvh()
+    rng = np.random.default_rng(28)
+    lo = rng.uniform(-1.5, 1.5, (30, 3))
+    lo[:, 2] = rng.uniform(0, 3, 30)
+    hi = lo + 0.2
+    boxes, segs = bvh.overlap_box(lo, hi)
+
+    # Every segment with a sampled point inside the box must be reported
+    # and every reported segment must come within a sample spacing of it.
+    s = np.linspace(0, 1, 101)[:, None, None]
+    pts = bvh.p[None] + (bvh.q - bvh.p)[None] * s
+    spacing = np.linalg.norm(bvh.q - bvh.p, axis=1) / 100
+    for i in range(len(lo)):
+        inside = np.all((pts >= lo[i]) & (pts <= hi[i]), axis=2).any(axis=0)
+        got = segs[boxes == i]
+        assert set(np.nonzero(inside)[0]) <= set(got)
+        outside = np.maximum(np.maximum(lo[i] - pts[:, got], pts[:, got] - hi[i]), 0)
+        dist = np.linalg.norm(outside, axis=2).min(axis=0)
+        assert np.all(dist <= spacing[got] + 1e-12)
+
+
+def test_bvh_empty_queries():
+    bvh = thread_bvh()
+    hits = bvh.ray_cast(np.empty((0, 3)), np.empty((0, 3)))
+    for name in ["hit", "distance", "segment", "wire", "t"]:
+        assert getattr(hits, name).shape == (0,)
+    # The dtypes of hits of a non empty batch
+    some = bvh.ray_cast([[5, 0, 1]], [[-1, 0, 0]])
+    for name in ["hit", "distance", "segment", "wire", "t"]:
+        assert getattr(hits, name).dtype == getattr(some, name).dtype
+
+    boxes, segments = bvh.overlap_box(np.empty((0, 3)), np.empty((0, 3)))
+    some_boxes, some_segments = bvh.overlap_box([[-2, -2, 0]], [[2, 2, 1]])
+    assert boxes.shape == segments.shape == (0,)
+    assert boxes.dtype == some_boxes.dtype and segments.dtype == some_segments.dtype
+
+
+def test_bvh_bounds_contain_helix():
+    h = Helix(radius=2, pitch=1, height=2, taper_out_rpos=0.2, taper_in_rpos=0.8)
+    hl = HelixLocation(horz_offset=0.3, vert_offset=0.2)
+    bvh = HelixBVH.from_helix(h, [hl], num_points=21, leaf_size=1)
+
+    # The actual helix between the samples is inside its leaf
+    t = np.linspace(h.first_t, h.last_t, 2001)
+    pts = helix_points(h, t, hl)
+    leaf = np.minimum((np.arange(len(t)) * 20) // 2000, 19)
+    lo = bvh.lo[bvh.num_leaves + leaf]
+    hi = bvh.hi[bvh.num_leaves + leaf]
+    assert np.all((pts >= lo - 1e-12) & (pts <= hi + 1e-12))
+
+
+def test_bvh_validity():
+    with pytest.raises(ValueError):
+        HelixBVH([])
+    with pytest.raises(ValueError):
+        HelixBVH([np.zeros((1, 3))])
+    with pytest.raises(ValueError):
+        HelixBVH([np.zeros((4, 3))], leaf_size=0)
+    bvh = HelixBVH([np.zeros((4, 3))])
+    with pytest.raises(ValueError):
+        bvh.ray_cast(np.zeros((2, 3)), np.ones((3, 3)))
+    with pytest.raises(ValueError):
+        bvh.overlap_box(np.zeros((2, 3)), np.ones((3, 3)))
@@ -0,0 +1,84 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.clearance import ThreadProfile, clearance
+from taperable_helix.closest import closest_points
+from taperable_helix.vectorized import helix_points
+
+# Default abs_tol
+absolute_tol: float = 1e-6
+
+
+def triangle(h: Helix, height: float, width: float) -> ThreadProfile:
+    locations: List[HelixLocation] = [
+        HelixLocation(vert_offset=height / 2),
+        HelixLocation(vert_offset=-height / 2),
+        HelixLocation(horz_offset=width),
+    ]
+    return ThreadProfile(h, locations)
+
+
+def brute_force(a: ThreadProfile, b: ThreadProfile) -> float:
+    t = np.linspace(b.helix.first_t, b.helix.last_t, 20001)
+    return min(
+        closest_points(a.helix, helix_points(b.helix, t, hlb), hla).distance.min()
+        for hla in a.locations
+        for hlb in b.locations
+    )
+
+
+def test_clearance_bolt_and_nut():
+    bolt = triangle(
+        Helix(radius=1, pitch=0.5, height=3, taper_out_rpos=0.1, taper_in_rpos=0.9),
+        0.2,
+        0.15,
+    )
+    nut = triangle(
+        Helix(
+            radius=1.4,
+            pitch=0.5,
+            height=3,
+            taper_out_rpos=0.1,
+            taper_in_rpos=0.9,
+            first_t=0.02,
+            last_t=1.02,
+        ),
+        0.2,
+        -0.15,
+    )
+    c = clearance(bolt, nut)
+    assert c.distance == pytest.approx(0.1, abs=absolute_tol)
+    assert c.distance == pytest.approx(brute_force(bolt, nut), abs=absolute_tol)
+
+    # The reported points are on the reported wires and are distance apart
+    pa = helix_points(bolt.helix, [c.t_a], bolt.locations[c.wire_a])[0]
+    pb = helix_points(nut.helix, [c.t_b], nut.locations[c.wire_b])[0]
+    assert np.allclose(pa, c.point_a, rtol=0, atol=absolute_tol)
+    assert np.allclose(pb, c.point_b, rtol=0, atol=absolute_tol)
+    assert np.linalg.norm(pa - pb) == pytest.approx(c.distance, abs=absolute_tol)
+
+
+def test_clearance_different_pitch():
+    a = triangle(Helix(radius=1, pitch=0.4, height=2), 0.1, 0.1)
+    b = triangle(Helix(radius=1.5, pitch=0.7, height=2, inset_offset=0.1), 0.1, -0.2)
+    c = clearance(a, b, num_points=500)
+    assert c.distance == pytest.approx(brute_force(a, b), abs=1e-5)
+
+
+def test_clearance_interference():
+    a = triangle(Helix(radius=1, pitch=0.5, height=2), 0.2, 0.2)
+    # Crosses a's middle wire, radius 1.2, where their angles coincide
+    b = ThreadProfile(Helix(radius=1.2, pitch=0.6, height=2), [HelixLocation()])
+    c = clearance(a, b)
+    assert c.distance == pytest.approx(0, abs=absolute_tol)
+
+
+def test_clearance_validity():
+    a = triangle(Helix(radius=1, pitch=0.5, height=2), 0.2, 0.2)
+    with pytest.raises(ValueError):
+        clearance(a, ThreadProfile(a.helix, []))
+    with pytest.raises(ValueError):
+        clearance(a, a, num_points=1)
@@ -0,0 +1,210 @@
+import io
+import json
+import subprocess
+import sys
+from array import array
+from typing import List
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation, cli
+from taperable_helix.mesh import helix_mesh
+from taperable_helix.vectorized import helix_points
+
+args: List[str] = ["--radius", "1", "--pitch", "0.5", "--height", "2"]
+h = Helix(radius=1, pitch=0.5, height=2)
+t = np.linspace(0, 1, 20)
+
+
+class Stdout:
+    """Stands in for sys.stdout, cli writes to sys.stdout.buffer."""
+
+    def __init__(self) -> None:
+        self.buffer = io.BytesIO()
+
+
+def run(monkeypatch, argv: List[str], stdin: str = "") -> bytes:
+    stdout = Stdout()
+    monkeypatch.setattr(sys, "stdout", stdout)
+    monkeypatch.setattr(sys, "stdin", io.StringIO(stdin))
+    assert cli.main(argv) == 0
+    return stdout.buffer.getvalue()
+
+
+def read_csv(text: bytes) -> np.ndarray:
+    lines = text.decode().splitlines()
+    assert lines[0] == "wire,x,y,z"
+    return np.array([[float(v) for v in line.split(",")] for line in lines[1:]])
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_csv(monkeypatch, use_numpy: bool):
+    if not use_numpy:
+        monkeypatch.setattr(cli, "find_spec", lambda name: None)
+    rows = read_csv(
+        run(
+            monkeypatch,
+            args + ["-n", "20", "--chunk-size", "7", "--location", "0.1,0.2"],
+        )
+    )
+    expected = helix_points(h, t, HelixLocation(horz_offset=0.1, vert_offset=0.2))
+    assert np.array_equal(rows[:, 0], np.zeros(20))
+    # Both engines round trip exactly
+    assert np.allclose(rows[:, 1:], expected, rtol=0, atol=1e-15)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_binary(monkeypatch, use_numpy: bool):
+    if not use_numpy:
+        monkeypatch.setattr(cli, "find_spec", lambda name: None)
+    data = run(
+        monkeypatch,
+        args + ["-n", "20", "-f", "binary", "--location", "0,0", "--location", "0.1,0"],
+    )
+    values = array("d")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    points = np.array(values).reshape(2, 20, 3)
+    assert np.allclose(points[0], helix_points(h, t), rtol=0, atol=1e-15)
+    assert np.allclose(
+        points[1],
+        helix_points(h, t, HelixLocation(horz_offset=0.1)),
+        rtol=0,
+        atol=1e-15,
+    )
+
+
+def test_obj(monkeypatch):
+    locations = ["0,0", "0.2,0.1", "0,0.2"]
+    argv = args + ["-n", "10", "-f", "obj", "--chunk-size", "3"]
+    for loc in locations:
+        argv += ["--location", loc]
+    lines = run(monkeypatch, argv).decode().splitlines()
+    vertices = np.array(
+        [[float(v) for v in line.split()[1:]] for line in lines if line[0] == "v"]
+    )
+    faces = np.array(
+        [[int(v) for v in line.split()[1:]] for line in lines if line[0] == "f"]
+    )
+    m = helix_mesh(
+        h,
+        [
+            HelixLocation(horz_offset=0, vert_offset=0),
+            HelixLocation(horz_offset=0.2, vert_offset=0.1),
+            HelixLocation(horz_offset=0, vert_offset=0.2),
+        ],
+        10,
+    )
+    assert np.array_equal(vertices, m.vertices)
+    assert np.array_equal(faces, m.faces + 1)
+
+
+def test_jobs(monkeypatch, tmp_path):
+    a = tmp_path / "a.csv"
+    jobs = [
+        {"output": str(a), "num_points": 20},
+        {},
+        {"radius": 2, "locations": [{"horz_offset": 0.5}], "num_points": 20},
+        {"output": str(a), "num_points": 20, "first_t": 1, "last_t": 0},
+    ]
+    stdin = "\n".join(json.dumps(job) for job in jobs) + "\n\n"
+    out = run(monkeypatch, args + ["-n", "5", "--jobs", "-"], stdin)
+
+    # Jobs to the same output follow each other as one stream with one
+    # header and the wire numbers continuing across the jobs
+    assert out.count(b"wire,x,y,z\n") == 1
+    rows = read_csv(out)
+    assert len(rows) == 25
+    assert np.array_equal(rows[:, 0], [0] * 5 + [1] * 20)
+    expected = helix_points(
+        Helix(radius=2, pitch=0.5, height=2), t, HelixLocation(horz_offset=0.5)
+    )
+    assert np.allclose(rows[5:, 1:], expected, rtol=0, atol=1e-15)
+
+    rows = read_csv(a.read_bytes())
+    assert np.array_equal(rows[:, 0], [0] * 20 + [1] * 20)
+    # Backwards t ranges generate the same points
+    assert np.allclose(rows[:20, 1:], rows[20:, 1:], rtol=0, atol=1e-12)
+
+
+def test_jobs_obj(monkeypatch):
+    # The vertex numbers continue across jobs to the same output
+    triangle = ["--location", "0,0", "--location", "0.5,0.2", "--location", "0,0.4"]
+    stdin = "\n".join([json.dumps({"radius": 2}), json.dumps({})])
+    out = run(monkeypatch, args + triangle + ["-f", "obj", "--jobs", "-"], stdin)
+    lines = out.decode().splitlines()
+    faces = np.array(
+        [[int(v) for v in line.split()[1:]] for line in lines[1:] if line[0] == "f"]
+    )
+    locations = [
+        HelixLocation(horz_offset=ho, vert_offset=vo)
+        for ho, vo in ((0, 0), (0.5, 0.2), (0, 0.4))
+    ]
+    m = helix_mesh(h, locations, 100)
+    assert [line[0] for line in lines].count("v") == 2 * len(m.vertices)
+    assert np.array_equal(faces, np.concatenate([m.faces + 1, m.faces + 301]))
+
+
+@pytest.mark.parametrize(
+    "argv, stdin, message",
+    [
+        (["-n", "5"], "", "radius, pitch, height required"),
+        (args + ["--taper-out-rpos", "2"], "", "taper_out_rpos:2.0"),
+        (args + ["--jobs", "-"], '{"colour": 1}\n', "unknown keys ['colour']"),
+        (args + ["--jobs", "-"], "[1]\n", "job should be a JSON object"),
+        (args + ["--jobs", "-"], '{"format": "stl"}\n', "format:stl"),
+        (
+            args + ["--jobs", "-"],
+            '{"locations": [{"horz_ofset": 1}]}\n',
+            "unknown location keys ['horz_ofset']",
+        ),
+        (args + ["--jobs", "-"], '{"locations": [1]}\n', "should be a JSON object"),
+        (args + ["--jobs", "-"], '{"num_points": -1}\n', "num_points:-1"),
+        (args + ["-n", "1", "-f", "obj"], "", "num_points:1 should be >= 2"),
+        (
+            args + ["--jobs", "-"],
+            '{}\n{"format": "binary"}\n',
+            "format:binary of output:- should be csv",
+        ),
+    ],
+)
+def test_errors(monkeypatch, capsys, argv: List[str], stdin: str, message: str):
+    monkeypatch.setattr(sys, "stdout", Stdout())
+    monkeypatch.setattr(sys, "stdin", io.StringIO(stdin))
+    assert cli.main(argv) == 1
+    assert message in capsys.readouterr().err
+
+
+def test_bad_arguments(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(args + ["--location", "1"])
+    with pytest.raises(SystemExit):
+        cli.main(args + ["--chunk-size", "0"])
+    with pytest.raises(SystemExit):
+        cli.main(args + ["-n", "-1"])
+    assert "-1 should be >= 0" in capsys.readouterr().err
+
+
+def test_nothing_written_for_a_bad_helix(monkeypatch, capsys, tmp_path):
+    # The helix is validated before its output is opened
+    path = tmp_path / "a.csv"
+    monkeypatch.setattr(sys, "stdout", Stdout())
+    argv = args + ["--taper-out-rpos", "2", "-o", str(path)]
+    assert cli.main(argv) == 1
+    assert "taper_out_rpos" in capsys.readouterr().err
+    assert not path.exists()
+    assert sys.stdout.buffer.getvalue() == b""
+
+
+def test_pipe_closed_early():
+    # Closing the pipe while points are still being written isn't an error
+    proc = subprocess.run(
+        f"{sys.executable} -m taperable_helix {' '.join(args)} -n 1000000 | head -2",
+        shell=True,
+        check=True,
+        capture_output=True,
+    )
+    assert proc.stdout.decode().splitlines() == ["wire,x,y,z", "0,-0.0,1.0,0.0"]
+    assert proc.stderr == b""
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.closest import closest_points
+from taperable_helix.vectorized import helix_points
+
+# Default abs_tol
+absolute_tol: float = 1e-6
+
+
+def brute_force(h: Helix, hl: HelixLocation, q: np.ndarray) -> np.ndarray:
+    dense = helix_points(h, np.linspace(h.first_t, h.last_t, 100001), hl)
+    return np.array([np.min(np.linalg.norm(dense - p, axis=1)) for p in q])
+
+
+@pytest.mark.parametrize(
+    "h, hl",
+    [
+        (Helix(radius=1, pitch=0.5, height=3), HelixLocation()),
+        (Helix(radius=1, pitch=0.5, height=-3), HelixLocation()),
+        (
+            Helix(
+                radius=2,
+                pitch=1,
+                height=4,
+                taper_out_rpos=0.1,
+                taper_in_rpos=0.9,
+                inset_offset=0.2,
+            ),
+            HelixLocation(horz_offset=0.3, vert_offset=0.2),
+        ),
+        (Helix(radius=1, pitch=1, height=2, first_t=1, last_t=-1), HelixLocation()),
+        # Strong asymmetric tapers, the closest point is often on another
+        # turn of a taper zone than those nearest the query's angle
+        (
+            Helix(
+                radius=2,
+                pitch=0.3,
+                height=3,
+                taper_out_rpos=0.3,
+                taper_in_rpos=0.6,
+                first_t=-1,
+                last_t=2,
+            ),
+            HelixLocation(radius=1.5, horz_offset=-0.5, vert_offset=-0.1),
+        ),
+        (
+            Helix(radius=2, pitch=0.3, height=3, taper_out_rpos=0.3, taper_in_rpos=0.6),
+            HelixLocation(horz_offset=0.5),
+        ),
+        (Helix(radius=1, pitch=0, height=0), HelixLocation()),
+        (Helix(radius=0, pitch=1, height=1), HelixLocation()),
+    ],
+)
+def test_closest_points_matches_brute_force(h: Helix, hl: HelixLocation):
+    rng = np.random.default_rng(26)
+    q = rng.uniform(-3, 3, (200, 3))
+    q[:, 2] = rng.uniform(-4.5, 4.5, 200)
+    result = closest_points(h, q, hl)
+    assert result.t.shape == (200,)
+    assert result.points.shape == (200, 3)
+
+    # The dense sampling can only ever be slightly worse than the analytic result
+    expected = brute_force(h, hl, q)
+    assert np.all(result.distance <= expected + absolute_tol)
+    assert np.allclose(result.distance, expected, rtol=0, atol=1e-4)
+
+    # The points returned are on the helix at the returned t
+    assert np.allclose(
+        result.points, helix_points(h, result.t, hl), rtol=0, atol=absolute_tol
+    )
+
+
+def test_closest_points_on_helix():
+    h = Helix(radius=1, pitch=0.25, height=2, taper_out_rpos=0.1, taper_in_rpos=0.9)
+    hl = HelixLocation(horz_offset=0.1)
+    t = np.linspace(h.first_t, h.last_t, 1001)
+    result = closest_points(h, helix_points(h, t, hl), hl)
+    assert np.allclose(result.distance, 0, rtol=0, atol=absolute_tol)
+    assert np.allclose(result.t, t, rtol=0, atol=absolute_tol)
+
+
+def test_closest_points_shape():
+    h = Helix(radius=1, pitch=1, height=1)
+    with pytest.raises(ValueError):
+        closest_points(h, [0, 0, 0])
+    with pytest.raises(ValueError):
+        closest_points(h, [[0, 0]])
@@ -0,0 +1,154 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.fit import _apply, _jacobian, fit_helix
+from taperable_helix.vectorized import _evaluate, helix_points
+
+true = Helix(
+    radius=5.02,
+    pitch=1.003,
+    height=20.05,
+    taper_out_rpos=0.06,
+    taper_in_rpos=0.93,
+    inset_offset=0.1,
+)
+true_hl = HelixLocation(horz_offset=0.4, vert_offset=0.2)
+nominal = Helix(
+    radius=5,
+    pitch=1,
+    height=20,
+    taper_out_rpos=0.05,
+    taper_in_rpos=0.95,
+    inset_offset=0.1,
+)
+all_params = [
+    "radius",
+    "pitch",
+    "height",
+    "inset_offset",
+    "taper_out_rpos",
+    "taper_in_rpos",
+    "horz_offset",
+    "vert_offset",
+]
+
+
+def scan(n: int, noise: float, outliers: float = 0, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    p = helix_points(true, rng.uniform(0, 1, n), true_hl)
+    p += rng.normal(0, noise, p.shape)
+    bad = rng.random(n) < outliers
+    p[bad] += rng.normal(0, 0.5, (int(bad.sum()), 3))
+    return p
+
+
+def test_jacobian_matches_finite_differences():
+    hl = HelixLocation(horz_offset=0.2, vert_offset=0.1)
+    h = replace(true, first_t=0.5, last_t=2)
+    t = np.linspace(0.5, 2, 1000)
+    jac = _jacobian(h._geometry(hl), t, all_params)
+    values = np.array(
+        [
+            getattr(hl if name in ("horz_offset", "vert_offset") else h, name)
+            for name in all_params
+        ]
+    )
+    for k, name in enumerate(all_params):
+        eps = 1e-7
+        up, down = values.copy(), values.copy()
+        up[k] += eps
+        down[k] -= eps
+        hu, lu = _apply(h, hl, all_params, up)
+        hd, ld = _apply(h, hl, all_params, down)
+        pu = _evaluate(hu._geometry(lu), t)[0]
+        pd = _evaluate(hd._geometry(ld), t)[0]
+        assert np.abs((pu - pd) / (2 * eps) - jac[:, :, k]).max() < 1e-5, name
+
+
+def test_exact_points():
+    points = scan(2000, 0)
+    params = ["radius", "pitch", "height", "taper_out_rpos", "taper_in_rpos"]
+    result = fit_helix(points, nominal, true_hl, params, loss="linear")
+    assert result.converged
+    for name in params:
+        assert result.params[name] == pytest.approx(getattr(true, name), abs=1e-7)
+    assert result.helix.radius == result.params["radius"]
+    assert result.max < 1e-7
+    assert result.num_fitted == 2000
+    assert len(result.distances) == 2000
+
+
+def test_location_offsets():
+    points = scan(2000, 0)
+    start = HelixLocation(horz_offset=0.3, vert_offset=0.25)
+    params = ["radius", "pitch", "height", "horz_offset", "vert_offset"]
+    result = fit_helix(
+        points, replace(nominal, taper_out_rpos=0.06, taper_in_rpos=0.93), start, params
+    )
+    assert result.location.horz_offset == pytest.approx(0.4, abs=1e-7)
+    assert result.location.vert_offset == pytest.approx(0.2, abs=1e-7)
+
+
+def test_location_radius():
+    points = scan(1000, 0)
+    hl = replace(true_hl, radius=4.9)
+    result = fit_helix(points, nominal, hl, ["radius", "pitch", "height"], tol=1e-6)
+    assert result.location.radius == pytest.approx(result.params["radius"])
+    assert result.helix.radius == nominal.radius
+
+
+@pytest.mark.parametrize("loss", ["huber", "cauchy"])
+def test_robust_to_outliers(loss: str):
+    points = scan(100000, 0.005, outliers=0.05)
+    params = ["radius", "pitch", "height", "taper_out_rpos", "taper_in_rpos"]
+    robust = fit_helix(points, nominal, true_hl, params, loss=loss, max_points=20000)
+    linear = fit_helix(
+        points, nominal, true_hl, params, loss="linear", max_points=20000
+    )
+    assert robust.converged
+    assert robust.num_fitted == 20000
+    for name in params:
+        error = abs(robust.params[name] - getattr(true, name))
+        assert error < 5 * robust.std_errors[name] + 1e-6, name
+    assert abs(robust.params["radius"] - true.radius) < abs(
+        linear.params["radius"] - true.radius
+    )
+    # The statistics of every point
+    every = fit_helix(
+        points, nominal, true_hl, params, loss=loss, max_points=20000, all_points=True
+    )
+    assert len(every.distances) == 100000
+    assert every.median == pytest.approx(0.0061, rel=0.1)
+    assert every.rms > every.p95 > every.median
+
+
+def test_degenerate_std_errors():
+    # Without offsets the tapers don't change the helix
+    points = helix_points(true, np.linspace(0, 1, 500))
+    result = fit_helix(
+        points, nominal, params=["radius", "taper_out_rpos"], max_iterations=5
+    )
+    assert result.std_errors["radius"] == float("inf")
+
+
+def test_errors():
+    points = scan(100, 0)
+    with pytest.raises(ValueError):
+        fit_helix(points[:, :2], nominal)
+    with pytest.raises(ValueError):
+        fit_helix(points, nominal, params=["first_t"])
+    with pytest.raises(ValueError):
+        fit_helix(points, nominal, params=["radius", "radius"])
+    with pytest.raises(ValueError):
+        fit_helix(points, nominal, loss="l1")
+    with pytest.raises(ValueError):
+        fit_helix(points, replace(nominal, pitch=0))
+    with pytest.raises(ValueError):
+        fit_helix(points, replace(nominal, taper_out_rpos=0), params=["taper_out_rpos"])
+    with pytest.raises(ValueError):
+        fit_helix(points, replace(nominal, last_t=0))
+    with pytest.raises(ValueError):
+        fit_helix(points, nominal, max_points=1)
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+import taperable_helix
+
+# Generous so the test is reliable on slow machines, a regression which
+# imports NumPy at import time costs well over this.
+import_budget_us = 150000
+
+
+def run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+
+
+def cumulative_us(stderr: str) -> Dict[str, int]:
+    """Parse -X importtime output to {module: cumulative microseconds}."""
+    result: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            result[name.strip()] = int(cumulative)
+    return result
+
+
+def test_import_does_not_load_numpy():
+    modules = cumulative_us(run("import taperable_helix"))
+    assert "taperable_helix" in modules
+    assert "numpy" not in modules
+    for name in taperable_helix._lazy_modules:
+        assert f"taperable_helix.{name}" not in modules
+
+
+def test_import_time():
+    assert cumulative_us(run("import taperable_helix"))["taperable_helix"] < (
+        import_budget_us
+    )
+
+
+def test_lazy_attributes():
+    for name, module in taperable_helix._lazy_attributes.items():
+        value = getattr(taperable_helix, name)
+        assert value is getattr(getattr(taperable_helix, module), name)
+        assert name in dir(taperable_helix)
+    for name in taperable_helix._lazy_modules:
+        assert getattr(taperable_helix, name).__name__ == f"taperable_helix.{name}"
+
+    from taperable_helix import helix_points
+
+    assert helix_points is taperable_helix.vectorized.helix_points
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError, match="no_such_attribute"):
+        taperable_helix.no_such_attribute  # type: ignore
@@ -0,0 +1,95 @@
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation, instrumentation
+from taperable_helix.vectorized import helix_chunks, helix_points
+
+
+@pytest.fixture
+def instrumented() -> Iterator[None]:
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_by_default():
+    assert not instrumentation.enabled
+    instrumentation.reset()
+    h = Helix(radius=1, pitch=1, height=1)
+    f = h.helix()
+
+    # Not wrapped so there is no per point cost
+    assert f.__name__ == "func"
+    assert not hasattr(f, "__wrapped__")
+    f(0.5)
+    helix_points(h, [0, 0.5, 1])
+    assert instrumentation.counters() == {}
+    assert instrumentation.timings() == {}
+
+
+def test_counters_and_timings(instrumented):
+    h = Helix(radius=1, pitch=1, height=1)
+    f = h.helix(HelixLocation(horz_offset=0.1))
+    assert f(0) == f.__wrapped__(0)  # type: ignore
+    for t in np.linspace(0, 1, 10):
+        f(t)
+    helix_points(h, np.linspace(0, 1, 7))
+    assert sum(len(c) for c in helix_chunks(h, 25, chunk_size=10)) == 25
+
+    counters = instrumentation.counters()
+    assert counters == {
+        "evaluators": 1,
+        "points.scalar": 11,
+        "points.batch": 7,
+        "points.streaming": 25,
+    }
+    timings = instrumentation.timings()
+    assert set(timings) == {"setup", "scalar", "batch", "streaming"}
+    assert all(v >= 0 for v in timings.values())
+
+    instrumentation.reset()
+    assert instrumentation.counters() == {}
+
+
+def test_listener(instrumented):
+    events: List[Tuple[str, str, float]] = []
+
+    def listener(kind: str, name: str, value: float) -> None:
+        events.append((kind, name, value))
+
+    instrumentation.add_listener(listener)
+    try:
+        h = Helix(radius=1, pitch=1, height=1)
+        h.helix()(0.5)
+        with instrumentation.timer("cache.lookup"):
+            instrumentation.count("cache.hit")
+    finally:
+        instrumentation.remove_listener(listener)
+
+    assert [(k, n) for k, n, _ in events] == [
+        ("count", "evaluators"),
+        ("time", "setup"),
+        ("time", "scalar"),
+        ("count", "points.scalar"),
+        ("count", "cache.hit"),
+        ("time", "cache.lookup"),
+    ]
+    with pytest.raises(ValueError):
+        instrumentation.remove_listener(listener)
+
+
+def test_helix_chunks_matches_linspace():
+    h = Helix(radius=1, pitch=0.5, height=2, taper_out_rpos=0.1, taper_in_rpos=0.9)
+    hl = HelixLocation(horz_offset=0.2)
+    chunks = list(helix_chunks(h, 1001, hl, chunk_size=300))
+    assert [len(c) for c in chunks] == [300, 300, 300, 101]
+    expected = helix_points(h, np.linspace(h.first_t, h.last_t, 1001), hl)
+    assert np.allclose(np.concatenate(chunks), expected, rtol=0, atol=1e-12)
+    assert np.array_equal(chunks[-1][-1], expected[-1])
+    assert [len(c) for c in helix_chunks(h, 1)] == [1]
+    with pytest.raises(ValueError):
+        list(helix_chunks(h, 10, chunk_size=0))
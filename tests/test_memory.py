@@ -0,0 +1,112 @@
+"""Peak memory per point of each generation path.
+
+The peak bytes allocated, as traced by tracemalloc, while generating
+num_points points through each public path is divided by num_points and
+compared with the baseline in tests/data/memory_baselines.json. A path
+fails if it regresses by more than tolerance. After an intentional change
+record new baselines with `pytest --generate tests/test_memory.py`.
+"""
+
+import json
+import tracemalloc
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.mesh import mesh_chunks
+from taperable_helix.vectorized import helix_chunks, helix_points
+
+# Data directory string
+data_dir_str = "tests/data/"
+baselines_fname = data_dir_str + "memory_baselines.json"
+
+num_points: int = 100000
+tolerance: float = 0.10
+
+h: Helix = Helix(radius=1, pitch=0.5, height=3, taper_out_rpos=0.1, taper_in_rpos=0.9)
+hl: HelixLocation = HelixLocation(horz_offset=0.1)
+
+
+def gen_scalar() -> Any:
+    f = h.helix(hl)
+    return list(map(f, np.linspace(h.first_t, h.last_t, num_points)))
+
+
+def gen_batch() -> Any:
+    return helix_points(h, np.linspace(h.first_t, h.last_t, num_points), hl)
+
+
+def gen_streaming() -> Any:
+    # Consumed as they are generated, only the running result is kept
+    total: float = 0
+    for chunk in helix_chunks(h, num_points, hl, chunk_size=4096):
+        total += float(chunk[:, 2].sum())
+    return total
+
+
+def gen_point_array() -> Any:
+    return h.point_array(num_points, hl)
+
+
+def gen_mesh() -> Any:
+    # A streamed three wire profile, num_points vertices in all
+    profile = [
+        HelixLocation(),
+        HelixLocation(horz_offset=0.1, vert_offset=0.05),
+        HelixLocation(vert_offset=0.1),
+    ]
+    faces: int = 0
+    for mesh in mesh_chunks(h, profile, num_points // 3, chunk_size=4096):
+        faces += len(mesh.faces)
+    return faces
+
+
+paths: Dict[str, Callable[[], Any]] = {
+    "scalar": gen_scalar,
+    "batch": gen_batch,
+    "streaming": gen_streaming,
+    "mesh": gen_mesh,
+    "point_array": gen_point_array,
+}
+
+
+def peak_bytes_per_point(gen: Callable[[], Any]) -> float:
+    gen()  # Warm up imports and caches so they aren't measured
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base: int = tracemalloc.get_traced_memory()[0]
+        result = gen()  # noqa: F841 keep the result alive until measured
+        peak: int = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return (peak - base) / num_points
+
+
+def read_baselines() -> Dict[str, float]:
+    with open(baselines_fname, "r") as f:
+        return json.load(f)
+
+
+def write_baselines(baselines: Dict[str, float]) -> None:
+    with open(baselines_fname, "w") as f:
+        json.dump(baselines, f, indent=4, sort_keys=True)
+        f.write("\n")
+
+
+@pytest.mark.parametrize("path", sorted(paths))
+def test_memory_per_point(path: str, generate):
+    measured: float = peak_bytes_per_point(paths[path])
+    if generate:
+        baselines = read_baselines()
+        baselines[path] = round(measured, 1)
+        write_baselines(baselines)
+    baseline: float = read_baselines()[path]
+    limit: float = baseline * (1 + tolerance)
+    assert measured <= limit, f"{path}: {measured:.1f} bytes/point > {limit:.1f}"
+
+
+def test_memory_baselines_cover_paths():
+    assert set(read_baselines()) == set(paths)
@@ -0,0 +1,234 @@
+from math import cos, pi, sin, sqrt
+from typing import Dict, Tuple
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.mesh import Mesh, helix_mesh, mesh_chunks, weld, weld_vertices
+from taperable_helix.vectorized import helix_points
+
+h = Helix(radius=1, pitch=0.5, height=2, taper_out_rpos=0.1, taper_in_rpos=0.9)
+
+# Counter clockwise in the (radius, z) plane
+profile = [
+    HelixLocation(horz_offset=0, vert_offset=0),
+    HelixLocation(horz_offset=0.2, vert_offset=0.1),
+    HelixLocation(horz_offset=0.2, vert_offset=0.2),
+    HelixLocation(horz_offset=0, vert_offset=0.3),
+]
+
+
+def signed_volume(vertices: np.ndarray, faces: np.ndarray) -> float:
+    v = vertices[faces]
+    return float(np.einsum("ij,ij->i", v[:, 0], np.cross(v[:, 1], v[:, 2])).sum() / 6)
+
+
+def assert_closed(faces: np.ndarray):
+    """Every directed edge is matched by exactly one opposite edge."""
+    edges: Dict[Tuple[int, int], int] = {}
+    for f in faces.tolist():
+        for i in range(3):
+            e = (f[i], f[(i + 1) % 3])
+            edges[e] = edges.get(e, 0) + 1
+    assert max(edges.values()) == 1
+    assert all((b, a) in edges for a, b in edges)
+
+
+def test_vertices_are_the_wires():
+    m = helix_mesh(h, profile, 50)
+    assert m.vertices.shape == (50 * 4, 3)
+    t = np.linspace(h.first_t, h.last_t, 50)
+    for w, hl in enumerate(profile):
+        assert np.array_equal(m.vertices[w::4], helix_points(h, t, hl))
+
+
+def test_closed_and_oriented():
+    m = helix_mesh(h, profile, 200)
+
+    # 2 triangles per step per side plus 2 per cap
+    assert m.faces.shape == (199 * 4 * 2 + 2 * 2, 3)
+
+    assert_closed(m.faces)
+
+    # Outward facing, the enclosed volume converges to the swept volume
+    fine = helix_mesh(h, profile, 4000)
+    volume = signed_volume(fine.vertices, fine.faces)
+    assert volume == pytest.approx(h.swept_volume(profile), rel=1e-3)
+
+
+def test_two_wires_is_an_open_strip():
+    m = helix_mesh(h, profile[:2], 10)
+    assert m.faces.shape == (9 * 2, 3)
+
+
+def test_one_wire_has_no_faces():
+    m = helix_mesh(h, num_points=10)
+    assert m.vertices.shape == (10, 3)
+    assert m.faces.shape == (0, 3)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 1000])
+def test_chunks_concatenate_to_the_mesh(chunk_size: int):
+    m = helix_mesh(h, profile, 100)
+    chunks = list(mesh_chunks(h, profile, 100, chunk_size))
+    assert len(chunks) == -(-100 // chunk_size)
+    assert np.array_equal(np.concatenate([c.vertices for c in chunks]), m.vertices)
+    assert np.array_equal(np.concatenate([c.faces for c in chunks]), m.faces)
+
+
+def face_normals(m: Mesh) -> np.ndarray:
+    """Return the area weighted average of the normals of each vertex's faces."""
+    v = m.vertices[m.faces]
+    areas = np.cross(v[:, 1] - v[:, 0], v[:, 2] - v[:, 0])
+    normals = np.zeros_like(m.vertices)
+    for i in range(3):
+        np.add.at(normals, m.faces[:, i], areas)
+    with np.errstate(invalid="ignore"):
+        return normals / np.linalg.norm(normals, axis=1, keepdims=True)
+
+
+# A smooth profile, a circle counter clockwise in the (radius, z) plane
+circle = [
+    HelixLocation(horz_offset=0.1 * cos(a), vert_offset=0.15 + 0.1 * sin(a))
+    for a in np.linspace(0, 2 * pi, 24, endpoint=False)
+]
+
+
+@pytest.mark.parametrize("first_t, last_t", [(0, 1), (1, 0)])
+def test_normals_match_the_faces(first_t: float, last_t: float):
+    helix = Helix(
+        radius=1,
+        pitch=0.5,
+        height=2,
+        taper_out_rpos=0.1,
+        taper_in_rpos=0.9,
+        first_t=first_t,
+        last_t=last_t,
+    )
+    m = helix_mesh(helix, circle, 4000, normals=True)
+    assert m.normals.shape == m.vertices.shape
+    assert np.allclose(np.linalg.norm(m.normals, axis=1), 1)
+    # Away from the tips, where the faces collapse
+    body = slice(24 * 10, -24 * 10)
+    dots = np.einsum("ij,ij->i", m.normals[body], face_normals(m)[body])
+    assert dots.min() > 0.999
+
+    # At the tips the normals are the limit of those of the next rings
+    for tip, ring in (
+        (slice(0, 24), slice(24, 48)),
+        (slice(-24, None), slice(-48, -24)),
+    ):
+        dots = np.einsum("ij,ij->i", m.normals[tip], m.normals[ring])
+        assert dots.min() > 0.99
+
+
+def test_normals_of_an_open_strip():
+    m = helix_mesh(h, profile[:2], 1000, normals=True)
+    body = slice(2 * 10, -2 * 10)
+    dots = np.einsum("ij,ij->i", m.normals[body], face_normals(m)[body])
+    assert dots.min() > 0.999
+
+
+def test_uvs():
+    m = helix_mesh(h, profile, 11, uvs=True)
+    assert m.uvs.shape == (11 * 4, 2)
+    assert np.allclose(m.uvs[:, 0], np.repeat(np.linspace(0, 1, 11), 4))
+    # The edges of the profile in the (radius, z) plane, the last closes it
+    edges = [sqrt(0.05), 0.1, sqrt(0.05), 0.3]
+    assert np.allclose(m.uvs[:4, 1], np.cumsum([0] + edges[:3]) / sum(edges))
+    assert np.array_equal(m.uvs[4:8, 1], m.uvs[:4, 1])
+
+
+def test_normals_and_uvs_of_chunks_and_welds():
+    m = helix_mesh(h, profile, 100, normals=True, uvs=True)
+    chunks = list(mesh_chunks(h, profile, 100, 7, normals=True, uvs=True))
+    assert np.array_equal(np.concatenate([c.normals for c in chunks]), m.normals)
+    assert np.array_equal(np.concatenate([c.uvs for c in chunks]), m.uvs)
+    assert helix_mesh(h, profile, 10).normals is None
+
+    welded = weld(m)
+    assert welded.normals.shape == welded.vertices.shape
+    assert welded.uvs.shape == (len(welded.vertices), 2)
+    assert np.allclose(np.linalg.norm(welded.normals, axis=1), 1)
+    # Unmerged vertices keep theirs, the tips are the average of the wires
+    assert np.allclose(welded.normals[1:-1], m.normals[4:-4], rtol=0, atol=1e-15)
+    assert np.array_equal(welded.uvs[1:-1], m.uvs[4:-4])
+    tip = m.normals[:4].sum(axis=0)
+    assert np.allclose(welded.normals[0], tip / np.linalg.norm(tip))
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        helix_mesh(h, num_points=10, normals=True)
+    with pytest.raises(ValueError):
+        list(mesh_chunks(h, [], 10))
+    with pytest.raises(ValueError):
+        list(mesh_chunks(h, profile, 10, chunk_size=0))
+
+
+def test_weld_vertices_matches_brute_force():
+    rng = np.random.default_rng(1)
+    tol = 1e-3
+    # Clusters of points closer than tol, some straddling cell boundaries
+    centers = rng.uniform(-1, 1, (300, 3))
+    v = np.repeat(centers, 3, axis=0) + rng.uniform(-0.25, 0.25, (900, 3)) * tol
+    v = v[rng.permutation(len(v))]
+    welded, index = weld_vertices(v, tol)
+    assert len(welded) == 300
+    assert np.linalg.norm(welded[index] - v, axis=1).max() <= tol
+    d = np.linalg.norm(v[:, None] - v[None, :], axis=2)
+    assert np.array_equal(index[:, None] == index[None, :], d <= tol)
+    # The first vertex of each cluster is kept unchanged, in order
+    first = np.unique(index, return_index=True)[1]
+    assert np.array_equal(welded, v[np.sort(first)])
+
+
+def test_weld_vertices_keeps_distinct_vertices():
+    v = np.arange(30, dtype=np.float64).reshape(10, 3) * 1e-6
+    welded, index = weld_vertices(v, 1e-7)
+    assert np.array_equal(welded, v)
+    assert np.array_equal(index, np.arange(10))
+    welded, index = weld_vertices(np.empty((0, 3)), 1e-7)
+    assert welded.shape == (0, 3) and index.shape == (0,)
+
+
+def test_weld_tapered_mesh_is_closed():
+    m = helix_mesh(h, profile, 400)
+    welded = weld(m)
+    # The wires taper to one point at each end
+    assert len(welded.vertices) == len(m.vertices) - 2 * 3
+    # The caps and the triangles joining them collapse
+    assert len(welded.faces) == len(m.faces) - 2 * 2 - 2 * 4
+    assert_closed(welded.faces)
+    assert signed_volume(welded.vertices, welded.faces) == pytest.approx(
+        signed_volume(m.vertices, m.faces), rel=1e-12
+    )
+    kept = weld(m, drop_degenerate=False)
+    assert np.array_equal(kept.vertices, welded.vertices)
+    assert len(kept.faces) == len(m.faces)
+
+
+def test_weld_stitches_meshes():
+    # An open strip between each pair of wires, their vertices duplicated
+    strips = [helix_mesh(h, [profile[w], profile[(w + 1) % 4]], 50) for w in range(4)]
+    stitched = Mesh(
+        vertices=np.concatenate([m.vertices for m in strips]),
+        faces=np.concatenate([m.faces + 100 * w for w, m in enumerate(strips)]),
+    )
+    welded = weld(stitched)
+    assert len(welded.vertices) == 50 * 4 - 2 * 3
+    assert_closed(welded.faces)
+    whole = weld(helix_mesh(h, profile, 50))
+    assert signed_volume(welded.vertices, welded.faces) == pytest.approx(
+        signed_volume(whole.vertices, whole.faces), rel=1e-12
+    )
+
+
+def test_weld_errors():
+    with pytest.raises(ValueError):
+        weld_vertices(np.zeros((2, 3)), 0)
+    with pytest.raises(ValueError):
+        weld_vertices(np.array([[np.nan, 0, 0]]), 1e-9)
+    with pytest.raises(ValueError):
+        weld_vertices(np.array([[1e300, 0, 0]]), 1e-9)
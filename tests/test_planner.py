@@ -0,0 +1,103 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.vectorized import helix_points
+
+tapered = Helix(radius=1, pitch=0.2, height=1, taper_out_rpos=0.1, taper_in_rpos=0.9)
+thread = HelixLocation(horz_offset=0.1, vert_offset=0.05)
+
+
+def measure(
+    h: Helix, hl: Optional[HelixLocation], num_points: int
+) -> Tuple[float, float]:
+    """Return the max chord error, sampling each segment, and max segment"""
+    t = np.linspace(h.first_t, h.last_t, num_points)
+    p = helix_points(h, t, hl)
+    d = np.diff(p, axis=0)
+    u = np.linspace(0, 1, 33)
+    q = helix_points(h, (t[:-1, None] + np.outer(np.diff(t), u)).ravel(), hl)
+    q = q.reshape(len(d), len(u), 3) - p[:-1, None]
+    along = np.clip(np.einsum("nuk,nk->nu", q, d) / (d * d).sum(axis=1)[:, None], 0, 1)
+    err = np.linalg.norm(q - along[..., None] * d[:, None], axis=2).max()
+    return float(err), float(np.linalg.norm(d, axis=1).max())
+
+
+@pytest.mark.parametrize(
+    "h, hl",
+    [
+        (Helix(radius=2, pitch=0.5, height=3), None),
+        (tapered, thread),
+        (Helix(radius=1, pitch=0.2, height=1, first_t=1, last_t=0), None),
+    ],
+)
+@pytest.mark.parametrize(
+    "chord_error, max_segment", [(1e-3, None), (None, 0.05), (1e-4, 0.02)]
+)
+def test_plan_points(h, hl, chord_error, max_segment):
+    plan = h.plan_points(chord_error, max_segment, hl)
+    err, seg = measure(h, hl, plan.num_points)
+    if chord_error is not None:
+        assert err <= chord_error
+    if max_segment is not None:
+        assert seg <= max_segment
+    assert err <= plan.max_chord_error * (1 + 1e-9)
+    assert seg <= plan.max_segment * (1 + 1e-9)
+
+    # The plan isn't wasteful, 80% of the points misses the targets
+    err, seg = measure(h, hl, int(plan.num_points * 0.8))
+    assert (chord_error is not None and err > chord_error) or (
+        max_segment is not None and seg > max_segment
+    )
+
+
+def test_plan_points_body_exact():
+    h = Helix(radius=2, pitch=0.5, height=3)
+    plan = h.plan_points(chord_error=1e-3)
+    err, _ = measure(h, None, plan.num_points)
+    assert err == pytest.approx(plan.max_chord_error, rel=1e-3)
+    assert plan.max_chord_error <= 1e-3
+
+
+def test_plan_points_zones():
+    plan = tapered.plan_points(chord_error=1e-4, hl=thread)
+    assert [z.name for z in plan.zones] == ["taper_out", "body", "taper_in"]
+    assert [(z.first_t, z.last_t) for z in plan.zones] == [
+        (0, pytest.approx(0.1)),
+        (pytest.approx(0.1), pytest.approx(0.9)),
+        (pytest.approx(0.9), 1),
+    ]
+    for zone in plan.zones:
+        assert zone.num_segments >= 1
+        assert zone.max_chord_error <= 1e-4
+
+    # Each zone with its own count meets the target
+    for zone in plan.zones:
+        t = np.linspace(zone.first_t, zone.last_t, zone.num_segments + 1)
+        p = helix_points(tapered, t, thread)
+        mid = helix_points(tapered, (t[:-1] + t[1:]) / 2, thread)
+        assert np.linalg.norm(mid - (p[:-1] + p[1:]) / 2, axis=1).max() <= 1e-4
+
+
+def test_plan_points_degenerate():
+    # A straight line has no chord error
+    line = Helix(radius=0, pitch=2, height=2)
+    assert line.plan_points(chord_error=1e-6).num_points == 2
+    assert line.plan_points(max_segment=0.5).num_points == 5
+
+    point = Helix(radius=1, pitch=0.5, height=1, first_t=0.5, last_t=0.5)
+    plan = point.plan_points(chord_error=1e-3)
+    assert plan.num_points == 1
+    assert plan.zones == []
+
+
+def test_plan_points_errors():
+    h = Helix(radius=1, pitch=0.5, height=1)
+    with pytest.raises(ValueError):
+        h.plan_points()
+    with pytest.raises(ValueError):
+        h.plan_points(chord_error=0)
+    with pytest.raises(ValueError):
+        h.plan_points(max_segment=-1)
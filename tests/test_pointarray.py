@@ -0,0 +1,111 @@
+import sys
+from array import array
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation, PointArray
+
+h = Helix(radius=1, pitch=0.5, height=2, taper_out_rpos=0.1, taper_in_rpos=0.9)
+hl = HelixLocation(horz_offset=0.1)
+
+
+def test_point_array_matches_helix():
+    points = h.point_array(101, hl)
+    f = h.helix(HelixLocation(horz_offset=0.1))
+    assert points.tolist() == [f(t) for t in np.linspace(0, 1, 101)]
+    assert points[-1] == f(1)
+    assert hl.radius is None
+
+
+@pytest.mark.parametrize("num_points", [0, 1, 2])
+def test_point_array_sizes(num_points: int):
+    points = h.point_array(num_points)
+    assert len(points) == num_points
+    if num_points:
+        assert points[0] == h.helix()(h.first_t if num_points > 1 else h.last_t)
+
+
+def test_sequence():
+    points = PointArray.from_points([(0, 1, 2), (3, 4, 5), (6, 7, 8), (9, 10, 11)])
+    assert len(points) == 4
+    assert points[1] == (3, 4, 5)
+    assert points[-1] == (9, 10, 11)
+    with pytest.raises(IndexError):
+        points[4]
+    with pytest.raises(IndexError):
+        points[-5]
+    assert list(points) == points.tolist()
+    assert list(reversed(points))[0] == (9, 10, 11)
+    assert (3, 4, 5) in points
+    assert points.index((6, 7, 8)) == 2
+
+    assert points[1:3] == PointArray([3, 4, 5, 6, 7, 8])
+    assert points[::2].tolist() == [(0, 1, 2), (6, 7, 8)]
+    assert points[::-1].tolist() == list(reversed(points))
+    assert len(points[3:1]) == 0
+    assert repr(points) == "PointArray(4 points)"
+
+    with pytest.raises(ValueError):
+        PointArray([1, 2])
+    with pytest.raises(TypeError):
+        hash(points)
+
+
+def test_storage_is_shared():
+    data = array("d", range(6))
+    points = PointArray(data)
+    assert points.data is data
+    assert PointArray(range(6)) == points
+    assert PointArray(array("f", range(6))).data.typecode == "d"
+
+
+def test_columns_and_buffer():
+    points = h.point_array(50, hl)
+    expected = np.array(points.tolist())
+    assert points.x.tolist() == list(expected[:, 0])
+    assert points.y.tolist() == list(expected[:, 1])
+    assert points.z.tolist() == list(expected[:, 2])
+    assert points.x.readonly
+
+    x, y, z = points.columns()
+    assert isinstance(x, array) and x.typecode == "d"
+    assert (x.tolist(), y.tolist(), z.tolist()) == tuple(list(c) for c in expected.T)
+    assert PointArray().columns() == (array("d"), array("d"), array("d"))
+
+    view = points.view()
+    assert view.shape == (50, 3)
+    assert view.readonly
+    assert view[2, 1] == points[2][1]
+    assert PointArray().view().tolist() == []
+
+    # NumPy uses the storage without copying
+    arr = np.asarray(points)
+    assert arr.shape == (50, 3)
+    assert np.array_equal(arr, expected)
+    assert not arr.flags.writeable
+    assert np.shares_memory(arr, np.frombuffer(points.data))
+    assert np.asarray(PointArray()).shape == (0, 3)
+
+
+def test_buffer_protocol():
+    points = h.point_array(5)
+    if sys.version_info >= (3, 12):
+        mv = memoryview(points)  # type: ignore
+        assert mv.shape == (5, 3)
+        assert mv.readonly
+        assert mv.tolist() == points.view().tolist()
+    else:
+        # PEP 688 isn't available, view() and the array interface are
+        with pytest.raises(TypeError):
+            memoryview(points)  # type: ignore
+    assert points.view().shape == (5, 3)
+    assert points.view().tolist() == [list(p) for p in points]
+    arr = np.asarray(points)
+    assert np.shares_memory(arr, np.frombuffer(points.data))
+    assert arr.tolist() == points.view().tolist()
+
+
+def test_slots():
+    with pytest.raises(AttributeError):
+        PointArray().extra = 1  # type: ignore
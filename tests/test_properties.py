@@ -0,0 +1,130 @@
+from math import pi, sqrt
+from typing import List
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.vectorized import helix_points
+
+triangle: List[HelixLocation] = [
+    HelixLocation(vert_offset=0.1),
+    HelixLocation(vert_offset=-0.1),
+    HelixLocation(horz_offset=0.15),
+]
+
+
+def polyline_length(h: Helix, hl: HelixLocation) -> float:
+    p = helix_points(h, np.linspace(h.first_t, h.last_t, 200001), hl)
+    return float(np.linalg.norm(np.diff(p, axis=0), axis=1).sum())
+
+
+def mesh_volume(h: Helix, hls: List[HelixLocation]) -> float:
+    """Volume by the divergence theorem over a closed triangle mesh"""
+    t = np.linspace(h.first_t, h.last_t, 20001)
+    wires = [helix_points(h, t, hl) for hl in hls]
+    volume = 0.0
+    for i, a in enumerate(wires):
+        b = wires[(i + 1) % len(wires)]
+        volume += np.einsum("ij,ij->i", a[:-1], np.cross(a[1:], b[:-1])).sum()
+        volume += np.einsum("ij,ij->i", b[:-1], np.cross(a[1:], b[1:])).sum()
+    return abs(volume) / 6
+
+
+def test_arc_length_untapered():
+    radius = 2
+    pitch = 0.5
+    height = 3
+    h = Helix(radius=radius, pitch=pitch, height=height)
+    turns = height / pitch
+    expected = sqrt((2 * pi * radius * turns) ** 2 + height**2)
+    assert h.arc_length() == pytest.approx(expected, rel=1e-12)
+    assert h.arc_length(HelixLocation(horz_offset=0.5)) == pytest.approx(
+        sqrt((2 * pi * (radius + 0.5) * turns) ** 2 + height**2), rel=1e-12
+    )
+
+
+@pytest.mark.parametrize(
+    "h, hl",
+    [
+        (
+            Helix(radius=1, pitch=0.5, height=3, taper_out_rpos=0.1, taper_in_rpos=0.9),
+            HelixLocation(horz_offset=0.15),
+        ),
+        (
+            Helix(
+                radius=2,
+                pitch=0.7,
+                height=3,
+                taper_out_rpos=0.2,
+                taper_in_rpos=0.6,
+                inset_offset=0.1,
+            ),
+            HelixLocation(horz_offset=-0.1, vert_offset=0.2),
+        ),
+        (Helix(radius=1, pitch=1, height=2, first_t=1, last_t=-1), HelixLocation()),
+        (Helix(radius=0, pitch=1, height=1), HelixLocation()),
+    ],
+)
+def test_arc_length_matches_polyline(h: Helix, hl: HelixLocation):
+    assert h.arc_length(hl) == pytest.approx(polyline_length(h, hl), rel=1e-7)
+
+
+def test_swept_volume_untapered():
+    h = Helix(radius=1, pitch=0.5, height=3)
+    area = 0.2 * 0.15 / 2
+    centroid = 1 + 0.15 / 3
+    turns = 3 / 0.5
+    expected = area * centroid * 2 * pi * turns
+    assert h.swept_volume(triangle) == pytest.approx(expected, rel=1e-12)
+    assert h.swept_volume(triangle[:2]) == 0
+
+
+@pytest.mark.parametrize(
+    "h",
+    [
+        Helix(radius=1, pitch=0.5, height=3, taper_out_rpos=0.1, taper_in_rpos=0.9),
+        Helix(radius=2, pitch=0.7, height=3, taper_out_rpos=0.2, taper_in_rpos=0.6),
+    ],
+)
+def test_swept_volume_tapered(h: Helix):
+    assert h.swept_volume(triangle) == pytest.approx(mesh_volume(h, triangle), rel=1e-4)
+
+
+def test_surface_area_annulus_and_cylinder():
+    # With pitch 0 a strip between two radii is an annulus
+    h = Helix(radius=1, pitch=0, height=0)
+    strip = [HelixLocation(), HelixLocation(horz_offset=0.5)]
+    assert h.surface_area(strip) == pytest.approx(pi * (1.5**2 - 1), rel=1e-12)
+
+    # and between two heights is a cylinder
+    strip = [HelixLocation(), HelixLocation(vert_offset=0.5)]
+    assert h.surface_area(strip) == pytest.approx(2 * pi * 0.5, rel=1e-12)
+
+
+def mesh_area(h: Helix, hls: List[HelixLocation]) -> float:
+    """Area of the triangulated strips between consecutive wires"""
+    t = np.linspace(h.first_t, h.last_t, 20001)
+    wires = [helix_points(h, t, hl) for hl in hls]
+    u = np.linspace(0, 1, 33)[:, None, None]
+    area = 0.0
+    for i, a in enumerate(wires):
+        b = wires[(i + 1) % len(wires)]
+        grid = a[None] * (1 - u) + b[None] * u
+        p, q, r, s = grid[:-1, :-1], grid[1:, :-1], grid[:-1, 1:], grid[1:, 1:]
+        area += np.linalg.norm(np.cross(q - p, r - p), axis=2).sum() / 2
+        area += np.linalg.norm(np.cross(q - s, r - s), axis=2).sum() / 2
+    return area
+
+
+def test_surface_area_matches_mesh():
+    h = Helix(radius=1, pitch=0.5, height=3, taper_out_rpos=0.1, taper_in_rpos=0.9)
+    assert h.surface_area(triangle) == pytest.approx(mesh_area(h, triangle), rel=1e-5)
+
+    # Untapered the profile closes each end
+    h = Helix(radius=1, pitch=0.5, height=3)
+    caps = 2 * (0.2 * 0.15 / 2)
+    assert h.surface_area(triangle) == pytest.approx(
+        mesh_area(h, triangle) + caps, rel=1e-5
+    )
+    assert h.surface_area(triangle[:1]) == 0
@@ -0,0 +1,80 @@
+from typing import Dict
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.vectorized import helix_chunks
+
+cases: Dict[str, Helix] = {
+    "untapered": Helix(radius=1, pitch=0.2, height=1),
+    "tapered": Helix(
+        radius=1, pitch=0.2, height=1, taper_out_rpos=0.1, taper_in_rpos=0.9
+    ),
+    "taper_all": Helix(
+        radius=2, pitch=0.5, height=1, taper_out_rpos=0.5, taper_in_rpos=0.5
+    ),
+    "backwards": Helix(radius=1, pitch=1, height=1, first_t=1, last_t=0),
+    "pitch_0": Helix(radius=1, pitch=0, height=1),
+    "inset": Helix(
+        radius=1, pitch=0.1, height=1, inset_offset=0.1, first_t=-1, last_t=2
+    ),
+    "ft_eq_lt": Helix(radius=1, pitch=1, height=1, first_t=0.5, last_t=0.5),
+}
+hl = HelixLocation(horz_offset=0.1, vert_offset=0.05)
+
+
+@pytest.mark.parametrize("name", list(cases))
+@pytest.mark.parametrize("num_points", [0, 1, 2, 3, 100, 1001])
+def test_point_array(name, num_points):
+    h = cases[name]
+    expected = np.asarray(h.point_array(num_points, hl)).reshape(-1, 3)
+    actual = np.asarray(h.point_array(num_points, hl, recurrence=True)).reshape(-1, 3)
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("name", list(cases))
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 65536])
+def test_helix_chunks(name, chunk_size):
+    h = cases[name]
+    expected = list(helix_chunks(h, 1001, hl, chunk_size=chunk_size))
+    actual = list(helix_chunks(h, 1001, hl, chunk_size=chunk_size, recurrence=True))
+    assert [len(c) for c in actual] == [len(c) for c in expected]
+    np.testing.assert_allclose(
+        np.concatenate(actual), np.concatenate(expected), rtol=0, atol=1e-12
+    )
+
+
+def test_drift():
+    # Many turns and points, re-anchoring keeps the error at rounding level
+    h = Helix(radius=10, pitch=0.01, height=10, taper_out_rpos=0.01, taper_in_rpos=0.99)
+    num_points = 200001
+    expected = np.concatenate(list(helix_chunks(h, num_points)))
+    actual = np.concatenate(list(helix_chunks(h, num_points, recurrence=True)))
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-10)
+    pa = np.asarray(h.point_array(num_points, recurrence=True))
+    np.testing.assert_allclose(pa, expected, rtol=0, atol=1e-10)
+
+
+def test_drift_bound():
+    # The documented bound, 2 * r * a * eps, holds and doesn't grow with
+    # the number of points
+    h = Helix(radius=2, pitch=0.01, height=30, taper_out_rpos=0.1, taper_in_rpos=0.9)
+    r = h.radius + hl.horz_offset
+    bound = 2 * r * (2 * np.pi * h.height / h.pitch) * np.finfo(float).eps
+    for num_points in [10001, 1000001]:
+        expected = np.concatenate(list(helix_chunks(h, num_points, hl)))
+        actual = np.concatenate(list(helix_chunks(h, num_points, hl, recurrence=True)))
+        pa = np.asarray(h.point_array(num_points, hl, recurrence=True))
+        error = max(np.abs(actual - expected).max(), np.abs(pa - expected).max())
+        assert error <= bound, f"{num_points} points: {error} > {bound}"
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        list(helix_chunks(cases["untapered"], 10, chunk_size=0, recurrence=True))
+    with pytest.raises(ValueError):
+        Helix(
+            radius=1, pitch=1, height=1, taper_out_rpos=0.9, taper_in_rpos=0.1
+        ).point_array(10, recurrence=True)
@@ -0,0 +1,83 @@
+import pytest
+
+from taperable_helix import Helix, HelixLocation, PointArray, instrumentation
+from taperable_helix.samples import HelixSamples
+
+h = Helix(radius=1, pitch=0.5, height=2, taper_out_rpos=0.1, taper_in_rpos=0.9)
+hl = HelixLocation(horz_offset=0.1)
+
+
+def test_matches_point_array():
+    samples = h.samples(101, hl)
+    points = h.point_array(101, hl)
+    assert isinstance(samples, HelixSamples)
+    assert len(samples) == 101
+    assert list(samples) == points.tolist()
+    assert list(reversed(samples)) == points.tolist()[::-1]
+    for i in (0, 1, 50, 100, -1, -101):
+        assert samples[i] == points[i]
+    assert samples.t(-1) == h.last_t
+    assert samples.t(0) == h.first_t
+    assert repr(samples) == "HelixSamples(101 points)"
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        slice(None),
+        slice(10, 20),
+        slice(None, None, 7),
+        slice(-5, None),
+        slice(90, 10, -3),
+        slice(None, None, -1),
+        slice(50, 40),
+        slice(-1000, 1000),
+    ],
+)
+def test_slices(index: slice):
+    samples = h.samples(101, hl)
+    points = h.point_array(101, hl)
+    result = samples[index]
+    assert isinstance(result, PointArray)
+    assert result == points[index]
+
+    fast = h.samples(101, hl, recurrence=True)[index]
+    assert len(fast) == len(result)
+    for p, q in zip(fast, result):
+        assert p == pytest.approx(q, abs=1e-14)
+
+
+@pytest.mark.parametrize("num_points", [0, 1, 2])
+def test_sizes(num_points: int):
+    samples = h.samples(num_points)
+    assert list(samples) == h.point_array(num_points).tolist()
+    assert samples[:] == h.point_array(num_points)
+
+
+def test_errors():
+    samples = h.samples(10)
+    with pytest.raises(IndexError):
+        samples[10]
+    with pytest.raises(IndexError):
+        samples[-11]
+    with pytest.raises(IndexError):
+        samples.t(10)
+    with pytest.raises(ValueError):
+        h.samples(-1)
+    with pytest.raises(ValueError):
+        Helix(radius=1, pitch=0.5, height=2, taper_out_rpos=1.5).samples(10)
+
+
+def test_only_reads_are_computed():
+    last = h.helix()(h.last_t)
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        samples = h.samples(10_000_000)
+        assert samples[-1] == last
+        assert len(samples[::1_000_000]) == 10
+        assert len(samples[5000:5100]) == 100
+        assert instrumentation.counters()["points.scalar"] == 1 + 10 + 100
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
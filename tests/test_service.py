@@ -0,0 +1,173 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation, instrumentation
+from taperable_helix.mesh import helix_mesh
+from taperable_helix.service import GeometryService, serve
+from taperable_helix.vectorized import helix_points
+
+h = Helix(radius=1, pitch=0.5, height=2, taper_out_rpos=0.1, taper_in_rpos=0.9)
+hl = HelixLocation(horz_offset=0.1)
+
+
+@pytest.fixture
+def instrumented() -> Iterator[None]:
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_points():
+    result = asyncio.run(GeometryService().points(h, hl, 50))
+    assert np.array_equal(result, helix_points(h, np.linspace(0, 1, 50), hl))
+    assert not result.flags.writeable
+
+
+def test_identical_requests_are_coalesced(instrumented):
+    async def burst() -> List[np.ndarray]:
+        service = GeometryService()
+        requests = [service.points(h, hl, 1000) for _ in range(10)]
+        # Equal but distinct Helix and HelixLocation objects are identical
+        requests.append(
+            service.points(Helix(**vars(h)), HelixLocation(**vars(hl)), 1000)
+        )
+        # Different parameters aren't
+        requests.append(service.points(h, hl, 999))
+        requests.append(service.points(h, None, 1000))
+        return await asyncio.gather(*requests)
+
+    results = asyncio.run(burst())
+    assert all(r is results[0] for r in results[:11])
+    assert len(results[11]) == 999
+    assert instrumentation.counters() == {
+        "service.computed": 3,
+        "service.coalesced": 10,
+    }
+
+
+def test_completed_requests_are_computed_again(instrumented):
+    async def sequential() -> Tuple[np.ndarray, np.ndarray]:
+        service = GeometryService()
+        return await service.points(h, hl, 10), await service.points(h, hl, 10)
+
+    a, b = asyncio.run(sequential())
+    assert a is not b
+    assert instrumentation.counters() == {"service.computed": 2}
+
+
+def test_cancelling_a_request_does_not_cancel_the_others():
+    async def cancel() -> np.ndarray:
+        service = GeometryService()
+        first = asyncio.ensure_future(service.points(h, hl, 100000))
+        second = asyncio.ensure_future(service.points(h, hl, 100000))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert len(asyncio.run(cancel())) == 100000
+
+
+def test_chunks():
+    async def collect() -> List[np.ndarray]:
+        service = GeometryService(chunk_size=7)
+        return [c async for c in service.chunks(h, hl, 50)]
+
+    chunks = asyncio.run(collect())
+    assert [len(c) for c in chunks] == [7] * 7 + [1]
+    expected = helix_points(h, np.linspace(0, 1, 50), hl)
+    assert np.array_equal(np.concatenate(chunks), expected)
+
+
+def test_mesh():
+    profile = [HelixLocation(), hl, HelixLocation(vert_offset=0.1)]
+
+    async def mesh():
+        with ThreadPoolExecutor(2) as executor:
+            return await GeometryService(executor).mesh(h, profile, 20)
+
+    result = asyncio.run(mesh())
+    expected = helix_mesh(h, profile, 20)
+    assert np.array_equal(result.vertices, expected.vertices)
+    assert np.array_equal(result.faces, expected.faces)
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        GeometryService(chunk_size=0)
+    with pytest.raises(ValueError):
+        asyncio.run(GeometryService().points(Helix(1, 1, 1, taper_out_rpos=2)))
+
+
+async def get(port: int, target: str, method: str = "GET") -> Tuple[str, bytes]:
+    """Return the status line and the decoded body of a request."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b"\r\n\r\n", 1)
+    lines = head.decode().split("\r\n")
+    if "Transfer-Encoding: chunked" in lines:
+        data = b""
+        while True:
+            size, body = body.split(b"\r\n", 1)
+            if int(size, 16) == 0:
+                break
+            data += body[: int(size, 16)]
+            body = body[int(size, 16) + 2 :]
+        body = data
+    return lines[0], body
+
+
+def test_http():
+    query = "radius=1&pitch=0.5&height=2&taper_out_rpos=0.1&taper_in_rpos=0.9"
+
+    async def requests() -> List[Tuple[str, bytes]]:
+        server = await serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return [
+                await get(port, f"/points?{query}&horz_offset=0.1&num_points=50"),
+                await get(
+                    port, f"/points?{query}&num_points=50&format=binary&chunk_size=8"
+                ),
+                await get(port, f"/points?{query}&colour=red"),
+                await get(port, "/points?radius=1"),
+                await get(port, f"/points?{query}&taper_out_rpos=2"),
+                await get(port, "/mesh"),
+                await get(port, f"/points?{query}", "POST"),
+            ]
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    responses = asyncio.run(requests())
+    t = np.linspace(0, 1, 50)
+
+    status, body = responses[0]
+    assert status == "HTTP/1.1 200 OK"
+    lines = body.decode().splitlines()
+    assert lines[0] == "wire,x,y,z"
+    points = np.array([[float(v) for v in line.split(",")[1:]] for line in lines[1:]])
+    assert np.array_equal(points, helix_points(h, t, hl))
+
+    status, body = responses[1]
+    assert status == "HTTP/1.1 200 OK"
+    assert np.array_equal(
+        np.frombuffer(body, dtype="<f8").reshape(-1, 3), helix_points(h, t)
+    )
+
+    assert responses[2] == (
+        "HTTP/1.1 400 Bad Request",
+        b"unknown parameters ['colour']\n",
+    )
+    assert responses[3] == ("HTTP/1.1 400 Bad Request", b"pitch, height required\n")
+    assert responses[4][0] == "HTTP/1.1 400 Bad Request"
+    assert b"taper_out_rpos" in responses[4][1]
+    assert responses[5][0] == "HTTP/1.1 404 Not Found"
+    assert responses[6][0] == "HTTP/1.1 405 Method Not Allowed"
@@ -0,0 +1,152 @@
+import pickle
+import subprocess
+import sys
+from multiprocessing import Pool, get_all_start_methods
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.mesh import helix_mesh
+from taperable_helix.shared import (
+    SharedArray,
+    SharedMesh,
+    fill_points,
+    shared_mesh,
+    shared_points,
+)
+from taperable_helix.vectorized import helix_points
+
+h = Helix(radius=1, pitch=0.5, height=2, taper_out_rpos=0.1, taper_in_rpos=0.9)
+hl = HelixLocation(horz_offset=0.1)
+profile = [HelixLocation(), hl, HelixLocation(vert_offset=0.1)]
+
+
+def test_shared_points():
+    points = shared_points(h, 1000, hl, chunk_size=64)
+    try:
+        expected = helix_points(h, np.linspace(0, 1, 1000), hl)
+        assert np.array_equal(points.array, expected)
+
+        # The descriptor is all that's passed between processes
+        assert len(pickle.dumps(points.descriptor)) < 200
+        with SharedArray.attach(pickle.loads(pickle.dumps(points.descriptor))) as view:
+            assert np.array_equal(view.array, expected)
+            view.array[0] = 42
+        assert np.all(points.array[0] == 42)
+    finally:
+        points.close()
+        points.unlink()
+
+
+def test_workers_fill_one_block():
+    num_points = 100000
+    slices = [(first, 12500) for first in range(0, num_points, 12500)]
+    with SharedArray.create((num_points, 3)) as points:
+        try:
+            with Pool(2) as pool:
+                pool.starmap(
+                    fill_points,
+                    [(points.descriptor, h, hl, first, n, 4096) for first, n in slices],
+                )
+            expected = helix_points(h, np.linspace(0, 1, num_points), hl)
+            assert np.array_equal(points.array, expected)
+
+            # The workers attached and exited without removing the block
+            SharedMemory(name=points.descriptor.name).close()
+        finally:
+            points.unlink()
+
+
+consumer_script: str = """
+import sys
+from multiprocessing import resource_tracker
+from taperable_helix.shared import SharedArray, SharedDescriptor
+
+if sys.argv[1] == "tracker":
+    resource_tracker.ensure_running()
+SharedArray.attach(SharedDescriptor(sys.argv[2], (10, 3), "float64")).close()
+"""
+
+attach_script: str = """
+import subprocess, sys
+from multiprocessing import get_context
+from taperable_helix import Helix
+from taperable_helix.shared import SharedArray, fill_points
+
+if __name__ == "__main__":
+    h = Helix(1, 0.5, 2)
+    context = get_context(sys.argv[1])
+    # Started before this process has a resource tracker of its own
+    early = context.Pool(1)
+    with SharedArray.create((10, 3)) as points:
+        early.apply(fill_points, (points.descriptor, h))
+        early.close()
+        early.join()
+        with context.Pool(1) as pool:
+            pool.apply(fill_points, (points.descriptor, h))
+        # Unrelated consumers, without and with a tracker before attaching
+        for tracker in ["none", "tracker"]:
+            name = points.descriptor.name
+            subprocess.run([sys.executable, "-c", sys.argv[2], tracker, name], check=True)
+        SharedArray.attach(points.descriptor).close()
+        points.unlink()
+"""
+
+
+@pytest.mark.parametrize("method", ["spawn", "fork"])
+def test_attach_leaves_the_block_to_its_creator(method: str):
+    # Workers share the creator's resource tracker or have their own, as do
+    # unrelated processes, and the creator may attach too. None of them
+    # removes the block and the tracker, whose errors go to stderr, doesn't
+    # complain.
+    if method not in get_all_start_methods():
+        pytest.skip(f"{method} isn't supported")
+    proc = subprocess.run(
+        [sys.executable, "-c", attach_script, method, consumer_script],
+        capture_output=True,
+    )
+    assert proc.returncode == 0, proc.stderr.decode()
+    assert proc.stderr == b""
+
+
+def test_shared_mesh():
+    mesh = shared_mesh(h, profile, 100, chunk_size=7)
+    try:
+        expected = helix_mesh(h, profile, 100)
+        assert np.array_equal(mesh.mesh.vertices, expected.vertices)
+        assert np.array_equal(mesh.mesh.faces, expected.faces)
+        descriptor = pickle.loads(pickle.dumps(mesh.descriptor))
+        with SharedMesh.attach(descriptor) as view:
+            assert np.array_equal(view.mesh.faces, expected.faces)
+    finally:
+        mesh.close()
+        mesh.unlink()
+
+
+@pytest.mark.parametrize("num_wires, num_points", [(1, 10), (2, 10), (3, 1), (3, 0)])
+def test_shared_mesh_sizes(num_wires: int, num_points: int):
+    mesh = shared_mesh(h, profile[:num_wires], num_points)
+    try:
+        expected = helix_mesh(h, profile[:num_wires], num_points)
+        assert np.array_equal(mesh.mesh.vertices, expected.vertices)
+        assert np.array_equal(mesh.mesh.faces, expected.faces)
+    finally:
+        mesh.close()
+        mesh.unlink()
+
+
+def test_errors():
+    with SharedArray.create((10, 3)) as points:
+        try:
+            with pytest.raises(ValueError):
+                fill_points(points.descriptor, h, first=5, n=6)
+            with pytest.raises(ValueError):
+                fill_points(points.descriptor, h, chunk_size=0)
+        finally:
+            points.unlink()
+    with pytest.raises(ValueError):
+        shared_points(Helix(1, 1, 1, taper_out_rpos=2), 10)
+    with pytest.raises(ValueError):
+        shared_mesh(h, [], 10)
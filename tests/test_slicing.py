@@ -0,0 +1,110 @@
+from collections import Counter
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.slicing import crossings, slice_wires
+from taperable_helix.vectorized import helix_points
+
+# Default abs_tol
+absolute_tol: float = 1e-6
+
+
+def brute_force(h: Helix, hl: HelixLocation, z: np.ndarray) -> List[Tuple[int, float]]:
+    """Strict sign changes between dense samples, misses levels only touched"""
+    t = np.linspace(h.first_t, h.last_t, 200001)
+    pz = helix_points(h, t, hl)[:, 2]
+    result: List[Tuple[int, float]] = []
+    for i, level in enumerate(z):
+        s = np.sign(pz - level)
+        result += [(i, t[k]) for k in np.nonzero(s[:-1] * s[1:] < 0)[0]]
+    return sorted(result)
+
+
+@pytest.mark.parametrize(
+    "h, hl",
+    [
+        (
+            Helix(radius=1, pitch=0.5, height=3, taper_out_rpos=0.1, taper_in_rpos=0.9),
+            HelixLocation(vert_offset=0.1),
+        ),
+        (
+            Helix(
+                radius=1,
+                pitch=0.5,
+                height=3,
+                taper_out_rpos=0.2,
+                taper_in_rpos=0.7,
+                inset_offset=0.2,
+            ),
+            HelixLocation(vert_offset=-2, horz_offset=0.3),
+        ),
+        (
+            Helix(radius=1, pitch=0.5, height=3, taper_out_rpos=0.2, taper_in_rpos=0.7),
+            HelixLocation(vert_offset=4),
+        ),
+        (Helix(radius=1, pitch=1, height=2, first_t=1, last_t=-1), HelixLocation()),
+        (
+            Helix(radius=1, pitch=0, height=1, taper_out_rpos=0.3, taper_in_rpos=0.6),
+            HelixLocation(vert_offset=0.5),
+        ),
+    ],
+)
+def test_crossings_matches_brute_force(h: Helix, hl: HelixLocation):
+    # Levels offset so none are exactly at the ends of the helix
+    z = np.linspace(-3, 6, 307) + 1e-7
+    c = crossings(h, z, hl)
+
+    expected = brute_force(h, hl, z)
+    assert c.level.tolist() == [i for i, _ in expected]
+    assert np.allclose(c.t, [t for _, t in expected], rtol=0, atol=1e-4)
+
+    p = helix_points(h, c.t, hl)
+    assert np.allclose(p[:, 2], z[c.level], rtol=0, atol=absolute_tol)
+    assert np.allclose(p[:, 0], c.x, rtol=0, atol=absolute_tol)
+    assert np.allclose(p[:, 1], c.y, rtol=0, atol=absolute_tol)
+
+
+def test_crossings_converge_where_z_is_flat():
+    # z of a pitch 0 taper flattens out where it meets the body, Newton
+    # alone converges slowly there so levels just below it need bisection
+    h = Helix(radius=2, pitch=0, height=0, taper_out_rpos=0.3, taper_in_rpos=0.5)
+    hl = HelixLocation(vert_offset=1)
+    z = np.concatenate([np.linspace(-0.5, 1.5, 2001), 1 - np.logspace(-12, -1, 200)])
+    c = crossings(h, z, hl)
+    assert Counter(c.level.tolist()) == {i: 2 for i in range(len(z)) if 0 <= z[i] < 1}
+    residual = np.abs(helix_points(h, c.t, hl)[:, 2] - z[c.level]).max()
+    assert residual < 1e-12, f"residual:{residual}"
+
+
+def test_crossings_body_closed_form():
+    h = Helix(radius=2, pitch=0.4, height=1, inset_offset=0.1)
+    z = np.array([0.1, 0.5, 0.9, 0.95, -1])
+    c = crossings(h, z)
+    assert c.level.tolist() == [0, 1, 2]
+    assert np.allclose(c.t, [0, 0.5, 1], rtol=0, atol=absolute_tol)
+    assert np.allclose(c.x, 0, rtol=0, atol=absolute_tol)
+    assert np.allclose(c.y, 2, rtol=0, atol=absolute_tol)
+
+
+def test_crossings_turning_point_level_once():
+    h = Helix(radius=1, pitch=0.5, height=3, taper_out_rpos=0.2, taper_in_rpos=0.7)
+    hl = HelixLocation(vert_offset=4)
+    t = np.linspace(0.7, 1, 100001)
+    top = helix_points(h, t, hl)[:, 2].max()
+    c = crossings(h, [top - 1e-3, top + 1e-3], hl)
+    assert Counter(c.level.tolist()) == {0: 2}
+
+
+def test_slice_wires():
+    h = Helix(radius=1, pitch=0.5, height=2, taper_out_rpos=0.1, taper_in_rpos=0.9)
+    hls = [HelixLocation(vert_offset=0.1), HelixLocation(vert_offset=-0.1)]
+    z = np.linspace(0.05, 1.95, 50)
+    result = slice_wires(h, z, hls)
+    assert len(result) == 2
+    for c, hl in zip(result, hls):
+        expected = crossings(h, z, hl)
+        assert np.array_equal(c.t, expected.t)
+    assert len(slice_wires(h, z)) == 1
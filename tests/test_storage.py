@@ -0,0 +1,129 @@
+import io
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.mesh import helix_mesh
+from taperable_helix.storage import Archive, load_mesh, save, save_mesh
+from taperable_helix.vectorized import helix_chunks
+
+helix = Helix(radius=1, pitch=0.1, height=2, taper_out_rpos=0.1, taper_in_rpos=0.9)
+wire = np.concatenate(
+    list(helix_chunks(helix, 100001, HelixLocation(horz_offset=0.05)))
+)
+
+
+def roundtrip(arrays, **kwargs) -> Archive:
+    f = io.BytesIO()
+    save(f, arrays, **kwargs)
+    f.seek(0)
+    return Archive(f)
+
+
+def test_exact():
+    special = np.array([[0.0, -0.0, np.inf], [-np.inf, np.nan, 5e-324], [1e308, -1, 2]])
+    archive = roundtrip({"wire": wire, "special": special}, chunk_size=1000)
+    assert archive.names == ["wire", "special"]
+    assert archive.shape("wire") == wire.shape
+    assert archive.num_chunks("wire") == 101
+    # Bit for bit
+    assert archive.read("wire").tobytes() == wire.tobytes()
+    assert archive.read("special").tobytes() == special.tobytes()
+    assert len(roundtrip({"wire": wire})._file.getvalue()) < wire.nbytes / 3
+
+
+@pytest.mark.parametrize("tolerance", [1e-9, 1e-6, 1e-3])
+def test_quantized(tolerance):
+    f = io.BytesIO()
+    save(f, {"wire": wire}, tolerance=tolerance)
+    f.seek(0)
+    read = Archive(f).read("wire")
+    assert np.abs(read - wire).max() <= tolerance * (1 + 1e-9)
+    if tolerance >= 1e-6:
+        assert len(f.getvalue()) < wire.nbytes / 20
+
+
+def test_integers():
+    arrays = {
+        "i64": np.arange(-5000, 5000, dtype=np.int64).reshape(-1, 2) ** 3,
+        "u8": np.arange(1000, dtype=np.uint8),
+        "i32": np.array([[2**31 - 1, -(2**31)], [0, 7]], dtype=np.int32),
+        "extremes": np.array([2**63 - 1, -(2**63), 2**63 - 1], dtype=np.int64),
+    }
+    archive = roundtrip(arrays, tolerance=0.5, chunk_size=7)
+    for name, a in arrays.items():
+        read = archive.read(name)
+        assert read.dtype == a.dtype
+        np.testing.assert_array_equal(read, a)
+
+
+def test_random_access():
+    archive = roundtrip({"wire": wire}, chunk_size=1000)
+    np.testing.assert_array_equal(archive.read_chunk("wire", 3), wire[3000:4000])
+    np.testing.assert_array_equal(archive.read_chunk("wire", 100), wire[100000:])
+    for start, stop in [(0, 1), (999, 1001), (1500, 4500), (99990, 200000), (5, 5)]:
+        np.testing.assert_array_equal(
+            archive.read_rows("wire", start, stop), wire[start:stop]
+        )
+    np.testing.assert_array_equal(archive.read_rows("wire", -10, -1), wire[-10:-1])
+    with pytest.raises(IndexError):
+        archive.read_chunk("wire", 101)
+
+
+def test_file(tmp_path):
+    mesh = helix_mesh(
+        helix,
+        [
+            HelixLocation(vert_offset=0.01),
+            HelixLocation(vert_offset=-0.01),
+            HelixLocation(horz_offset=0.02),
+        ],
+        num_points=1001,
+        normals=True,
+        uvs=True,
+    )
+    path = tmp_path / "mesh.thz"
+    save_mesh(path, mesh, tolerance=1e-6, chunk_size=100, workers=4)
+    read = load_mesh(path, workers=2)
+    np.testing.assert_array_equal(read.faces, mesh.faces)
+    assert np.abs(read.vertices - mesh.vertices).max() <= 1e-6
+    assert np.abs(read.normals - mesh.normals).max() <= 1e-6
+    assert np.abs(read.uvs - mesh.uvs).max() <= 1e-6
+    save_mesh(path, helix_mesh(helix, num_points=10))
+    read = load_mesh(path)
+    assert read.normals is None and read.uvs is None
+
+    # An archive after other data in a file
+    f = io.BytesIO()
+    f.write(b"prefix")
+    save(f, {"wire": wire[:10]})
+    f.seek(6)
+    with Archive(f) as archive:
+        np.testing.assert_array_equal(archive.read("wire"), wire[:10])
+
+
+def test_empty():
+    archive = roundtrip({"empty": np.empty((0, 3)), "one": wire[:1]})
+    assert archive.read("empty").shape == (0, 3)
+    assert archive.read_rows("empty", 0, 10).shape == (0, 3)
+    np.testing.assert_array_equal(archive.read("one"), wire[:1])
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        save(io.BytesIO(), {"wire": wire}, tolerance=0)
+    with pytest.raises(ValueError):
+        save(io.BytesIO(), {"wire": wire}, chunk_size=0)
+    with pytest.raises(ValueError):
+        save(io.BytesIO(), {"f32": wire.astype(np.float32)})
+    with pytest.raises(ValueError):
+        save(io.BytesIO(), {"big": np.array([1e300])}, tolerance=1e-6)
+    with pytest.raises(ValueError):
+        save(io.BytesIO(), {"scalar": np.float64(1)})
+    with pytest.raises(ValueError):
+        Archive(io.BytesIO(b"not an archive"))
+    f = io.BytesIO()
+    save(f, {"wire": wire[:10]})
+    with pytest.raises(ValueError):
+        Archive(io.BytesIO(f.getvalue()[:-3]))
@@ -0,0 +1,85 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from threading import Barrier
+
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+
+tapered = Helix(radius=1, pitch=0.2, height=1, taper_out_rpos=0.1, taper_in_rpos=0.9)
+ts = [i / 9999 for i in range(10000)]
+workers = 8
+
+
+@pytest.fixture(autouse=True)
+def switch_often():
+    # Switch threads as often as possible when there is a GIL, free-threaded
+    # builds run the threads in parallel anyway
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_helix_does_not_modify_location():
+    hl = HelixLocation(horz_offset=0.1)
+    tapered.helix(hl)
+    assert hl == HelixLocation(horz_offset=0.1)
+    assert hl.radius is None
+
+
+def test_evaluator_is_immutable():
+    h = replace(tapered)
+    hl = HelixLocation(horz_offset=0.1)
+    f = h.helix(hl)
+    expected = list(map(f, ts))
+
+    # Changing the helix or location after doesn't change the evaluator
+    h.radius = 2
+    h.first_t = 0.5
+    h.pitch = 0
+    h.inset_offset = 0.1
+    hl.radius = 3
+    hl.vert_offset = 1
+    assert list(map(f, ts)) == expected
+
+
+def test_evaluator_concurrent_calls():
+    f = tapered.helix(HelixLocation(horz_offset=0.1, vert_offset=0.05))
+    expected = list(map(f, ts))
+    barrier = Barrier(workers)
+
+    def run(worker: int):
+        barrier.wait()
+        # Each worker interleaves over all of t
+        return [(i, f(ts[i])) for i in range(worker, len(ts), workers)]
+
+    with ThreadPoolExecutor(workers) as pool:
+        results = dict(p for ps in pool.map(run, range(workers)) for p in ps)
+    assert [results[i] for i in range(len(ts))] == expected
+
+
+def test_shared_location_concurrent_helix():
+    # One HelixLocation used to build evaluators of many helixes at once
+    hl = HelixLocation(horz_offset=0.1)
+    helixes = [replace(tapered, radius=1 + i / 10) for i in range(workers)]
+    expected = [list(map(h.helix(HelixLocation(horz_offset=0.1)), ts)) for h in helixes]
+    barrier = Barrier(workers)
+
+    def run(worker: int):
+        barrier.wait()
+        return [list(map(helixes[worker].helix(hl), ts)) for _ in range(3)]
+
+    with ThreadPoolExecutor(workers) as pool:
+        for worker, results in enumerate(pool.map(run, range(workers))):
+            assert all(r == expected[worker] for r in results)
+    assert hl.radius is None
+
+
+def test_point_array_concurrent():
+    hl = HelixLocation(horz_offset=0.1)
+    expected = tapered.point_array(1001, hl)
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(pool.map(lambda _: tapered.point_array(1001, hl), range(32)))
+    assert all(r == expected for r in results)
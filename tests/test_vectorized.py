@@ -0,0 +1,185 @@
+import tracemalloc
+from array import array
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.vectorized import (
+    Scratch,
+    helix_chunks,
+    helix_derivatives,
+    helix_points,
+    helix_xyz,
+    parallel_points,
+)
+
+# Default abs_tol
+absolute_tol: float = 1e-6
+
+# (Helix, HelixLocation) pairs covering the cases in test_taperable_helix
+cases: List[Tuple[Helix, HelixLocation]] = [
+    (Helix(radius=1, pitch=1, height=1), HelixLocation()),
+    (
+        Helix(radius=1, pitch=1, height=1, taper_out_rpos=0.1, taper_in_rpos=0.9),
+        HelixLocation(horz_offset=0.2),
+    ),
+    (
+        Helix(
+            radius=2,
+            pitch=0.5,
+            height=3,
+            taper_out_rpos=0.2,
+            taper_in_rpos=0.7,
+            inset_offset=0.1,
+        ),
+        HelixLocation(horz_offset=0.3, vert_offset=-0.1),
+    ),
+    (Helix(radius=1, pitch=1, height=1, first_t=1, last_t=0), HelixLocation()),
+    (Helix(radius=0, pitch=1, height=-1, first_t=0, last_t=-1), HelixLocation()),
+    (Helix(radius=1, pitch=0, height=0), HelixLocation(vert_offset=1)),
+]
+
+
+@pytest.mark.parametrize("h, hl", cases)
+def test_helix_points_matches_helix(h: Helix, hl: HelixLocation):
+    t = np.linspace(h.first_t, h.last_t, 101)
+    f = h.helix(hl)
+    expected = np.array([f(v) for v in t])
+    assert np.allclose(helix_points(h, t, hl), expected, rtol=0, atol=absolute_tol)
+
+
+@pytest.mark.parametrize("h, hl", cases)
+def test_helix_derivatives_finite_difference(h: Helix, hl: HelixLocation):
+    # Stay away from the taper boundaries where the derivative is discontinuous
+    t = np.array([0.05, 0.5, 0.95]) * (h.last_t - h.first_t) + h.first_t
+    eps = 1e-6
+    p, d1, d2 = helix_derivatives(h, t, hl, order=2)
+    _, d1_lo = helix_derivatives(h, t - eps, hl)
+    _, d1_hi = helix_derivatives(h, t + eps, hl)
+    fd1 = (helix_points(h, t + eps, hl) - helix_points(h, t - eps, hl)) / (2 * eps)
+    fd2 = (d1_hi - d1_lo) / (2 * eps)
+    assert np.allclose(d1, fd1, rtol=0, atol=1e-5)
+    assert np.allclose(d2, fd2, rtol=0, atol=1e-4)
+
+
+def test_helix_derivatives_order():
+    h = Helix(radius=1, pitch=1, height=1)
+    with pytest.raises(ValueError):
+        helix_derivatives(h, [0.5], order=0)
+    with pytest.raises(ValueError):
+        helix_derivatives(h, [0.5], order=3)
+    assert len(helix_derivatives(h, [0.5])) == 2
+
+
+@pytest.mark.parametrize("h, hl", cases)
+def test_helix_points_out_is_identical(h: Helix, hl: HelixLocation):
+    t = np.linspace(h.first_t, h.last_t, 1001)
+    expected = helix_points(h, t, hl)
+    out = np.empty((1001, 3))
+    assert helix_points(h, t, hl, out=out, scratch=Scratch()) is out
+    assert np.array_equal(out, expected)
+    assert np.array_equal(helix_points(h, t, hl, scratch=Scratch(10)), expected)
+
+
+def test_helix_points_out_buffers():
+    h, hl = cases[2]
+    t = np.linspace(h.first_t, h.last_t, 100)
+    expected = helix_points(h, t, hl)
+
+    # Any writable float64 buffer of 3 * len(t) values
+    flat = array("d", bytes(8 * 300))
+    helix_points(h, t, hl, out=flat)
+    assert np.array_equal(np.array(flat).reshape(100, 3), expected)
+
+    # The scratch only grows, to the largest call's size, and is reused
+    scratch = Scratch()
+    for n in (10, 100, 20):
+        out = np.empty((n, 3))
+        helix_points(h, t[:n], hl, out=out, scratch=scratch)
+        assert np.array_equal(out, expected[:n])
+    assert scratch.size == 100
+
+    with pytest.raises(ValueError, match="dtype"):
+        helix_points(h, t, hl, out=np.empty((100, 3), dtype=np.float32))
+    with pytest.raises(ValueError, match="dtype"):
+        helix_points(h, t, hl, out=bytearray(8 * 300))
+    with pytest.raises(ValueError, match="writable"):
+        helix_points(h, t, hl, out=memoryview(flat).toreadonly())
+    with pytest.raises(ValueError, match="shape"):
+        helix_points(h, t, hl, out=np.empty((101, 3)))
+    with pytest.raises(ValueError, match="shape"):
+        helix_points(h, t, hl, out=np.empty(600)[::2])
+
+
+def test_helix_points_out_does_not_allocate():
+    h, hl = cases[2]
+    t = np.linspace(h.first_t, h.last_t, 100000)
+    out = np.empty((len(t), 3))
+    scratch = Scratch(len(t))
+    helix_points(h, t, hl, out=out, scratch=scratch)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        for _ in range(10):
+            helix_points(h, t, hl, out=out, scratch=scratch)
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+    # Only small objects such as views, one array would be 2.4MB
+    assert peak < 20000
+
+
+@pytest.mark.parametrize("h, hl", cases)
+@pytest.mark.parametrize("workers, chunk_size", [(1, 100), (4, 1), (4, 77), (3, 4096)])
+def test_parallel_points(h: Helix, hl: HelixLocation, workers: int, chunk_size: int):
+    expected = np.concatenate(list(helix_chunks(h, 1001, hl)))
+    points = parallel_points(h, 1001, hl, workers=workers, chunk_size=chunk_size)
+    np.testing.assert_array_equal(points, expected)
+
+
+def test_parallel_points_out():
+    h, hl = cases[1]
+    out = np.full((1001, 3), np.nan)
+    points = parallel_points(h, 1001, hl, workers=4, chunk_size=100, out=out)
+    assert np.shares_memory(points, out)
+    np.testing.assert_array_equal(out, np.concatenate(list(helix_chunks(h, 1001, hl))))
+
+    buf = array("d", bytes(8 * 3 * 10))
+    parallel_points(h, 10, hl, workers=2, chunk_size=3, out=buf)
+    np.testing.assert_array_equal(
+        np.asarray(buf).reshape(10, 3), helix_points(h, np.linspace(0, 1, 10), hl)
+    )
+
+
+def test_parallel_points_sizes():
+    h, hl = cases[0]
+    assert parallel_points(h, 0, hl).shape == (0, 3)
+    np.testing.assert_array_equal(
+        parallel_points(h, 1, hl), next(helix_chunks(h, 1, hl))
+    )
+    with pytest.raises(ValueError):
+        parallel_points(h, 10, hl, workers=0)
+    with pytest.raises(ValueError):
+        parallel_points(h, 10, hl, chunk_size=0)
+    with pytest.raises(ValueError):
+        parallel_points(h, 10, hl, out=np.empty((9, 3)))
+
+
+@pytest.mark.parametrize("h, hl", cases)
+@pytest.mark.parametrize("recurrence", [False, True])
+def test_helix_xyz(h: Helix, hl: HelixLocation, recurrence: bool):
+    x, y, z = helix_xyz(h, 1001, hl, chunk_size=100, recurrence=recurrence)
+    for c in (x, y, z):
+        assert c.shape == (1001,)
+        assert c.flags.c_contiguous
+    expected = np.concatenate(
+        list(helix_chunks(h, 1001, hl, chunk_size=100, recurrence=recurrence))
+    )
+    np.testing.assert_array_equal(np.column_stack((x, y, z)), expected)
+    with pytest.raises(ValueError):
+        helix_xyz(h, 10, hl, chunk_size=0)
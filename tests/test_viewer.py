@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from taperable_helix import Helix, HelixLocation
+from taperable_helix.vectorized import helix_xyz
+
+go = pytest.importorskip("plotly.graph_objects")
+from taperable_helix.viewer import decimate, view, wire_trace  # noqa: E402
+
+helix = Helix(radius=1, pitch=0.1, height=2, taper_out_rpos=0.1, taper_in_rpos=0.9)
+locations = [HelixLocation(vert_offset=0.02), HelixLocation(horz_offset=0.05)]
+
+
+def max_deviation(points: np.ndarray, keep: np.ndarray) -> float:
+    """Return the largest distance of a point from the decimated polyline"""
+    i = np.arange(len(points))
+    seg = np.clip(np.searchsorted(keep, i, side="right") - 1, 0, len(keep) - 2)
+    a = points[keep[seg]]
+    d = points[keep[seg + 1]] - a
+    length2 = np.maximum((d * d).sum(axis=1), 1e-300)
+    u = np.clip(((points - a) * d).sum(axis=1) / length2, 0, 1)
+    return float(np.linalg.norm(points - (a + u[:, None] * d), axis=1).max())
+
+
+@pytest.mark.parametrize("pixels", [100, 2000])
+def test_decimate(pixels):
+    x, y, z = helix_xyz(helix, 200001, locations[1])
+    keep = decimate(x, y, z, pixels)
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert (np.diff(keep) > 0).all()
+    assert len(keep) < len(x) // (4 if pixels == 100 else 1)
+    extent = max(np.ptp(c) for c in (x, y, z))
+    cell = extent / pixels
+    assert max_deviation(np.column_stack((x, y, z)), keep) <= cell
+
+
+def test_decimate_is_bounded_by_the_shape():
+    # 200 turns, the points kept depend on the curvature not the sampling
+    fine = Helix(radius=5, pitch=0.05, height=10)
+    x, y, z = helix_xyz(fine, 2000001)
+    keep = decimate(x, y, z, pixels=2000)
+    # length * sqrt(curvature / (8 * tol)) is about 14000
+    assert len(keep) < 30000
+    assert len(decimate(*helix_xyz(fine, 200001), pixels=2000)) < 30000
+    cell = max(np.ptp(c) for c in (x, y, z)) / 2000
+    assert max_deviation(np.column_stack((x, y, z)), keep) <= cell
+
+
+def test_decimate_small():
+    assert decimate([], [], []).tolist() == []
+    assert decimate([1, 2], [0, 0], [0, 0]).tolist() == [0, 1]
+    # All the same point, nothing to decimate
+    assert decimate([1] * 5, [1] * 5, [1] * 5).tolist() == [0, 1, 2, 3, 4]
+    # A straight line only needs its ends
+    x = np.linspace(0, 1, 1001)
+    keep = decimate(x, np.zeros_like(x), np.zeros_like(x), pixels=10)
+    assert keep.tolist() == [0, 1000]
+    # A corner is kept
+    keep = decimate(np.r_[x, np.ones(1000)], np.r_[x * 0, x[1:]], np.zeros(2001))
+    assert keep.tolist() == [0, 1000, 2000]
+    with pytest.raises(ValueError):
+        decimate(x, x, x, pixels=0)
+
+
+def test_wire_trace():
+    x, y, z = helix_xyz(helix, 10001)
+    trace = wire_trace(x, y, z, pixels=500, name="wire")
+    assert isinstance(trace, go.Scatter3d)
+    assert trace.mode == "lines"
+    assert trace.name == "wire"
+    keep = decimate(x, y, z, pixels=500)
+    np.testing.assert_array_equal(trace.x, x[keep])
+    np.testing.assert_array_equal(trace.z, z[keep])
+
+
+def test_view():
+    fig = view(helix, locations, num_points=100001, names=["upper", "middle"])
+    assert [t.name for t in fig.data] == ["upper", "middle"]
+    assert all(len(t.x) < 100001 for t in fig.data)
+    assert fig.layout.scene.camera.projection.type == "orthographic"
+
+    fig = view(helix, num_points=1001, fig=fig)
+    assert len(fig.data) == 3
+    with pytest.raises(ValueError):
+        view(helix, locations, names=["one"])